@@ -0,0 +1,322 @@
+""" Gömülü HTTP API: POST /wake, GET /devices, GET /status, GET /metrics
+
+asyncio akışları üzerinde küçük bir HTTP/1.1 sunucusu; bağlantılar keep-alive ile açık kalır.
+Aynı döngü turunda gelen uyandırma istekleri tek bir toplu gönderimde birleştirilir, aynı
+MAC için bekleyen istekler aynı sonucu paylaşır.
+"""
+import asyncio
+import hmac
+import json
+import time
+import traceback
+from http import HTTPStatus
+
+from devices import DeviceCollection, ensure_device_ids, mac_key, format_mac, persistent_fields
+from metrics import metrics
+
+DEFAULT_BIND = "127.0.0.1"
+DEFAULT_PORT = 8765
+# İstek başlıkları ve gövdesi için üst sınırlar
+MAX_HEADER_SIZE = 16 * 1024
+MAX_BODY_SIZE = 1024 * 1024
+# Boşta kalan keep-alive bağlantısı bu süre (saniye) sonra kapatılır
+IDLE_TIMEOUT = 30
+# Depo değişikliği en fazla bu sıklıkla (saniye) kontrol edilir
+RELOAD_INTERVAL = 1.0
+
+JSON_TYPE = "application/json; charset=utf-8"
+# Prometheus metin biçimi
+METRICS_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class HttpError(Exception):
+    def __init__(self, status, message=""):
+        super().__init__(message or status.phrase)
+        self.status = status
+
+
+class WakeCoalescer:
+    """ Uyandırma isteklerini döngü turu başına tek wake_devices çağrısında toplar """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._pending = {}
+        self._scheduled = False
+        self.batches = 0
+        self.coalesced = 0
+        self.packets_sent = 0
+
+    async def wake(self, devices):
+        loop = asyncio.get_running_loop()
+        futures = []
+        for device in devices:
+            mac = device.get("mac", "")
+            key = mac_key(mac) or mac
+            entry = self._pending.get(key)
+            if entry is None:
+                entry = self._pending[key] = (device, loop.create_future())
+            else:
+                # Aynı MAC zaten gönderilmeyi bekliyor; ikinci paket gönderilmez
+                self.coalesced += 1
+            futures.append(entry[1])
+        if not self._scheduled:
+            self._scheduled = True
+            loop.call_soon(self._flush)
+        return await asyncio.gather(*futures)
+
+    def _flush(self):
+        pending, self._pending = self._pending, {}
+        self._scheduled = False
+        entries = list(pending.values())
+        try:
+            report = self.engine.wake_devices([device for device, _ in entries])
+        except Exception as e:
+            for _, future in entries:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self.batches += 1
+        self.packets_sent += report.sent
+        for (_, future), result in zip(entries, report.results):
+            if not future.done():
+                future.set_result(result)
+
+
+class DeviceIndex:
+    """ Depodaki cihazlar ve isim/grup dizinleri; depo değişince yeniden yüklenir """
+
+    def __init__(self, store, stamp=None):
+        self.store = store
+        # Depo dosyalarının değişiklik damgasını veren fonksiyon (yoksa yeniden yüklenmez)
+        self.stamp = stamp
+        self._stamp_value = None
+        self._checked = 0.0
+        self._reloading = False
+        self.reload()
+
+    def _load(self):
+        # Sunucu çalışırken executor'da çalışır; dizinler de event loop dışında kurulur
+        # Damga okumadan önce alınır: okuma sırasında gelen yazma sonraki kontrolde yakalanır
+        stamp = self.stamp() if self.stamp is not None else None
+        devices = self.store.load_all()
+        if ensure_device_ids(devices):
+            self.store.replace_all(devices)
+        collection = DeviceCollection(devices)
+        by_name = {}
+        by_group = {}
+        for device in collection:
+            by_name.setdefault(device.get("name", "").casefold(), []).append(device)
+            if device.get("group"):
+                by_group.setdefault(device["group"], []).append(device)
+        return stamp, collection, by_name, by_group
+
+    def _apply(self, loaded):
+        self._stamp_value, self.collection, self.by_name, self.by_group = loaded
+        self._devices_json = None
+
+    def reload(self):
+        """ Eşzamanlı yükleme (açılışta); sunucu çalışırken refresh kullanılır """
+        self._apply(self._load())
+
+    def refresh(self):
+        """ Depo değiştiyse arka planda yeniden yükler; yükleme bitene kadar eski liste sunulur """
+        now = time.monotonic()
+        if self.stamp is None or self._reloading or now - self._checked < RELOAD_INTERVAL:
+            return
+        self._checked = now
+        if self.stamp() == self._stamp_value:
+            return
+        self._reloading = True
+        future = asyncio.get_running_loop().run_in_executor(None, self._load)
+        future.add_done_callback(self._loaded)
+
+    def _loaded(self, future):
+        self._reloading = False
+        if future.cancelled():
+            return
+        try:
+            self._apply(future.result())
+        except Exception:
+            # Okunamayan depo eski listeyi bozmaz; damga değişmediği için sonraki kontrolde yeniden denenir
+            traceback.print_exc()
+
+    def devices_json(self):
+        # Liste değişene kadar aynı gövde tekrar kullanılır
+        if self._devices_json is None:
+            self._devices_json = json.dumps([persistent_fields(d) for d in self.collection],
+                                            ensure_ascii=False).encode("utf-8")
+        return self._devices_json
+
+    def resolve(self, target):
+        """ İsim (büyük/küçük harf duyarsız) veya MAC; listede olmayan MAC'e de gönderilebilir """
+        matches = self.by_name.get(target.casefold())
+        if matches:
+            return matches
+        key = mac_key(target)
+        if key is None:
+            return []
+        return self.collection.find_mac(key) or [{"name": "", "mac": format_mac(key)}]
+
+
+class ApiServer:
+    def __init__(self, index, engine, token=None):
+        self.index = index
+        self.coalescer = WakeCoalescer(engine)
+        self.token = token
+        # Başlık latin-1 ile çözülür; karşılaştırma aynı baytlar üzerinde sabit sürede yapılır
+        self._authorization = f"Bearer {token}".encode("utf-8") if token else None
+        self.started = time.monotonic()
+        self.requests = 0
+        self.connections = 0
+        self._routes = {
+            ("GET", "/devices"): self.get_devices,
+            ("GET", "/status"): self.get_status,
+            ("POST", "/wake"): self.post_wake,
+            ("GET", "/metrics"): self.get_metrics,
+        }
+        metrics.gauge("wol_devices", "Devices in the inventory", lambda: len(self.index.collection))
+        metrics.gauge("wol_api_connections", "Open HTTP connections", lambda: self.connections)
+        metrics.gauge("wol_api_coalesced_total", "Wake requests answered by an already queued packet",
+                      lambda: self.coalescer.coalesced)
+
+    async def serve(self, host=DEFAULT_BIND, port=DEFAULT_PORT):
+        server = await asyncio.start_server(self._handle, host, port, limit=MAX_HEADER_SIZE)
+        async with server:
+            await server.serve_forever()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), IDLE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._respond(writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, {}, False)
+                    break
+                keep_alive = await self._request(head, reader, writer)
+                if not keep_alive:
+                    break
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def _request(self, head, reader, writer):
+        self.requests += 1
+        try:
+            request_line, *header_lines = head.decode("latin-1").split("\r\n")
+            method, target, version = request_line.split(" ", 2)
+            headers = {}
+            for line in header_lines:
+                name, sep, value = line.partition(":")
+                if sep:
+                    headers[name.strip().lower()] = value.strip()
+        except ValueError:
+            await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": "bad request"}, False)
+            return False
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" and (version == "HTTP/1.1" or connection == "keep-alive")
+        try:
+            length = int(headers.get("content-length", 0))
+            if length < 0 or length > MAX_BODY_SIZE:
+                raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+            body = await reader.readexactly(length) if length else b""
+            if self._authorization is not None and not hmac.compare_digest(
+                    headers.get("authorization", "").encode("latin-1"), self._authorization):
+                raise HttpError(HTTPStatus.UNAUTHORIZED)
+            handler = self._routes.get((method, target.split("?", 1)[0]))
+            if handler is None:
+                raise HttpError(HTTPStatus.NOT_FOUND)
+            self.index.refresh()
+            status, payload, *content_type = await handler(body)
+        except HttpError as e:
+            status, payload, content_type = e.status, {"error": str(e)}, ()
+            if status == HTTPStatus.REQUEST_ENTITY_TOO_LARGE:
+                # Gövde okunmadı; bağlantıdaki sonraki istek ayrıştırılamaz
+                keep_alive = False
+        except ValueError as e:
+            status, payload, content_type = HTTPStatus.BAD_REQUEST, {"error": str(e)}, ()
+        except asyncio.IncompleteReadError:
+            return False
+        except Exception:
+            # Beklenmeyen hata bağlantıyı yanıtsız kapatmasın
+            traceback.print_exc()
+            status, payload, content_type = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "internal error"}, ()
+        if metrics.enabled:
+            metrics.inc("wol_api_requests_total", status=status.value)
+        await self._respond(writer, status, payload, keep_alive, *content_type)
+        return keep_alive
+
+    async def _respond(self, writer, status, payload, keep_alive, content_type=JSON_TYPE):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def get_devices(self, body):
+        return HTTPStatus.OK, self.index.devices_json()
+
+    async def get_metrics(self, body):
+        return HTTPStatus.OK, metrics.render().encode("utf-8"), METRICS_TYPE
+
+    async def get_status(self, body):
+        coalescer = self.coalescer
+        return HTTPStatus.OK, {
+            "devices": len(self.index.collection),
+            "uptime": round(time.monotonic() - self.started, 3),
+            "requests": self.requests,
+            "connections": self.connections,
+            "packets_sent": coalescer.packets_sent,
+            "batches": coalescer.batches,
+            "coalesced": coalescer.coalesced,
+        }
+
+    def _select(self, request):
+        """ {"name"|"mac"|"group"|"all"|"targets": [...]} isteğinden cihaz listesi """
+        if not isinstance(request, dict):
+            raise ValueError("JSON object expected")
+        index = self.index
+        if request.get("all"):
+            return list(index.collection), []
+        group = request.get("group")
+        if group:
+            if not isinstance(group, str):
+                raise ValueError("group must be a string")
+            return list(index.by_group.get(group, ())), []
+        targets = request.get("targets") or [request[key] for key in ("name", "mac") if request.get(key)]
+        if not isinstance(targets, list) or not all(isinstance(target, str) for target in targets):
+            raise ValueError("targets must be a list of names or MAC addresses")
+        devices, missing = [], []
+        for target in targets:
+            matches = index.resolve(target)
+            if matches:
+                devices.extend(matches)
+            else:
+                missing.append(target)
+        return devices, missing
+
+    async def post_wake(self, body):
+        try:
+            request = json.loads(body or b"{}")
+        except ValueError:
+            raise ValueError("invalid JSON") from None
+        devices, missing = self._select(request)
+        if not devices:
+            return HTTPStatus.NOT_FOUND, {"error": "no devices", "missing": missing}
+        results = await self.coalescer.wake(devices)
+        sent = sum(1 for result in results if result.ok)
+        return HTTPStatus.OK, {
+            "sent": sent,
+            "failed": len(results) - sent,
+            "missing": missing,
+            "results": [result._asdict() for result in results],
+        }
+
@@ -0,0 +1,111 @@
+"""HTTP API yük testi: keep-alive bağlantılarla saniyede istek sayısı ve gecikme dağılımı.
+
+Sunucu aynı süreçte ayrı bir thread'de geçici bir depo ile açılır; magic packet'ler yerel
+bir UDP soketine (127.0.0.1) gider, ağa hiçbir şey çıkmaz. --url verilirse çalışan bir
+sunucu (wol.py serve) test edilir.
+
+    python benchmarks/bench_api.py --connections 50 --seconds 5 --devices 1000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import ApiServer, DeviceIndex  # noqa: E402
+from devices import format_mac  # noqa: E402
+from storage import open_store  # noqa: E402
+from wol_engine import WakeEngine  # noqa: E402
+
+
+def make_devices(count):
+    return [{"id": str(i), "name": f"host-{i:06d}", "mac": format_mac(0x02_00_00_00_00_00 + i)}
+            for i in range(count)]
+
+
+def start_server(directory, count):
+    """ Sunucuyu arka plan thread'inde açar; (host, port) döner """
+    store = open_store("sqlite", directory=directory, window=0)
+    store.replace_all(make_devices(count))
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 22)
+    sink.bind(("127.0.0.1", 0))
+    server = ApiServer(DeviceIndex(store), WakeEngine("127.0.0.1", sink.getsockname()[1]))
+
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    port = listener.getsockname()[1]
+    listener.close()
+    threading.Thread(target=lambda: asyncio.run(server.serve("127.0.0.1", port)), daemon=True).start()
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port)).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    return "127.0.0.1", port, server
+
+
+async def client(host, port, macs, deadline, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    while time.perf_counter() < deadline:
+        body = json.dumps({"mac": random.choice(macs)}).encode()
+        start = time.perf_counter()
+        writer.write(b"POST /wake HTTP/1.1\r\nHost: bench\r\nContent-Type: application/json\r\n"
+                     b"Content-Length: %d\r\n\r\n%s" % (len(body), body))
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = int(head.lower().split(b"content-length:")[1].split(b"\r\n")[0])
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - start)
+        if not head.startswith(b"HTTP/1.1 200"):
+            errors.append(head.split(b"\r\n")[0])
+    writer.close()
+
+
+async def run(host, port, connections, seconds, macs):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + seconds
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, macs, deadline, latencies, errors) for _ in range(connections)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--devices", type=int, default=1000)
+    parser.add_argument("--url", help="çalışan sunucu, ör. http://127.0.0.1:8765")
+    args = parser.parse_args()
+
+    macs = [device["mac"] for device in make_devices(args.devices)]
+    server = None
+    with tempfile.TemporaryDirectory() as directory:
+        if args.url:
+            parts = urlsplit(args.url)
+            host, port = parts.hostname, parts.port or 80
+        else:
+            host, port, server = start_server(directory, args.devices)
+        latencies, errors, elapsed = asyncio.run(run(host, port, args.connections, args.seconds, macs))
+
+    latencies.sort()
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    print(f"{len(latencies)} istek  {elapsed:.2f} s  {len(latencies) / elapsed:.0f} istek/sn  hata {len(errors)}")
+    print(f"gecikme  p50 {percentile(0.5):.2f} ms  p99 {percentile(0.99):.2f} ms  en kötü {latencies[-1] * 1000:.2f} ms")
+    if server is not None:
+        print(f"toplu gönderim {server.coalescer.batches}  birleştirilen {server.coalescer.coalesced}")
+
+
+if __name__ == "__main__":
+    main()
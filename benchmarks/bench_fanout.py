@@ -0,0 +1,68 @@
+"""Çok hedefli gönderim: cihazlar N hedefe (VLAN) dağıtıldığında sıralı ve paralel gönderim.
+
+Her hedef ayrı bir yerel UDP alıcısıdır (127.0.0.1, farklı port); ağa hiçbir şey çıkmaz.
+Paralel gönderimde toplam süre tek hedefin süresine yakın kalmalıdır.
+
+    python benchmarks/bench_fanout.py --devices 80000 --targets 8 --rounds 5
+"""
+import argparse
+import os
+import socket
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from devices import format_mac  # noqa: E402
+from wol_engine import WakeEngine  # noqa: E402
+
+
+def open_sinks(count):
+    sinks = []
+    for _ in range(count):
+        sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sink.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 22)
+        sink.bind(("127.0.0.1", 0))
+        sinks.append(sink)
+    return sinks
+
+
+def make_devices(count, ports):
+    return [{"id": str(i), "name": f"host-{i:06d}", "mac": format_mac(0x02_00_00_00_00_00 + i),
+             "broadcast": "127.0.0.1", "broadcast_port": ports[i % len(ports)]}
+            for i in range(count)]
+
+
+def bench(devices, fanout, rounds):
+    best = float("inf")
+    with WakeEngine(max_fanout=fanout) as engine:
+        engine.wake_devices(devices)  # soketler ve paket önbelleği hazırlanır
+        for _ in range(rounds):
+            report = engine.wake_devices(devices)
+            best = min(best, report.elapsed)
+    return best, report.failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=80000)
+    parser.add_argument("--targets", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    sinks = open_sinks(args.targets)
+    ports = [sink.getsockname()[1] for sink in sinks]
+    per_target = args.devices // args.targets
+
+    one, _ = bench(make_devices(per_target, ports[:1]), 1, args.rounds)
+    print(f"tek hedef, {per_target} cihaz          {one * 1000:8.2f} ms")
+    devices = make_devices(per_target * args.targets, ports)
+    for fanout in (1, args.targets):
+        elapsed, failed = bench(devices, fanout, args.rounds)
+        print(f"{args.targets} hedef, {len(devices)} cihaz, {fanout} thread  {elapsed * 1000:8.2f} ms"
+              f"  x{elapsed / one:.2f}  hata {failed}")
+    for sink in sinks:
+        sink.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Cihaz başına bellek: sözlük kayıtları ile __slots__ kayıtları (Device) karşılaştırması.
+
+Satırlar depodan okunmuş gibi önceden oluşturulur (dizgiler ölçüme dahil değildir);
+tracemalloc ile kaydın kendisi ve tüm koleksiyon (sıralama anahtarları, MAC dizini,
+6 baytlık MAC) için ayrılan bellek ölçülür.
+
+    python benchmarks/bench_memory.py --sizes 1000 100000
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from devices import Device, DeviceCollection, format_mac, mac_key  # noqa: E402
+
+
+def make_rows(count):
+    # Her dördüncü cihazın IP'si, her onuncunun grubu ve zamanlaması var
+    rows = []
+    for i in range(count):
+        row = {"id": uuid.uuid4().hex, "name": f"Host-{i:06d}", "mac": format_mac(0x02_00_00_00_00_00 + i)}
+        if i % 4 == 0:
+            row["ip"] = f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"
+        if i % 10 == 0:
+            row["group"] = f"rack-{i % 40}"
+            row["schedules"] = [{"cron": "0 7 * * 1-5"}]
+        rows.append(row)
+    return rows
+
+
+def legacy_collection(rows):
+    """ Önceki düzen: kopyalanan sözlükler, her kayıtta _mac ve ayrı sıralama anahtarları """
+    items = []
+    by_mac = {}
+    for row in rows:
+        device = dict(row)
+        key = mac_key(device["mac"])
+        device["_mac"] = key.to_bytes(6, "big")
+        by_mac.setdefault(key, []).append(device)
+        items.append(device)
+    items.sort(key=lambda d: d.get("name", "").lower())
+    keys = [d.get("name", "").lower() for d in items]
+    return items, keys, {d["id"]: d for d in items}, by_mac
+
+
+def allocated(fn):
+    """ fn() sonucunun canlı tuttuğu bellek (bayt) """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = fn()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def measure(count):
+    rows = make_rows(count)
+    results = {
+        "dict_record": allocated(lambda: [dict(row) for row in rows]),
+        "slots_record": allocated(lambda: [Device(**row) for row in rows]),
+        "dict_collection": allocated(lambda: legacy_collection(rows)),
+        "slots_collection": allocated(lambda: DeviceCollection(rows)),
+    }
+    return {name: round(size / count, 1) for name, size in results.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'cihaz':>8s} {'dict kayıt':>11s} {'slots kayıt':>12s} {'dict koleksiyon':>16s} {'slots koleksiyon':>17s}")
+    for count in args.sizes:
+        r = measure(count)
+        print(f"{count:8d} {r['dict_record']:9.1f} B {r['slots_record']:10.1f} B "
+              f"{r['dict_collection']:14.1f} B {r['slots_collection']:15.1f} B")
+
+
+if __name__ == "__main__":
+    main()
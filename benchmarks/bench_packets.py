@@ -0,0 +1,87 @@
+"""Magic packet gönderim hızı: her gönderimde paket oluşturma ve önbellekli paket.
+
+Paketler yerel bir UDP soketine (127.0.0.1) gönderilir, ağa hiçbir şey çıkmaz.
+
+    python benchmarks/bench_packets.py --devices 5000 --rounds 5
+"""
+import argparse
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from devices import DeviceCollection, format_mac  # noqa: E402
+from wol_engine import WakeEngine, sendmmsg_available  # noqa: E402
+
+
+def make_devices(count):
+    return [{"id": str(i), "name": f"host-{i:06d}", "mac": format_mac(0x02_00_00_00_00_00 + i)}
+            for i in range(count)]
+
+
+def open_sink():
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 22)
+    sink.bind(("127.0.0.1", 0))
+    return sink
+
+
+def legacy_packet(mac):
+    # Eski yol: her gönderimde MAC metni ayrıştırılıp paket yeniden oluşturulur
+    mac = mac.replace(mac[2], "") if len(mac) == 17 else mac
+    return bytes.fromhex("F" * 12 + mac * 16)
+
+
+def bench_legacy(devices, port, rounds):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.connect(("127.0.0.1", port))
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for device in devices:
+            sock.send(legacy_packet(device["mac"]))
+    elapsed = time.perf_counter() - start
+    sock.close()
+    return len(devices) * rounds / elapsed
+
+
+def bench_engine(devices, port, rounds, use_sendmmsg):
+    sent = 0
+    elapsed = 0.0
+    with WakeEngine("127.0.0.1", port, use_sendmmsg=use_sendmmsg) as engine:
+        for _ in range(rounds):
+            report = engine.wake_devices(devices)
+            sent += report.sent
+            elapsed += report.elapsed
+    return sent / elapsed
+
+
+def run(count, rounds):
+    sink = open_sink()
+    port = sink.getsockname()[1]
+    results = {"legacy": bench_legacy(make_devices(count), port, rounds)}
+
+    # Her ölçüm taze kayıtlarla başlar; ilk tur önbelleği doldurur
+    results["cached_send"] = bench_engine(list(DeviceCollection(make_devices(count))), port, rounds, False)
+    if sendmmsg_available():
+        results["cached_sendmmsg"] = bench_engine(list(DeviceCollection(make_devices(count))), port,
+                                                  rounds, True)
+    sink.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    results = run(args.devices, args.rounds)
+    baseline = results["legacy"]
+    for name, rate in results.items():
+        print(f"{name:16s} {rate:12,.0f} paket/sn  x{rate / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    main()
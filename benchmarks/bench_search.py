@@ -0,0 +1,69 @@
+"""Arama dizini: kurulum süresi, bellek ve sorgu gecikmesi.
+
+Cihazlar bench_memory ile aynı biçimde oluşturulur (isim, MAC, bazılarında IP ve grup).
+Her sorgu için en iyi ve medyan süre ile eşleşen satır sayısı yazılır.
+
+    python benchmarks/bench_search.py --sizes 1000 100000 --repeat 7
+"""
+import argparse
+import gc
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_memory import make_rows  # noqa: E402
+from devices import DeviceCollection  # noqa: E402
+from search import SearchIndex  # noqa: E402
+
+# Seçici sorgular (tek cihazı bulmak) ve hemen her cihazın eşleştiği geniş sorgular
+QUERIES = ("host-000123", "02:00:00:00:00:7", "0200.0000.000c", "10.0.0.1", "rack-10 host-0000", "zzz",
+           "h", "ho", "host")
+
+
+def build_index(count):
+    collection = DeviceCollection(make_rows(count))
+    index = SearchIndex(collection)
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    index.build()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return index, elapsed, size
+
+
+def time_query(index, query, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = index.rows(query)
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times), statistics.median(times), len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    for count in args.sizes:
+        index, elapsed, size = build_index(count)
+        # tracemalloc kurulumu yavaşlatır; süre ayrıca ölçülür
+        start = time.perf_counter()
+        index.build()
+        elapsed = time.perf_counter() - start
+        print(f"{count} cihaz: kurulum {elapsed * 1000:.0f} ms, dizin {size / count:.0f} B/cihaz")
+        for query in QUERIES:
+            best, median, matches = time_query(index, query, args.repeat)
+            print(f"  {query!r:22s} {matches:7d} satır  en iyi {best:7.3f} ms  medyan {median:7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Soğuk açılış süresi: komut satırı (wol.py) ve GUI (offscreen) karşılaştırması.
+
+Her ölçüm yeni bir Python süreci başlatır; cihaz deposu geçici bir dizinde oluşturulur,
+paketler 127.0.0.1'e gönderilir.
+
+    python benchmarks/bench_startup.py --devices 1000 --runs 7
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from devices import format_mac  # noqa: E402
+from storage import open_store  # noqa: E402
+
+# GUI ilk çizime kadar açılır ve hemen kapanır
+GUI_SCRIPT = """
+import sys
+from PyQt6.QtWidgets import QApplication
+import main
+app = QApplication(sys.argv)
+window = main.WakeOnLANApp()
+window.show()
+app.processEvents()
+window.close()
+"""
+
+
+def make_store(directory, count):
+    store = open_store("sqlite", directory=directory, window=0)
+    store.replace_all([{"id": str(i), "name": f"host-{i:06d}", "mac": format_mac(0x02_00_00_00_00_00 + i)}
+                       for i in range(count)])
+    store.close()
+
+
+def measure(argv, env, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(argv, cwd=ROOT, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return times[0], times[len(times) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--no-gui", action="store_true", help="GUI ölçümünü atla")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        make_store(home, args.devices)
+        env = dict(os.environ, HOME=home, QT_QPA_PLATFORM="offscreen")
+        wol = [sys.executable, os.path.join(ROOT, "wol.py"), "--dir", home]
+        cases = {
+            "python (boş)": [sys.executable, "-c", "pass"],
+            "wol list": wol + ["list"],
+            "wol wake": wol + ["wake", "host-000001", "--host", "127.0.0.1"],
+            "wol wake --all": wol + ["wake", "--all", "--host", "127.0.0.1"],
+        }
+        if not args.no_gui:
+            cases["gui"] = [sys.executable, "-c", GUI_SCRIPT]
+
+        for name, argv in cases.items():
+            best, median = measure(argv, env, args.runs)
+            print(f"{name:16s} en iyi {best * 1000:8.1f} ms  medyan {median * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
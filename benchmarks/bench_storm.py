@@ -0,0 +1,91 @@
+"""Hız sınırlı toplu uyandırma: hedef hıza ulaşılıyor ve uzun çalışmada kayma olmuyor mu.
+
+Paketler yerel bir UDP alıcısına (127.0.0.1) gönderilir; alıcı her saniyede gelen paketleri
+sayar. Saniyelik sayıların hedeften sapması ve toplam hız yazdırılır.
+
+    python benchmarks/bench_storm.py --rate 2000 --seconds 10
+"""
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from devices import format_mac  # noqa: E402
+from storm import WakeStorm  # noqa: E402
+from wol_engine import WakeEngine  # noqa: E402
+
+
+def make_devices(count):
+    return [{"id": str(i), "name": f"host-{i:06d}", "mac": format_mac(0x02_00_00_00_00_00 + i)}
+            for i in range(count)]
+
+
+class Sink:
+    """ Gelen paketleri zaman damgasıyla sayan yerel UDP alıcısı """
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 22)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.settimeout(0.2)
+        self.port = self.sock.getsockname()[1]
+        self.times = []
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop:
+            try:
+                self.sock.recv(256)
+            except socket.timeout:
+                continue
+            self.times.append(time.monotonic())
+
+    def close(self):
+        self._stop = True
+        self._thread.join()
+        self.sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=2000, help="hedef cihaz/sn (paket/sn aynı)")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--groups", type=int, default=1, help="grup sayısı (gruplar arası bekleme 0)")
+    args = parser.parse_args()
+
+    count = int(args.rate * args.seconds)
+    devices = make_devices(count)
+    for i, device in enumerate(devices):
+        device["group"] = f"rack-{i % args.groups}"
+
+    sink = Sink()
+    engine = WakeEngine(host="127.0.0.1", port=sink.port)
+    storm = WakeStorm(engine, packets_per_sec=args.rate, hosts_per_sec=args.rate, group_stagger=0)
+    sent, failed, elapsed = asyncio.run(storm.run(devices))
+    time.sleep(0.3)
+    sink.close()
+    engine.close()
+
+    times = sink.times
+    print(f"gönderilen {sent}  hata {failed}  alınan {len(times)}  süre {elapsed:.2f} s")
+    print(f"hedef {args.rate:.0f}/sn  ortalama {sent / elapsed:.0f}/sn")
+    if not times:
+        return
+    # Saniyelik kovalar (ilk kova başlangıçtaki jeton birikimini içerir)
+    start = times[0]
+    buckets = [0] * (int(times[-1] - start) + 1)
+    for at in times:
+        buckets[int(at - start)] += 1
+    for second, received in enumerate(buckets[:-1]):
+        print(f"  {second:4d}. sn  {received:7d}  sapma {100 * (received - args.rate) / args.rate:+6.2f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Tema değiştirme süresi: satır sayısı arttıkça sabit kalmalıdır.
+
+Her satır sayısı için geçici bir cihaz deposu ile pencere offscreen açılır; açık/koyu
+tema arasında geçiş yapılıp bir sonraki çizim dahil süre ölçülür.
+
+    python benchmarks/bench_theme.py --rows 100 1000 10000 --switches 10
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from devices import format_mac  # noqa: E402
+from storage import open_store  # noqa: E402
+
+
+def make_store(directory, count):
+    store = open_store("sqlite", directory=directory, window=0)
+    store.replace_all([{"id": str(i), "name": f"host-{i:06d}", "mac": format_mac(0x02_00_00_00_00_00 + i)}
+                       for i in range(count)])
+    store.close()
+
+
+def bench(app, rows, switches):
+    import main
+
+    with tempfile.TemporaryDirectory() as home:
+        os.environ["HOME"] = home
+        make_store(home, rows)
+        window = main.WakeOnLANApp(settings={"dark_mode": False, "language": "en"})
+        window.resize(900, 600)
+        window.show()
+        app.processEvents()
+
+        times = []
+        for i in range(switches):
+            start = time.perf_counter()
+            window.theme_combo.setCurrentIndex(1 if i % 2 == 0 else 0)
+            # Yeniden çizim dahil
+            window.repaint()
+            app.processEvents()
+            times.append(time.perf_counter() - start)
+        window.close()
+        app.processEvents()
+    times.sort()
+    return times[0], times[len(times) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--switches", type=int, default=10)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    for rows in args.rows:
+        best, median = bench(app, rows, args.switches)
+        print(f"{rows:8d} satır  en iyi {best * 1000:7.2f} ms  medyan {median * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""Performans ölçüm takımı: depo, tablo, çeviri, tema, paket gönderimi, bellek, arama ve soğuk açılış.
+
+Her cihaz sayısı için geçici bir depo ile pencere offscreen açılır ve işlemler ayrı ayrı
+ölçülür. Sonuçlar JSON olarak yazılır; --baseline verilirse medyanı eşikten fazla yavaşlayan
+ölçümler listelenir ve çıkış kodu 1 olur.
+
+    python benchmarks/suite.py --sizes 100 1000 10000 100000 --output bench.json
+    python benchmarks/suite.py --baseline bench.json --threshold 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_memory import measure as measure_memory  # noqa: E402
+from bench_search import QUERIES, build_index  # noqa: E402
+from bench_startup import GUI_SCRIPT, make_store  # noqa: E402
+
+DEFAULT_SIZES = (100, 1000, 10000, 100000)
+# Bu kadar (ms) altındaki farklar gürültü sayılır, eşik aşılsa da gerileme değildir
+MIN_DELTA_MS = 0.5
+
+
+def timed(fn, repeat, setup=None):
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return {"best_ms": round(min(times), 3), "median_ms": round(statistics.median(times), 3)}
+
+
+def bench_window(app, size, repeat):
+    import main
+
+    results = {}
+    with tempfile.TemporaryDirectory() as home:
+        os.environ["HOME"] = home
+        make_store(home, size)
+        # Yazmalar birleştirilmez; save_devices süresi diske yazmayı da içerir
+        window = main.WakeOnLANApp(settings={"dark_mode": False, "language": "en", "scheduler": False},
+                                   write_behind_window=0)
+        window.resize(900, 600)
+        window.show()
+        app.processEvents()
+        # Açılışta açılan depo kapatılır; load her turda kendi deposunu açıp kapatır (bağlantı ve
+        # yazma thread'i sızmaz)
+        window.store.close()
+        window.store = None
+
+        def load():
+            devices = window.load_devices()
+            window.store.close()
+            window.store = None
+            assert len(devices) == size
+
+        results["load_devices"] = timed(load, repeat)
+        # load_devices deposu yeniden açar (window.store)
+        window.load_devices()
+        results["save_devices"] = timed(window.save_devices, repeat)
+
+        def table_reset():
+            window.devices.reset(list(window.devices))
+            window.repaint()
+            app.processEvents()
+
+        results["update_device_table"] = timed(window.update_device_table, repeat)
+        results["table_reset"] = timed(table_reset, repeat)
+
+        languages = ["tr", "en"]
+
+        def retranslate():
+            window.i18n.set_language(languages[0])
+            window.retranslate_ui()
+            languages.reverse()
+
+        results["retranslate_ui"] = timed(retranslate, repeat)
+
+        themes = [True, False]
+
+        def style():
+            window.dark_mode = themes[0]
+            window.load_style()
+            window.repaint()
+            app.processEvents()
+            themes.reverse()
+
+        results["load_style"] = timed(style, repeat)
+        window.close()
+        app.processEvents()
+    return results
+
+
+def bench_packets(size, repeat):
+    from devices import DeviceCollection, format_mac
+    from wol_engine import WakeEngine
+
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 22)
+    sink.bind(("127.0.0.1", 0))
+    devices = list(DeviceCollection([{"id": str(i), "name": f"host-{i:06d}",
+                                      "mac": format_mac(0x02_00_00_00_00_00 + i)} for i in range(size)]))
+    with WakeEngine("127.0.0.1", sink.getsockname()[1]) as engine:
+        engine.wake_devices(devices)
+        result = timed(lambda: engine.wake_devices(devices), repeat)
+    sink.close()
+    result["packets_per_sec"] = round(size / (result["best_ms"] / 1000)) if result["best_ms"] else None
+    return result
+
+
+def bench_cold_start(size, runs):
+    with tempfile.TemporaryDirectory() as home:
+        make_store(home, size)
+        env = dict(os.environ, HOME=home)
+        return timed(lambda: subprocess.run([sys.executable, "-c", GUI_SCRIPT], cwd=ROOT, env=env, check=True,
+                                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL), runs)
+
+
+def bench_memory(size):
+    """ Koleksiyondaki cihaz başına bellek (bayt); sürelerle aynı gerileme kontrolünden geçer """
+    return {"bytes_per_device": measure_memory(size)["slots_collection"]}
+
+
+def bench_search(size, repeat):
+    """ Arama dizininde tüm örnek sorguların toplam süresi """
+    index = build_index(size)[0]
+    return timed(lambda: [index.rows(query) for query in QUERIES], repeat)
+
+
+def compare(results, baseline, threshold):
+    """ Medyanı (bellekte cihaz başına baytı) baseline'dan threshold oranından fazla artan ölçümler """
+    regressions = []
+    for key, result in results.items():
+        before = baseline.get(key)
+        if not before:
+            continue
+        metric = "median_ms" if "median_ms" in result else "bytes_per_device"
+        if metric not in before:
+            continue
+        old, new = before[metric], result[metric]
+        if new > old * (1 + threshold) and (metric != "median_ms" or new - old > MIN_DELTA_MS):
+            regressions.append((key, old, new, "ms" if metric == "median_ms" else "B"))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--cold-runs", type=int, default=3)
+    parser.add_argument("--no-cold-start", action="store_true")
+    parser.add_argument("--output", help="sonuç JSON dosyası (varsayılan: stdout)")
+    parser.add_argument("--baseline", help="karşılaştırılacak önceki sonuç JSON dosyası")
+    parser.add_argument("--threshold", type=float, default=0.25, help="izin verilen yavaşlama oranı")
+    args = parser.parse_args()
+
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication(sys.argv[:1])
+
+    results = {}
+    for size in args.sizes:
+        for name, result in bench_window(app, size, args.repeat).items():
+            results[f"{name}/{size}"] = result
+        results[f"wake_devices/{size}"] = bench_packets(size, args.repeat)
+        results[f"memory/{size}"] = bench_memory(size)
+        results[f"search/{size}"] = bench_search(size, args.repeat)
+        if not args.no_cold_start:
+            results[f"cold_start/{size}"] = bench_cold_start(size, args.cold_runs)
+        print(f"{size} cihaz tamam", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+        regressions = compare(results, baseline, args.threshold)
+        for key, old, new, unit in regressions:
+            print(f"GERİLEME {key}: {old:.2f} {unit} -> {new:.2f} {unit} (x{new / old:.2f})", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,410 @@
+import ipaddress
+import time
+from bisect import bisect_left, bisect_right
+
+from PyQt6.QtCore import (Qt, QAbstractProxyModel, QAbstractTableModel, QModelIndex,
+                          QPersistentModelIndex, QEvent, pyqtSignal)
+from PyQt6.QtGui import QColor, QPalette
+from PyQt6.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionButton
+
+from metrics import metrics
+from verify import parse_target, format_target
+
+# Sütunlar
+COL_NAME, COL_MAC, COL_TARGET, COL_STATUS, COL_WAKE, COL_DELETE = range(6)
+COLUMN_COUNT = 6
+
+# Canlılık durumlarının renkleri
+LIVENESS_COLORS = {
+    "online": QColor("#2e7d32"),
+    "offline": QColor("#9e9e9e"),
+    "waking": QColor("#ef6c00"),
+}
+
+# Özel roller
+DeviceIdRole = Qt.ItemDataRole.UserRole + 1
+StatusRole = Qt.ItemDataRole.UserRole + 2
+
+
+class DeviceTableModel(QAbstractTableModel):
+    # Cihaz kimliği, yeni isim
+    device_renamed = pyqtSignal(str, str)
+    # Cihaz kimliği, yeni doğrulama hedefi (ip[:port])
+    device_target_changed = pyqtSignal(str, str)
+
+    def __init__(self, devices, parent=None):
+        super().__init__(parent)
+        # DeviceCollection; satır ekleme/silme bildirimleri doğrudan modele gelir
+        self._devices = devices
+        self._devices.subscribe(self)
+        self._headers = [""] * COLUMN_COUNT
+        self.wake_text = "Wake"
+        self.delete_text = "❌"
+        # MAC -> pending/sent/error/up/timeout
+        self.status = {}
+        # Cihaz kimliği -> online/offline/waking (canlılık monitörü)
+        self.liveness = {}
+        self.liveness_texts = {}
+        self._reset_started = None
+
+    def devices(self):
+        return self._devices
+
+    def device(self, row):
+        return self._devices[row]
+
+    def row_of(self, device_id):
+        return self._devices.index_of(device_id)
+
+    def device_by_id(self, device_id):
+        return self._devices.get(device_id)
+
+    # DeviceCollection bildirimleri
+    def begin_insert(self, row):
+        self.beginInsertRows(QModelIndex(), row, row)
+
+    def end_insert(self, row, device):
+        self.endInsertRows()
+
+    def begin_remove(self, row, device):
+        self.beginRemoveRows(QModelIndex(), row, row)
+
+    def end_remove(self, row, device):
+        self.endRemoveRows()
+
+    def begin_move(self, old_row, new_row):
+        # Qt hedef satırı taşımadan önceki konuma göre ister
+        destination = new_row + 1 if new_row > old_row else new_row
+        self.beginMoveRows(QModelIndex(), old_row, old_row, QModelIndex(), destination)
+
+    def end_move(self, old_row, new_row):
+        self.endMoveRows()
+
+    def updated(self, row, device):
+        self.dataChanged.emit(self.index(row, 0), self.index(row, COLUMN_COUNT - 1))
+
+    def begin_reset(self):
+        self._reset_started = time.perf_counter() if metrics.enabled else None
+        self.beginResetModel()
+
+    def end_reset(self):
+        self.endResetModel()
+        if self._reset_started is not None:
+            metrics.observe("wol_table_refresh_seconds", time.perf_counter() - self._reset_started)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._devices)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else COLUMN_COUNT
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        device = self._devices[index.row()]
+        column = index.column()
+
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            if column == COL_NAME:
+                return device.get("name", "")
+            if column == COL_MAC:
+                return device.get("mac", "")
+            if column == COL_TARGET:
+                return format_target(device)
+            if column == COL_STATUS:
+                state = self.liveness.get(device.get("id"))
+                return f"● {self.liveness_texts.get(state, state)}" if state else ""
+            if column == COL_WAKE:
+                status = self.status.get(device.get("mac", ""))
+                if status == "pending":
+                    return "…"
+                if status == "sent":
+                    return f"✔ {self.wake_text}"
+                if status == "error":
+                    return f"✖ {self.wake_text}"
+                if status == "up":
+                    # Uyandırmadan yanıt alınana kadar geçen süre
+                    latency = device.get("last_wake_latency")
+                    return f"✔ {latency:.1f} s" if latency is not None else f"✔ {self.wake_text}"
+                if status == "timeout":
+                    return f"⌛ {self.wake_text}"
+                return self.wake_text
+            if column == COL_DELETE:
+                return self.delete_text
+        elif role == DeviceIdRole:
+            return device.get("id")
+        elif role == StatusRole:
+            return self.status.get(device.get("mac", ""))
+        elif role == Qt.ItemDataRole.ForegroundRole and column == COL_STATUS:
+            return LIVENESS_COLORS.get(self.liveness.get(device.get("id")))
+        elif role == Qt.ItemDataRole.TextAlignmentRole and column >= COL_WAKE:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        if index.column() == COL_TARGET:
+            return self._set_target(index.row(), value)
+        if index.column() != COL_NAME:
+            return False
+        device = self._devices[index.row()]
+        if value == device.get("name", ""):
+            return False
+        # Koleksiyon kaydı yeni sıralı konumuna taşır ve satırı bildirir
+        self._devices.update(device.get("id"), name=value)
+        self.device_renamed.emit(device.get("id"), value)
+        return True
+
+    def _set_target(self, row, value):
+        device = self._devices[row]
+        try:
+            ip, port = parse_target(value)
+            if ip:
+                ipaddress.ip_address(ip)
+        except ValueError:
+            return False
+        if ip == device.get("ip", "") and port == device.get("verify_port"):
+            return False
+        changes = {"ip": ip}
+        if port:
+            changes["verify_port"] = port
+        else:
+            device.pop("verify_port", None)
+        self._devices.update(device.get("id"), **changes)
+        self.device_target_changed.emit(device.get("id"), value)
+        return True
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and index.column() in (COL_NAME, COL_TARGET):
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            if 0 <= section < COLUMN_COUNT:
+                return self._headers[section]
+        return super().headerData(section, orientation, role)
+
+    def set_headers(self, labels):
+        self._headers = list(labels)
+        self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, COLUMN_COUNT - 1)
+
+    def set_button_texts(self, wake_text, delete_text):
+        self.wake_text = wake_text
+        self.delete_text = delete_text
+        if self._devices:
+            # Satırlar yeniden oluşturulmaz; görünür hücreler tekrar çizilir
+            self.dataChanged.emit(self.index(0, COL_WAKE),
+                                  self.index(len(self._devices) - 1, COL_DELETE))
+
+    def set_liveness_texts(self, texts):
+        self.liveness_texts = dict(texts)
+        if self._devices:
+            self.dataChanged.emit(self.index(0, COL_STATUS),
+                                  self.index(len(self._devices) - 1, COL_STATUS))
+
+    def set_liveness(self, device_id, state):
+        # Tek hücre güncellenir; tablo yenilenmez
+        if state == "unknown":
+            self.liveness.pop(device_id, None)
+        else:
+            self.liveness[device_id] = state
+        row = self._devices.index_of(device_id)
+        if row >= 0:
+            cell = self.index(row, COL_STATUS)
+            self.dataChanged.emit(cell, cell)
+
+    def set_status(self, changed):
+        self.status.update(changed)
+        for mac in changed:
+            for device in self._devices.find_mac(mac):
+                row = self._devices.index_of(device.get("id"))
+                cell = self.index(row, COL_WAKE)
+                self.dataChanged.emit(cell, cell)
+
+
+class SearchFilterModel(QAbstractProxyModel):
+    """ Arama kutusunun süzgeci: görünen satırlar dizinden gelen sıralı kaynak satır listesidir
+
+    Sorgu yokken (veya her cihaz eşleşince) kaynak modelin birebir aynısıdır ve bildirimleri
+    aynen iletir. Satır başına Python çağrısı yapılmaz; eşleme ikili aramayla bulunur.
+    Süzülmüşken kaynakta satır eklenir/silinir/taşınırsa sorgu yeniden çalıştırılır.
+    """
+
+    def __init__(self, search_index, parent=None):
+        super().__init__(parent)
+        self.search_index = search_index
+        self.query = ""
+        # None: süzgeç yok; aksi halde görünen kaynak satırları (artan sırada)
+        self._rows = None
+        self._generation = None
+        self._resetting = False
+
+    def setSourceModel(self, model):
+        super().setSourceModel(model)
+        model.rowsAboutToBeInserted.connect(
+            lambda parent, first, last: self._changing(self.beginInsertRows, QModelIndex(), first, last))
+        model.rowsInserted.connect(lambda *args: self._changed(self.endInsertRows))
+        model.rowsAboutToBeRemoved.connect(
+            lambda parent, first, last: self._changing(self.beginRemoveRows, QModelIndex(), first, last))
+        model.rowsRemoved.connect(lambda *args: self._changed(self.endRemoveRows))
+        model.rowsAboutToBeMoved.connect(
+            lambda parent, start, end, destination, row:
+            self._changing(self.beginMoveRows, QModelIndex(), start, end, QModelIndex(), row))
+        model.rowsMoved.connect(lambda *args: self._changed(self.endMoveRows))
+        model.modelAboutToBeReset.connect(self.beginResetModel)
+        model.modelReset.connect(self._source_reset)
+        model.dataChanged.connect(self._source_data_changed)
+        model.headerDataChanged.connect(self.headerDataChanged)
+
+    def set_query(self, text):
+        """ Dönüş: görünen satır sayısı """
+        self.query = text
+        self.beginResetModel()
+        self._refilter()
+        self.endResetModel()
+        return self.rowCount()
+
+    def _refilter(self):
+        self._generation = self.search_index.generation
+        rows = self.search_index.rows(self.query)
+        # Her satır eşleşiyorsa süzgeç gereksiz
+        if rows is not None and len(rows) == self.sourceModel().rowCount():
+            rows = None
+        self._rows = rows
+
+    # Kaynak bildirimleri; süzülmüşken yapısal her değişiklik sıfırlamaya dönüşür
+    def _changing(self, begin, *args):
+        self._resetting = self._rows is not None
+        if self._resetting:
+            self.beginResetModel()
+        else:
+            begin(*args)
+
+    def _changed(self, end):
+        if self._resetting:
+            # Dizin koleksiyon dinleyicisi olarak modelden önce güncellendi
+            self._refilter()
+            self.endResetModel()
+            return
+        end()
+        self._follow_query()
+
+    def _follow_query(self):
+        # Süzgeçsizken sorgu varsa (her cihaz eşleşiyordu) değişiklik sonucu daraltmış olabilir
+        if self.query and self._generation != self.search_index.generation:
+            self.beginResetModel()
+            self._refilter()
+            self.endResetModel()
+
+    def _source_reset(self):
+        if self.query:
+            self._refilter()
+        else:
+            self._rows = None
+        self.endResetModel()
+
+    def _source_data_changed(self, top_left, bottom_right, roles):
+        if self.query and self._generation != self.search_index.generation:
+            # Aranan bir alan (ör. isim) değişti
+            self._follow_query()
+            return
+        rows = self._rows
+        if rows is None:
+            first, last = top_left.row(), bottom_right.row()
+        else:
+            first = bisect_left(rows, top_left.row())
+            last = bisect_right(rows, bottom_right.row()) - 1
+            if first > last:
+                return
+        self.dataChanged.emit(self.index(first, top_left.column()), self.index(last, bottom_right.column()),
+                              roles)
+
+    # QAbstractProxyModel
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QModelIndex()
+        row = proxy_index.row()
+        if self._rows is not None:
+            row = self._rows[row]
+        return self.sourceModel().index(row, proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        row = source_index.row()
+        rows = self._rows
+        if rows is not None:
+            position = bisect_left(rows, row)
+            if position == len(rows) or rows[position] != row:
+                return QModelIndex()
+            row = position
+        return self.createIndex(row, source_index.column())
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not (0 <= row < self.rowCount() and 0 <= column < self.columnCount()):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=None):
+        if index is None:
+            return super().parent()
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self.sourceModel().rowCount() if self._rows is None else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.sourceModel().columnCount()
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        # Satır yokken de başlıklar görünsün; sütunlar birebir aynı
+        return self.sourceModel().headerData(section, orientation, role)
+
+
+class ButtonDelegate(QStyledItemDelegate):
+    """ Hücre içinde gerçek widget yerine çizilen buton """
+
+    clicked = pyqtSignal(QModelIndex)
+
+    def __init__(self, parent=None, text_color=None):
+        super().__init__(parent)
+        self.text_color = text_color
+        self._pressed = None
+
+    def paint(self, painter, option, index):
+        button = QStyleOptionButton()
+        button.rect = option.rect.adjusted(2, 2, -2, -2)
+        button.text = index.data() or ""
+        button.palette = option.palette
+        if self.text_color is not None:
+            button.palette.setColor(QPalette.ColorRole.ButtonText, self.text_color)
+
+        if index.data(StatusRole) != "pending":
+            button.state |= QStyle.StateFlag.State_Enabled
+        if self._pressed is not None and QModelIndex(self._pressed) == index:
+            button.state |= QStyle.StateFlag.State_Sunken
+        else:
+            button.state |= QStyle.StateFlag.State_Raised
+
+        widget = option.widget
+        style = widget.style() if widget is not None else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, widget)
+
+    def editorEvent(self, event, model, option, index):
+        if index.data(StatusRole) == "pending":
+            return False
+        if event.type() == QEvent.Type.MouseButtonPress and event.button() == Qt.MouseButton.LeftButton:
+            self._pressed = QPersistentModelIndex(index)
+            return True
+        if event.type() == QEvent.Type.MouseButtonRelease and self._pressed is not None:
+            pressed = QModelIndex(self._pressed)
+            self._pressed = None
+            if pressed == index and option.rect.contains(event.position().toPoint()):
+                self.clicked.emit(index)
+            return True
+        return False
@@ -0,0 +1,457 @@
+import gc
+import re
+from bisect import bisect_left, bisect_right
+
+# aa:bb:cc:dd:ee:ff, aa-bb-cc-dd-ee-ff, aabb.ccdd.eeff, aabb-ccdd-eeff, aabbccddeeff
+_MAC_RE = re.compile(
+    r"^(?:[0-9a-f]{2}([:-])(?:[0-9a-f]{2}\1){4}[0-9a-f]{2}"
+    r"|[0-9a-f]{4}([.:-])[0-9a-f]{4}\2[0-9a-f]{4}"
+    r"|[0-9a-f]{12})$",
+    re.IGNORECASE)
+_MAC_SEPARATORS = str.maketrans("", "", ":-.")
+MAC_MAX = (1 << 48) - 1
+
+
+class InvalidMacError(ValueError):
+    """ Tanınmayan MAC adresi biçimi """
+
+
+def parse_mac(mac):
+    """ Yaygın biçimlerdeki MAC adresini 48 bitlik tamsayıya çevirir """
+    if isinstance(mac, int):
+        if 0 <= mac <= MAC_MAX:
+            return mac
+        raise InvalidMacError(mac)
+    text = str(mac).strip()
+    if not _MAC_RE.match(text):
+        raise InvalidMacError(mac)
+    return int(text.translate(_MAC_SEPARATORS), 16)
+
+
+def format_mac(value):
+    """ Tamsayı MAC'i görüntüleme biçimine (AA:BB:CC:DD:EE:FF) çevirir """
+    return value.to_bytes(6, "big").hex(":").upper()
+
+
+def mac_key(mac):
+    """ Geçerliyse tamsayı MAC, değilse None (eski kayıtlardaki hatalı değerler için) """
+    try:
+        return parse_mac(mac)
+    except InvalidMacError:
+        return None
+
+
+# Device kaydında ayrı yuvası olan alanlar; diğerleri (zamanlamalar, yönlendirme vb.) _extra içinde
+_SLOT_FIELDS = ("id", "name", "mac", "ip", "group")
+# Çalışma anı önbelleği: 6 baytlık MAC ve hazır magic packet
+_RUNTIME_FIELDS = ("_mac", "_packet")
+_ATTRIBUTES = frozenset(_SLOT_FIELDS + _RUNTIME_FIELDS)
+
+
+class Device:
+    """ __slots__ ile sıkıştırılmış cihaz kaydı; sözlük gibi kullanılır
+
+    Sık kullanılan alanlar yuvalarda tutulur, seyrek alanlar küçük bir sözlükte. Yuvadaki None
+    "alan yok" anlamına gelir. Sıralama anahtarı (casefold edilmiş isim) ilk kullanımda
+    hesaplanır ve isim değişene kadar saklanır.
+    """
+
+    __slots__ = _SLOT_FIELDS + _RUNTIME_FIELDS + ("_extra", "_key")
+
+    def __init__(self, id=None, name=None, mac=None, ip=None, group=None, **extra):
+        self.id = id
+        self.name = name
+        self.mac = mac
+        self.ip = ip
+        self.group = group
+        self._mac = None
+        self._packet = None
+        self._extra = extra or None
+        self._key = None
+
+    @classmethod
+    def from_dict(cls, data):
+        # Çalışma anı alanları kopyalanmaz; koleksiyon yeniden hesaplar
+        return cls(**{k: v for k, v in data.items() if not k.startswith("_")})
+
+    def sort_key(self):
+        key = self._key
+        if key is None:
+            name = self.name or ""
+            key = name.casefold()
+            # Zaten küçük harfli isimlerde ayrı bir dizgi tutulmaz
+            self._key = key = name if key == name else key
+        return key
+
+    def __getitem__(self, key):
+        if key in _ATTRIBUTES:
+            value = getattr(self, key)
+            if value is None:
+                raise KeyError(key)
+            return value
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def get(self, key, default=None):
+        # Gönderim döngüsü gibi sıcak yollarda çağrılır; istisna kullanılmaz
+        if key in _ATTRIBUTES:
+            value = getattr(self, key)
+            return default if value is None else value
+        if self._extra is None:
+            return default
+        return self._extra.get(key, default)
+
+    def __setitem__(self, key, value):
+        if key in _ATTRIBUTES:
+            if key == "name":
+                self._key = None
+            elif key == "mac" and value != self.mac:
+                # MAC değiştiyse önbellekteki paket geçersizdir
+                self._mac = self._packet = None
+            setattr(self, key, value)
+        elif self._extra is None:
+            self._extra = {key: value}
+        else:
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        self[key]
+        if key in _ATTRIBUTES:
+            self[key] = None
+        else:
+            del self._extra[key]
+            if not self._extra:
+                self._extra = None
+
+    def __contains__(self, key):
+        if key in _ATTRIBUTES:
+            return getattr(self, key) is not None
+        return self._extra is not None and key in self._extra
+
+    def pop(self, key, *default):
+        try:
+            value = self[key]
+        except KeyError:
+            if default:
+                return default[0]
+            raise
+        del self[key]
+        return value
+
+    def setdefault(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            self[key] = default
+            return default
+
+    def update(self, other=(), **changes):
+        for key, value in (other.items() if hasattr(other, "items") else other):
+            self[key] = value
+        for key, value in changes.items():
+            self[key] = value
+
+    def keys(self):
+        for key in _SLOT_FIELDS + _RUNTIME_FIELDS:
+            if getattr(self, key) is not None:
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    __iter__ = keys
+
+    def items(self):
+        return ((key, self[key]) for key in self.keys())
+
+    def values(self):
+        return (self[key] for key in self.keys())
+
+    def __len__(self):
+        return sum(1 for _ in self.keys())
+
+    def to_dict(self):
+        """ Kalıcı alanlar; JSON dosyasına ve SQLite'a yazılan biçim """
+        data = {key: value for key in _SLOT_FIELDS if (value := getattr(self, key)) is not None}
+        if self._extra:
+            data.update((k, v) for k, v in self._extra.items() if not k.startswith("_"))
+        return data
+
+    def __eq__(self, other):
+        if isinstance(other, Device):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Device({self.to_dict()!r})"
+
+
+class PausedGC:
+    """ Toplu kayıt oluştururken döngüsel çöp toplayıcıyı durdurur
+
+    Sadece dizgi içeren sözlüklerin aksine __slots__ kayıtları her zaman izlenir; büyük bir
+    yığında binlerce kayıt ayırmak art arda tam taramaları tetikler.
+    """
+
+    def __enter__(self):
+        self.enabled = gc.isenabled()
+        gc.disable()
+        return self
+
+    def __exit__(self, *exc):
+        if self.enabled:
+            gc.enable()
+
+
+def as_device(device):
+    return device if type(device) is Device else Device.from_dict(device)
+
+
+def persistent_fields(device):
+    """ '_' ile başlayan alanlar çalışma anı önbelleğidir, diske yazılmaz """
+    if type(device) is Device:
+        return device.to_dict()
+    return {k: v for k, v in device.items() if not k.startswith("_")}
+
+
+def new_device_id():
+    import uuid
+    return uuid.uuid4().hex
+
+
+def ensure_device_ids(devices):
+    """ Eski kayıtlara kalıcı bir kimlik verir; değişiklik olduysa True döner """
+    changed = False
+    for device in devices:
+        if not device.get("id"):
+            device["id"] = new_device_id()
+            changed = True
+    return changed
+
+
+def device_sort_key(device):
+    if type(device) is Device:
+        return device.sort_key()
+    return device.get("name", "").casefold()
+
+
+class DeviceCollection:
+    """ İsme göre sıralı cihaz listesi; değişiklikleri satır bazında dinleyicilere bildirir
+
+    Dinleyiciler şu metotları uygulayabilir (hepsi isteğe bağlı):
+    begin_insert(row), end_insert(row, device), begin_remove(row, device),
+    end_remove(row, device), begin_move(old_row, new_row), end_move(old_row, new_row),
+    updated(row, device), begin_reset(), end_reset()
+    """
+
+    def __init__(self, devices=()):
+        self._items = []
+        self._keys = []
+        self._by_id = {}
+        self._by_mac = {}
+        self._listeners = []
+        # Her bildirimde artar; anlık kopyadan sonra değişiklik olup olmadığını anlamak için
+        self.changes = 0
+        self._load(devices)
+
+    def _load(self, devices):
+        with PausedGC():
+            self._items = sorted(map(as_device, devices), key=Device.sort_key)
+        self._keys = [d.sort_key() for d in self._items]
+        self._by_id = {d.id: d for d in self._items}
+        self._by_mac = {}
+        for device in self._items:
+            self._index_mac(device)
+
+    def _index_mac(self, device):
+        # Paket oluştururken tekrar ayrıştırmamak için 6 baytlık hali kayıtta tutulur; kayıt MAC
+        # değişince bunu ve hazır paketi siler, yoksa sıfırlamalarda yeniden ayrıştırılmaz
+        packed = device._mac
+        if packed is None:
+            key = mac_key(device.mac or "")
+            device._packet = None
+            if key is None:
+                return
+            packed = device._mac = key.to_bytes(6, "big")
+        # Dizin anahtarı kayıttaki baytlarla aynı nesnedir; tekrar eden MAC'ler için liste tutulur
+        bucket = self._by_mac.get(packed)
+        if bucket is None:
+            self._by_mac[packed] = device
+        elif type(bucket) is list:
+            bucket.append(device)
+        else:
+            self._by_mac[packed] = [bucket, device]
+
+    def _unindex_mac(self, device):
+        packed = device._mac
+        bucket = self._by_mac.get(packed)
+        if bucket is device:
+            del self._by_mac[packed]
+        elif type(bucket) is list:
+            for i, other in enumerate(bucket):
+                if other is device:
+                    del bucket[i]
+                    break
+            if len(bucket) == 1:
+                self._by_mac[packed] = bucket[0]
+
+    @staticmethod
+    def _packed(mac):
+        key = mac_key(mac)
+        return None if key is None else key.to_bytes(6, "big")
+
+    # Dinleyiciler
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self._listeners.remove(listener)
+
+    def _notify(self, event, *args):
+        self.changes += 1
+        for listener in self._listeners:
+            handler = getattr(listener, event, None)
+            if handler is not None:
+                handler(*args)
+
+    # Okuma
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __getitem__(self, row):
+        return self._items[row]
+
+    def get(self, device_id):
+        return self._by_id.get(device_id)
+
+    def index_of(self, device_id):
+        device = self._by_id.get(device_id)
+        if device is None:
+            return -1
+        # Aynı anahtara sahip küçük aralıkta kimliğe göre ara
+        key = device_sort_key(device)
+        row = bisect_left(self._keys, key)
+        while row < len(self._items) and self._keys[row] == key:
+            if self._items[row] is device:
+                return row
+            row += 1
+        return -1
+
+    def find_mac(self, mac):
+        """ Herhangi bir biçimdeki MAC için O(1) arama """
+        bucket = self._by_mac.get(self._packed(mac))
+        if bucket is None:
+            return []
+        return list(bucket) if type(bucket) is list else [bucket]
+
+    def has_mac(self, mac):
+        return self._packed(mac) in self._by_mac
+
+    def mac_snapshot(self):
+        """ MAC dizininin anlık kopyası; worker thread'inde find_mac/has_mac ile okunur (kayıtlar paylaşılır) """
+        return MacSnapshot(dict(self._by_mac), self.changes)
+
+    # Değişiklikler
+    def add(self, device):
+        """ Dönüş satır numarasıdır; sözlük verildiyse kayıt Device'a çevrilerek eklenir (self[row]) """
+        device = as_device(device)
+        key = device.sort_key()
+        row = bisect_right(self._keys, key)
+        self._notify("begin_insert", row)
+        self._items.insert(row, device)
+        self._keys.insert(row, key)
+        self._by_id[device.get("id")] = device
+        self._index_mac(device)
+        self._notify("end_insert", row, device)
+        return row
+
+    def remove(self, device_id):
+        row = self.index_of(device_id)
+        if row < 0:
+            return None
+        device = self._items[row]
+        self._notify("begin_remove", row, device)
+        del self._items[row]
+        del self._keys[row]
+        del self._by_id[device_id]
+        self._unindex_mac(device)
+        self._notify("end_remove", row, device)
+        return device
+
+    def update(self, device_id, **changes):
+        row = self.index_of(device_id)
+        if row < 0:
+            return -1
+        device = self._items[row]
+        key = (changes["name"] or "").casefold() if "name" in changes else device.sort_key()
+        if "mac" in changes:
+            self._unindex_mac(device)
+            device["mac"] = changes["mac"]
+            self._index_mac(device)
+
+        if key == self._keys[row]:
+            device.update(changes)
+            self._notify("updated", row, device)
+            return row
+
+        # İsim değişti: kaydı yeni sıralı konumuna taşı
+        new_row = bisect_right(self._keys, key)
+        if new_row > row:
+            # Kaydın kendisi çıkarılınca sonraki satırlar bir yukarı kayar
+            new_row -= 1
+
+        if new_row != row:
+            self._notify("begin_move", row, new_row)
+        del self._items[row]
+        del self._keys[row]
+        device.update(changes)
+        self._items.insert(new_row, device)
+        self._keys.insert(new_row, key)
+        if new_row != row:
+            self._notify("end_move", row, new_row)
+        self._notify("updated", new_row, device)
+        return new_row
+
+    def apply_batch(self, added=(), updates=None):
+        """ Toplu içe aktarma: tüm değişiklikler tek bir sıfırlama bildirimiyle uygulanır """
+        updates = updates or {}
+        for device_id, changes in updates.items():
+            device = self._by_id.get(device_id)
+            if device is not None:
+                if "mac" in changes:
+                    self._unindex_mac(device)
+                device.update(changes)
+                if "mac" in changes:
+                    self._index_mac(device)
+        self._notify("begin_reset")
+        # Sıralı iki dizinin birleşimi; Timsort bunu neredeyse doğrusal sürede yapar
+        self._load(self._items + list(added))
+        self._notify("end_reset")
+
+    def reset(self, devices):
+        self._notify("begin_reset")
+        self._load(devices)
+        self._notify("end_reset")
+
+    def to_list(self):
+        return [persistent_fields(device) for device in self._items]
+
+
+class MacSnapshot:
+    """ DeviceCollection.mac_snapshot() sonucu; koleksiyon sonradan değişse de kopya değişmez """
+
+    __slots__ = ("_by_mac", "changes")
+
+    def __init__(self, by_mac, changes):
+        self._by_mac = by_mac
+        # Kopyalandığı andaki DeviceCollection.changes
+        self.changes = changes
+
+    _packed = staticmethod(DeviceCollection._packed)
+    find_mac = DeviceCollection.find_mac
+    has_mac = DeviceCollection.has_mac
@@ -0,0 +1,337 @@
+import asyncio
+import ipaddress
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+from devices import mac_key
+
+# Varsayılan eşzamanlı yoklama sayısı ve yoklama zaman aşımı (saniye)
+DEFAULT_CONCURRENCY = 256
+DEFAULT_TIMEOUT = 1.0
+
+# TCP yoklamasında denenen yaygın portlar (SSH, HTTP, RPC, NetBIOS, HTTPS, SMB, RDP)
+DEFAULT_TCP_PORTS = (22, 80, 135, 139, 443, 445, 3389)
+
+# İlerleme bildirimleri arasındaki en kısa süre
+PROGRESS_INTERVAL = 0.1
+
+_ARP_LINE_RE = re.compile(
+    r"(\d{1,3}(?:\.\d{1,3}){3})\D+?((?:[0-9a-f]{1,2}[:-]){5}[0-9a-f]{1,2})", re.IGNORECASE)
+
+
+@dataclass
+class Host:
+    ip: str
+    mac: int = None
+    hostname: str = ""
+    prober: str = ""
+
+
+def expand_networks(networks):
+    """ CIDR listesindeki adresleri bellek harcamadan sırayla üretir """
+    for network in networks:
+        net = ipaddress.ip_network(str(network).strip(), strict=False)
+        if net.num_addresses == 1:
+            yield str(net.network_address)
+        else:
+            for address in net.hosts():
+                yield str(address)
+
+
+def count_addresses(networks):
+    total = 0
+    for network in networks:
+        net = ipaddress.ip_network(str(network).strip(), strict=False)
+        if net.num_addresses == 1:
+            total += 1
+        elif net.version == 4 and net.prefixlen < 31:
+            # Ağ ve broadcast adresleri taranmaz
+            total += net.num_addresses - 2
+        elif net.version == 6:
+            total += net.num_addresses - 1
+        else:
+            total += net.num_addresses
+    return total
+
+
+def local_network(prefix=24):
+    """ Varsayılan rota arayüzünün ağını tahmin eder (paket göndermez) """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sock.connect(("10.255.255.255", 1))
+        address = sock.getsockname()[0]
+    except OSError:
+        return None
+    finally:
+        sock.close()
+    return str(ipaddress.ip_network(f"{address}/{prefix}", strict=False))
+
+
+def _parse_mac_field(text):
+    # arp çıktısında 0:1:2:a:b:c gibi tek haneli gruplar olabilir
+    parts = re.split(r"[:-]", text)
+    if len(parts) != 6:
+        return None
+    return mac_key(":".join(part.zfill(2) for part in parts))
+
+
+def read_arp_table():
+    """ İşletim sisteminin ARP önbelleğini {ip: mac_int} olarak okur """
+    table = {}
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/net/arp", encoding="ascii") as f:
+                next(f, None)
+                for line in f:
+                    fields = line.split()
+                    # 0x0: tamamlanmamış kayıt
+                    if len(fields) >= 4 and fields[2] != "0x0":
+                        mac = _parse_mac_field(fields[3])
+                        if mac:
+                            table[fields[0]] = mac
+            return table
+        except OSError:
+            pass
+    try:
+        output = subprocess.run(["arp", "-a"], capture_output=True, text=True, timeout=5).stdout
+    except (OSError, subprocess.SubprocessError):
+        return table
+    for ip, mac_text in _ARP_LINE_RE.findall(output):
+        mac = _parse_mac_field(mac_text)
+        if mac:
+            table[ip] = mac
+    return table
+
+
+# ip -s neigh: "used KULLANIM/DOĞRULAMA/GÜNCELLEME" (saniye önce); ardından boşluk gelmeyebilir
+_NEIGH_USED_RE = re.compile(r"\bused (\d+)/(\d+)/(\d+)")
+
+
+def read_neighbours():
+    """ Linux komşu tablosunu (ip -s neigh) {ip: (mac_int, durum, kaç saniye önce doğrulandı)} olarak okur """
+    try:
+        output = subprocess.run(["ip", "-4", "-s", "neigh", "show"], capture_output=True, text=True,
+                                timeout=5).stdout
+    except (OSError, subprocess.SubprocessError):
+        return {}
+    table = {}
+    for line in output.splitlines():
+        fields = line.split()
+        if "lladdr" not in fields[:-1]:
+            continue
+        mac = _parse_mac_field(fields[fields.index("lladdr") + 1])
+        if mac:
+            used = _NEIGH_USED_RE.search(line)
+            table[fields[0]] = (mac, fields[-1], int(used.group(2)) if used else None)
+    return table
+
+
+class ArpCache:
+    """ ARP tablosunu kısa süreliğine önbellekler; her yoklamada dosya okunmaz """
+
+    def __init__(self, ttl=1.0, reader=read_arp_table):
+        self.ttl = ttl
+        self.reader = reader
+        self._table = {}
+        self._read_at = 0.0
+        # Thread havuzundan aynı anda çağrılınca tablo bir kez okunur
+        self._lock = threading.Lock()
+
+    def lookup(self, ip, refresh=False):
+        with self._lock:
+            now = time.monotonic()
+            if not self._read_at or (refresh and now - self._read_at >= self.ttl):
+                self._table = self.reader()
+                self._read_at = now
+            return self._table.get(ip)
+
+
+class Prober:
+    """ Yoklayıcı arayüzü: yanıt veren adres için Host, aksi halde None döner """
+
+    name = "prober"
+
+    async def probe(self, ip, timeout):
+        raise NotImplementedError
+
+
+class ArpCacheProber(Prober):
+    """ Ağa paket göndermez; sadece ARP önbelleğinde bulunan adresleri bildirir """
+
+    name = "arp"
+
+    def __init__(self, cache=None):
+        self.cache = cache or ArpCache()
+
+    async def probe(self, ip, timeout):
+        mac = self.cache.lookup(ip)
+        return Host(ip, mac, prober=self.name) if mac is not None else None
+
+
+class TcpConnectProber(Prober):
+    """ Bağlantı kabul edilir veya reddedilirse (RST) cihaz ayaktadır """
+
+    name = "tcp"
+
+    def __init__(self, ports=DEFAULT_TCP_PORTS):
+        self.ports = tuple(ports)
+
+    async def connect(self, ip, port, timeout):
+        """ Port bağlantıyı kabul eder veya reddederse True """
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout)
+        except ConnectionRefusedError:
+            return True
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        return True
+
+    async def probe(self, ip, timeout):
+        for port in self.ports:
+            if await self.connect(ip, port, timeout):
+                return Host(ip, prober=self.name)
+        return None
+
+
+class _EchoProtocol(asyncio.DatagramProtocol):
+    def __init__(self, future):
+        self.future = future
+
+    def datagram_received(self, data, addr):
+        if not self.future.done():
+            self.future.set_result(True)
+
+    def error_received(self, exc):
+        # ICMP port unreachable: cihaz yanıt verdi
+        if not self.future.done():
+            self.future.set_result(isinstance(exc, ConnectionRefusedError))
+
+
+class UdpEchoProber(Prober):
+    """ UDP echo (7) portuna datagram gönderir; yanıt veya ICMP unreachable canlılık sayılır """
+
+    name = "udp"
+
+    def __init__(self, port=7):
+        self.port = port
+
+    async def probe(self, ip, timeout):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        try:
+            transport, _ = await loop.create_datagram_endpoint(
+                lambda: _EchoProtocol(future), remote_addr=(ip, self.port))
+        except OSError:
+            return None
+        try:
+            transport.sendto(b"wol-manager")
+            alive = await asyncio.wait_for(future, timeout)
+        except (OSError, asyncio.TimeoutError):
+            alive = False
+        finally:
+            transport.close()
+        return Host(ip, prober=self.name) if alive else None
+
+
+class FakeNetworkProber(Prober):
+    """ Çevrimdışı deneme için sahte ağ: {ip: mac} sözlüğündeki adresler yanıt verir """
+
+    name = "fake"
+
+    def __init__(self, hosts, latency=0.0, hostnames=None):
+        self.hosts = {ip: mac_key(mac) for ip, mac in hosts.items()}
+        self.latency = latency
+        self.hostnames = hostnames or {}
+
+    async def probe(self, ip, timeout):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if ip in self.hosts:
+            return Host(ip, self.hosts[ip], self.hostnames.get(ip, ""), self.name)
+        return None
+
+
+def default_probers():
+    cache = ArpCache()
+    return [ArpCacheProber(cache), TcpConnectProber(), UdpEchoProber()]
+
+
+class DiscoveryScanner:
+    """ CIDR aralıklarını sınırlı eşzamanlılıkla tarar; bulunan cihazları anında bildirir """
+
+    def __init__(self, probers=None, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT,
+                 arp_cache=None, resolve_names=False):
+        self.probers = probers if probers is not None else default_probers()
+        self.concurrency = max(1, int(concurrency))
+        self.timeout = timeout
+        self.resolve_names = resolve_names
+        # Aktif yoklamadan sonra MAC adresi ARP önbelleğinden çözülür
+        self.arp_cache = arp_cache
+        if self.arp_cache is None:
+            for prober in self.probers:
+                if isinstance(prober, ArpCacheProber):
+                    self.arp_cache = prober.cache
+                    break
+            else:
+                self.arp_cache = ArpCache()
+
+    async def _probe(self, ip):
+        for prober in self.probers:
+            host = await prober.probe(ip, self.timeout)
+            if host is not None:
+                if host.mac is None:
+                    host.mac = self.arp_cache.lookup(ip, refresh=True)
+                if self.resolve_names and not host.hostname:
+                    host.hostname = await self._resolve_name(ip)
+                return host
+        return None
+
+    async def _resolve_name(self, ip):
+        loop = asyncio.get_running_loop()
+        try:
+            name, _ = await asyncio.wait_for(
+                loop.getnameinfo((ip, 0), socket.NI_NAMEREQD), self.timeout)
+        except (OSError, asyncio.TimeoutError):
+            return ""
+        return name
+
+    async def scan(self, networks, on_host=None, on_progress=None):
+        """ Tarama bitince bulunan Host listesini döner; iptal edilirse CancelledError yükselir """
+        networks = list(networks)
+        total = count_addresses(networks)
+        addresses = expand_networks(networks)
+        found = []
+        state = {"done": 0, "reported": 0.0}
+
+        def report(final=False):
+            now = time.monotonic()
+            if on_progress and (final or now - state["reported"] >= PROGRESS_INTERVAL):
+                state["reported"] = now
+                on_progress(state["done"], total, len(found))
+
+        async def worker():
+            # Ortak üreteçten adres çekilir; bellek kullanımı ağ boyutundan bağımsızdır
+            for ip in addresses:
+                host = await self._probe(ip)
+                state["done"] += 1
+                if host is not None:
+                    found.append(host)
+                    if on_host:
+                        on_host(host)
+                report()
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(min(self.concurrency, max(total, 1)))]
+        try:
+            await asyncio.gather(*workers)
+        except asyncio.CancelledError:
+            for task in workers:
+                task.cancel()
+            raise
+        report(final=True)
+        return found
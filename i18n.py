@@ -0,0 +1,80 @@
+import json
+import os
+import sys
+
+# Katalog dizini; PyInstaller paketinde _MEIPASS altındadır
+I18N_DIR = os.path.join(getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__))), "i18n")
+LANGUAGES_FILE = "languages.json"
+FALLBACK_LANGUAGE = "en"
+
+_languages = None
+
+
+def available_languages():
+    """ {dil kodu: dilin kendi adı}; seçim kutusundaki sırayla """
+    global _languages
+    if _languages is None:
+        with open(os.path.join(I18N_DIR, LANGUAGES_FILE), encoding="utf-8") as f:
+            _languages = json.load(f)
+    return _languages
+
+
+class Section:
+    """ Katalogun 'bölüm.anahtar' alt kümesine kısa anahtarla erişim """
+
+    __slots__ = ("catalog", "prefix")
+
+    def __init__(self, catalog, name):
+        self.catalog = catalog
+        self.prefix = name + "."
+
+    def __getitem__(self, key):
+        return self.catalog[self.prefix + key]
+
+
+class Catalog:
+    """ Dil başına bir JSON katalog; sadece kullanılan diller ve gerekirse yedek dil yüklenir
+
+    Etkin dilin tablosu düz bir {anahtar: metin} sözlüğüdür. Eksik anahtarlar yedek dilden,
+    orada da yoksa anahtarın kendisi olarak döner.
+    """
+
+    def __init__(self, language=FALLBACK_LANGUAGE, directory=None, fallback=FALLBACK_LANGUAGE):
+        self.directory = directory or I18N_DIR
+        self.fallback = fallback
+        self._tables = {}
+        self.language = None
+        self._table = {}
+        self.set_language(language)
+
+    def _load(self, language):
+        table = self._tables.get(language)
+        if table is None:
+            path = os.path.join(self.directory, f"{language}.json")
+            try:
+                with open(path, encoding="utf-8") as f:
+                    table = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Dil dosyası yüklenemedi: {path}: {e}")
+                table = {}
+            self._tables[language] = table
+        return table
+
+    def set_language(self, language):
+        self.language = language
+        self._table = self._load(language)
+
+    def __getitem__(self, key):
+        try:
+            return self._table[key]
+        except KeyError:
+            if self.language == self.fallback:
+                return key
+            return self._load(self.fallback).get(key, key)
+
+    def __call__(self, key, **kwargs):
+        text = self[key]
+        return text.format(**kwargs) if kwargs else text
+
+    def section(self, name):
+        return Section(self, name)
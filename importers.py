@@ -0,0 +1,238 @@
+import csv
+import os
+import re
+import xml.etree.ElementTree as ET
+
+from devices import mac_key, format_mac, new_device_id
+
+# Desteklenen biçimler
+FORMATS = ("nmap", "arp", "ip-neigh", "isc-leases", "dnsmasq", "csv")
+
+_IP_NEIGH_RE = re.compile(r"^(\S+)\s.*\blladdr\s+(\S+)")
+_ISC_LEASE_RE = re.compile(r"^\s*lease\s+(\S+)\s*\{")
+_ISC_HARDWARE_RE = re.compile(r"^\s*hardware\s+ethernet\s+([0-9a-fA-F:]+)\s*;")
+_ISC_HOSTNAME_RE = re.compile(r'^\s*client-hostname\s+"([^"]*)"\s*;')
+
+
+# CSV'de bulunabilecek isteğe bağlı yönlendirme alanları (bkz. WakeEngine.route)
+ROUTE_FIELDS = ("broadcast", "broadcast_port", "interface")
+
+
+def _record(mac, ip="", name=""):
+    # Kayıt: tamsayı MAC, IP ve isim; geçersiz MAC'te None (okuyucular bunu da verir, atlanan
+    # satır olarak sayılır)
+    key = mac_key(mac)
+    if key is None:
+        return None
+    return {"mac": key, "ip": ip or "", "name": name or ""}
+
+
+def iter_nmap_xml(path):
+    """ nmap -oX çıktısını ağaç oluşturmadan host host okur """
+    context = ET.iterparse(path, events=("start", "end"))
+    _, root = next(context)
+    for event, elem in context:
+        if event != "end" or elem.tag != "host":
+            continue
+        status = elem.find("status")
+        if status is None or status.get("state", "up") == "up":
+            ip = mac = ""
+            for address in elem.iter("address"):
+                kind = address.get("addrtype")
+                if kind == "mac":
+                    mac = address.get("addr", "")
+                elif kind in ("ipv4", "ipv6") and not ip:
+                    ip = address.get("addr", "")
+            hostname = elem.find("hostnames/hostname")
+            name = hostname.get("name", "") if hostname is not None else ""
+            yield _record(mac, ip, name)
+        # İşlenen host'lar bellekte tutulmaz
+        elem.clear()
+        root.clear()
+
+
+def iter_arp_table(path):
+    """ /proc/net/arp biçimi: IP, HW type, Flags, HW address, Mask, Device """
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) < 4 or fields[0] == "IP" or fields[2] == "0x0":
+                continue
+            yield _record(fields[3], fields[0])
+
+
+def iter_ip_neigh(path):
+    """ 'ip neigh' çıktısı: 192.168.1.5 dev eth0 lladdr aa:bb:cc:dd:ee:ff REACHABLE """
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            match = _IP_NEIGH_RE.match(line)
+            if match:
+                yield _record(match.group(2), match.group(1))
+
+
+def iter_isc_leases(path):
+    """ ISC dhcpd.leases: aynı MAC için son kira kaydı geçerlidir """
+    ip = mac = name = ""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            match = _ISC_LEASE_RE.match(line)
+            if match:
+                ip, mac, name = match.group(1), "", ""
+                continue
+            match = _ISC_HARDWARE_RE.match(line)
+            if match:
+                mac = match.group(1)
+                continue
+            match = _ISC_HOSTNAME_RE.match(line)
+            if match:
+                name = match.group(1)
+                continue
+            if line.strip() == "}" and ip:
+                yield _record(mac, ip, name)
+                ip = mac = name = ""
+
+
+def iter_dnsmasq_leases(path):
+    """ dnsmasq.leases: bitiş zamanı, MAC, IP, isim, istemci kimliği """
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) >= 3:
+                name = fields[3] if len(fields) > 3 and fields[3] != "*" else ""
+                yield _record(fields[1], fields[2], name)
+
+
+def iter_csv(path):
+    """ Başlık satırında name/mac/ip (ve isteğe bağlı broadcast/broadcast_port/interface)
+    sütunları olan CSV; sütun adları büyük/küçük harf duyarsız
+    """
+    with open(path, newline="", encoding="utf-8-sig", errors="replace") as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.reader(f, dialect)
+        header = [column.strip().lower() for column in next(reader, [])]
+
+        def column(*names):
+            for name in names:
+                if name in header:
+                    return header.index(name)
+            return None
+
+        mac_col = column("mac", "mac address", "mac_address", "macaddress")
+        ip_col = column("ip", "ip address", "ip_address", "ipaddress")
+        name_col = column("name", "hostname", "device", "device name")
+        route_cols = [(field, column(field)) for field in ROUTE_FIELDS if column(field) is not None]
+        if mac_col is None:
+            return
+        for row in reader:
+            if not any(field.strip() for field in row):
+                continue
+            if len(row) <= mac_col:
+                yield None
+                continue
+            ip = row[ip_col].strip() if ip_col is not None and ip_col < len(row) else ""
+            name = row[name_col].strip() if name_col is not None and name_col < len(row) else ""
+            record = _record(row[mac_col].strip(), ip, name)
+            if record:
+                for field, col in route_cols:
+                    value = row[col].strip() if col < len(row) else ""
+                    if value:
+                        record[field] = int(value) if field == "broadcast_port" and value.isdigit() else value
+            yield record
+
+
+_READERS = {
+    "nmap": iter_nmap_xml,
+    "arp": iter_arp_table,
+    "ip-neigh": iter_ip_neigh,
+    "isc-leases": iter_isc_leases,
+    "dnsmasq": iter_dnsmasq_leases,
+    "csv": iter_csv,
+}
+
+
+def detect_format(path):
+    """ Uzantıya ve ilk satırlara bakarak biçimi tahmin eder """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".xml":
+        return "nmap"
+    if extension == ".csv":
+        return "csv"
+    with open(path, encoding="utf-8", errors="replace") as f:
+        head = f.read(4096)
+    if "<nmaprun" in head:
+        return "nmap"
+    if head.startswith("IP address") and "HW address" in head:
+        return "arp"
+    if _ISC_LEASE_RE.search(head) or "lease " in head and "hardware ethernet" in head:
+        return "isc-leases"
+    for line in head.splitlines():
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        if " lladdr " in line or " dev " in line:
+            return "ip-neigh"
+        fields = line.split()
+        if len(fields) >= 4 and fields[0].isdigit() and mac_key(fields[1]) is not None:
+            return "dnsmasq"
+        break
+    return "csv"
+
+
+def iter_records(path, fmt=None):
+    """ Dosyadaki kayıtlar akış halinde; geçersiz MAC'li satırlar için None """
+    return _READERS[fmt or detect_format(path)](path)
+
+
+def plan_import(records, collection):
+    """ Kayıtları tekilleştirir ve envantere göre yeni/güncellenecek cihazlara ayırır
+
+    collection find_mac destekleyen herhangi bir nesne olabilir (ör. worker thread'inde
+    DeviceCollection.mac_snapshot()). Geçersiz MAC'li satırlar (None) atlanmış sayılır.
+    Dönüş: (eklenecek cihazlar, {cihaz kimliği: değişiklikler}, atlanan kayıt sayısı)
+    """
+    added = {}
+    updates = {}
+    skipped = 0
+    for record in records:
+        if record is None:
+            skipped += 1
+            continue
+        key = record["mac"]
+        if key in added:
+            # Dosya içinde tekrar: eksik alanları tamamla
+            device = added[key]
+            if record["ip"]:
+                device["ip"] = record["ip"]
+            if record["name"] and device["name"] == device.get("ip", ""):
+                device["name"] = record["name"]
+            device.update((field, record[field]) for field in ROUTE_FIELDS if field in record)
+            skipped += 1
+            continue
+
+        existing = collection.find_mac(key)
+        if existing:
+            device = existing[0]
+            changes = updates.setdefault(device.get("id"), {})
+            if record["ip"] and record["ip"] != device.get("ip"):
+                changes["ip"] = record["ip"]
+            for field in ROUTE_FIELDS:
+                if field in record and record[field] != device.get(field):
+                    changes[field] = record[field]
+            if not changes:
+                del updates[device.get("id")]
+                skipped += 1
+            continue
+
+        added[key] = {
+            "id": new_device_id(),
+            "name": record["name"] or record["ip"] or format_mac(key),
+            "mac": format_mac(key),
+        }
+        if record["ip"]:
+            added[key]["ip"] = record["ip"]
+        added[key].update((field, record[field]) for field in ROUTE_FIELDS if field in record)
+    return list(added.values()), updates, skipped
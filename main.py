@@ -1,12 +1,36 @@
+import time
+_PROCESS_START = time.perf_counter()
+
 import sys
 import locale
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QLineEdit, QPushButton, QLabel, 
-                            QTableWidget, QTableWidgetItem, QComboBox, QHeaderView, QFrame)
-from PyQt6.QtCore import Qt
-from wakeonlan import send_magic_packet
-import json
+                            QTableView, QComboBox, QHeaderView, QFrame,
+                            QAbstractItemView, QFileDialog, QToolButton, QPlainTextEdit)
+from PyQt6.QtCore import Qt, QFileSystemWatcher, QSortFilterProxyModel, QSignalBlocker, QTimer, pyqtSignal
+from PyQt6.QtGui import QColor, QFontDatabase
+from wol_engine import WakeEngine
+from device_model import (DeviceTableModel, SearchFilterModel, ButtonDelegate, DeviceIdRole, COL_MAC,
+                          COL_TARGET, COL_STATUS, COL_WAKE, COL_DELETE)
+from devices import (DeviceCollection, ensure_device_ids, new_device_id, parse_mac, format_mac,
+                     InvalidMacError)
+from storage import open_store, store_paths, StorageError
+from persistence import JsonFileWriter, DEFAULT_WINDOW, DEFAULT_FSYNC
+from workers import JobRunner, ScanThread, VerifyThread, MonitorThread, StormThread, DEFAULT_MAX_WORKERS
+from discovery import DiscoveryScanner, local_network, DEFAULT_CONCURRENCY
+from importers import iter_records, plan_import
+from verify import WakeVerifier, DEFAULT_MAX_IN_FLIGHT
+from monitor import LivenessMonitor, CollectionFeed
+from scheduler import Scheduler, ScheduleFeed, SchedulerLock, mark_run, MAX_SLEEP
+from search import SearchIndex
+from storm import WakeStorm, DEFAULT_PACKETS_PER_SEC, DEFAULT_HOSTS_PER_SEC, DEFAULT_GROUP_STAGGER
+from theme import ThemeManager
+from metrics import metrics, Stopwatch
+from stalls import StallWatchdog, SessionProfiler, DEFAULT_THRESHOLD
+from settings import load_settings, settings_path, detect_language
+from i18n import Catalog, available_languages, FALLBACK_LANGUAGE
 import os
+import ipaddress
 from PyQt6.QtGui import QIcon
 
 # Uygulama sürümü
@@ -14,6 +38,11 @@ APP_VERSION = "v1.1"
 APP_NAME = f"WOL Manager {APP_VERSION}"
 APP_COMPANY = "by WebAdhere Technologies"
 
+# Tanılama paneli ve ölçüm dosyasının yenilenme aralığı
+METRICS_INTERVAL_MS = 1000
+# Depo dosyası değişince zamanlamaların yeniden okunması için bekleme (art arda yazmalar birleşir)
+STORE_CHECK_DELAY_MS = 300
+
 def resource_path(relative_path):
     """ PyInstaller için kaynak dosya yolunu alır """
     try:
@@ -22,19 +51,154 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
+class StartupTrace:
+    """ Açılış aşamalarının milisaniye cinsinden zaman çizelgesi """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.marks = []
+
+    def mark(self, phase):
+        if self.enabled:
+            self.marks.append((phase, (time.perf_counter() - _PROCESS_START) * 1000))
+
+    def report(self, stream=None):
+        if not self.enabled:
+            return
+        stream = stream or sys.stderr
+        previous = 0.0
+        for phase, at in self.marks:
+            print(f"{at:8.1f} ms  +{at - previous:7.1f} ms  {phase}", file=stream)
+            previous = at
+
 class WakeOnLANApp(QMainWindow):
-    def __init__(self, system_dark_mode=False, system_language="en"):
+    # Arka plandaki yazma hataları GUI thread'ine bu sinyal ile taşınır
+    persistence_error = pyqtSignal(str)
+
+    def __init__(self, system_dark_mode=False, system_language="en", storage_backend="sqlite",
+                 write_behind_window=DEFAULT_WINDOW, fsync_policy=DEFAULT_FSYNC, settings=None,
+                 trace=None):
         super().__init__()
+        # Açılış zaman çizelgesi (--trace-startup ile yazdırılır)
+        self.trace = trace or StartupTrace()
+        
         # Sistem ayarlarını sakla
         self._system_dark_mode = system_dark_mode
         self._system_language = system_language
         
-        # Varsayılan değerleri ayarla
-        self.dark_mode = system_dark_mode  # Başlangıçta sistem temasını kullan
-        self.current_language = system_language
+        # Ayarlar tek sefer okunur; __main__ okuduysa tekrar okunmaz
+        if settings is None:
+            settings = load_settings()
+        settings = settings or {}
+        # Kaydederken bilinmeyen ve sadece dosyadan okunan anahtarlar (ör. watchdog) korunur
+        self._settings = dict(settings)
+        
+        # Kaydedilmiş ayar yoksa sistem teması ve dili kullanılır
+        self.dark_mode = bool(settings.get('dark_mode', system_dark_mode))
+        self.current_language = settings.get('language', system_language)
+        if self.current_language not in available_languages():
+            self.current_language = FALLBACK_LANGUAGE
+        
+        # Ölçümler (tanılama paneli ve Prometheus textfile); kapalıyken sıcak yollarda maliyeti yoktur
+        # Ölçüm kaydı isteğe bağlıdır; kapalıyken sıcak yollar tek bir bayrak kontrolü yapar
+        metrics.enabled = bool(settings.get('metrics', False))
+        self.metrics_textfile = settings.get('metrics_textfile')
+        
+        # Sadece etkin dilin kataloğu yüklenir
+        self.i18n = Catalog(self.current_language)
+        
+        # Cihaz deposu (sqlite veya eski json); yazmalar birleştirilip arka planda yapılır
+        self.storage_backend = storage_backend
+        self.write_behind_window = write_behind_window
+        self.fsync_policy = fsync_policy
+        self.store = None
+        self._load_error = None
+        self.persistence_error.connect(self._on_persistence_error)
+        
+        # Ayarlar dosyası da aynı şekilde atomik ve birleştirilmiş yazılır
+        self.settings_writer = JsonFileWriter(write_behind_window, fsync_policy,
+                                              on_error=lambda e: self.persistence_error.emit(str(e)))
         
-        # Cihazları yükle
-        self.devices = self.load_devices()
+        # Cihazları yükle (isme göre sıralı, değişiklikleri tabloya bildirir)
+        self.devices = DeviceCollection(self.load_devices())
+        self.trace.mark("cihazlar yüklendi")
+        
+        # Arama dizini; tablo modelinden önce abone olur ki süzgeç güncel dizini görsün.
+        # GUI boştayken parça parça kurulur, koleksiyon sıfırlanınca yeniden kurulur
+        self.search_build_timer = QTimer(self)
+        self.search_build_timer.timeout.connect(self._build_search_index)
+        self.search_index = SearchIndex(self.devices, on_stale=self.search_build_timer.start)
+        self.search_build_timer.start()
+        
+        # Tüm uyandırmalar tek bir soket üzerinden gönderilir
+        self.wake_engine = WakeEngine()
+        
+        # Ağ ve disk işleri GUI thread'i dışında çalışır
+        self.jobs = JobRunner(settings.get('max_workers', DEFAULT_MAX_WORKERS), self)
+        
+        # Ağ taraması (çalışırken ScanThread)
+        self.scan_thread = None
+        self.scan_concurrency = DEFAULT_CONCURRENCY
+        
+        metrics.gauge("wol_devices", "Devices in the inventory", lambda: len(self.devices))
+        
+        # Tanılama paneli açıkken ve textfile verilmişse ölçümler düzenli olarak yenilenir
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.setInterval(METRICS_INTERVAL_MS)
+        self.metrics_timer.timeout.connect(self._refresh_metrics)
+        if metrics.enabled and self.metrics_textfile:
+            self.metrics_timer.start()
+        
+        # Event loop takılma bekçisi: ana thread kalp atışı verir, yardımcı thread yığını günlüğe yazar
+        self.watchdog = None
+        self.heartbeat_timer = QTimer(self)
+        if settings.get('watchdog', True):
+            self.watchdog = StallWatchdog(settings.get('stall_threshold_ms', DEFAULT_THRESHOLD * 1000) / 1000)
+            self.heartbeat_timer.setInterval(int(self.watchdog.interval * 1000))
+            self.heartbeat_timer.timeout.connect(self.watchdog.beat)
+            self.heartbeat_timer.start()
+            self.watchdog.start()
+        
+        # Toplu uyandırma hız sınırları (çalışırken StormThread); 0 = sınırsız
+        self.storm_thread = None
+        self._storm_pending = set()
+        self.wake_packets_per_sec = settings.get('wake_packets_per_sec', DEFAULT_PACKETS_PER_SEC)
+        self.wake_hosts_per_sec = settings.get('wake_hosts_per_sec', DEFAULT_HOSTS_PER_SEC)
+        self.wake_group_stagger = settings.get('wake_group_stagger', DEFAULT_GROUP_STAGGER)
+        
+        # Uyandır-ve-doğrula (çalışırken VerifyThread)
+        self.verify_thread = None
+        self._verify_pending = set()
+        self.verify_in_flight = DEFAULT_MAX_IN_FLIGHT
+        
+        # Canlılık monitörü; koleksiyondaki değişiklikler monitöre kendiliğinden iletilir
+        self.monitor = LivenessMonitor()
+        self.monitor_feed = CollectionFeed(self.monitor, self.devices)
+        
+        # Zamanlanmış uyandırmalar; daemon kullanılıyorsa ayarlardan kapatılabilir
+        self.scheduler_enabled = bool(settings.get('scheduler', True))
+        self.scheduler = Scheduler()
+        self.schedule_feed = ScheduleFeed(self.scheduler, self.devices)
+        self.schedule_timer = QTimer(self)
+        self.schedule_timer.setSingleShot(True)
+        self.schedule_timer.timeout.connect(self._run_schedules)
+        # wol.py daemon da çalışıyorsa işleri sadece kilidi alan süreç çalıştırır
+        self.scheduler_lock = SchedulerLock()
+        if self.scheduler_enabled:
+            self._arm_schedule_timer()
+        
+        # wol.py schedule veya daemon depoya yazınca zamanlamalar I/O worker'ında yeniden okunur
+        self._schedules_refreshing = False
+        self.store_check_timer = QTimer(self)
+        self.store_check_timer.setSingleShot(True)
+        self.store_check_timer.setInterval(STORE_CHECK_DELAY_MS)
+        self.store_check_timer.timeout.connect(self._refresh_external_schedules)
+        self.store_watcher = QFileSystemWatcher(self)
+        self.store_watcher.fileChanged.connect(self._on_store_file_changed)
+        self._watch_store()
+        
+        # Açık/koyu tema uygulama düzeyinde uygulanır
+        self.theme = ThemeManager(QApplication.instance())
         
         # İkon yolu
         icon_path = resource_path('pwr.png')
@@ -43,62 +207,46 @@ class WakeOnLANApp(QMainWindow):
         
         # UI'ı başlat
         self.init_ui()
+        self.trace.mark("arayüz oluşturuldu")
         
-        # Stili yükle
-        self.load_style()
+        # Durum değişiklikleri tek satır güncellemesi olarak tabloya gelir
+        self.monitor_thread = MonitorThread(self.monitor, self)
+        self.monitor_thread.state_changed.connect(self.device_model.set_liveness)
+        self.monitor_thread.start()
         
-        # Tema combobox'ını güncelle
-        self.update_theme_combo()
+        # Liste okunamadıysa kullanıcıya bildir (bozuk depo üzerine yazılmaz)
+        if self._load_error:
+            self.result_label.setText(self.i18n["storage.load_error"])
         
-        # Kaydedilmiş ayarları yükle ve uygula
-        self._load_and_apply_settings()
+        # Tema ve dil ilk çizimden önce bir kez uygulanır
+        self._apply_initial_settings()
+        self.trace.mark("tema ve dil uygulandı")
 
-    def _load_and_apply_settings(self):
-        try:
-            settings_path = os.path.join(os.path.expanduser('~'), 'wake_on_lan_settings.json')
-            if os.path.exists(settings_path):
-                with open(settings_path, 'r', encoding='utf-8') as f:
-                    settings = json.load(f)
-                    # Tema ayarını uygula
-                    if 'dark_mode' in settings:
-                        self.dark_mode = settings['dark_mode']
-                        self.load_style()
-                        self.update_theme_combo()
-                    # Dil ayarını uygula
-                    if 'language' in settings:
-                        self.current_language = settings.get('language', self._system_language)
-            else:
-                # İlk kez çalıştırılıyorsa sistem ayarlarını kaydet
-                self._save_settings()
-        except Exception as e:
-            print(f"Ayarlar yüklenirken hata: {e}")
-            self.dark_mode = self._system_dark_mode
-            self.current_language = self._system_language
-            self._save_settings()
-        
-        # Dil indeksini ayarla
-        lang_index_map = {
-            "tr": 0,
-            "en": 1,
-            "de": 2,
-            "fr": 3,
-            "it": 4,
-            "ru": 5
-        }
-        
-        # Dil ayarını uygula
-        self.language_combo.setCurrentIndex(lang_index_map.get(self.current_language, 1))
+    def _apply_initial_settings(self):
+        # Başlangıçta seçim kutularının sinyalleri tetiklenmez; diske hiçbir şey yazılmaz
+        with QSignalBlocker(self.language_combo):
+            self.language_combo.setCurrentIndex(list(available_languages()).index(self.current_language))
         self.retranslate_ui()
+        self.load_style()
+        self.language_combo.currentIndexChanged.connect(self.change_language)
+        self.theme_combo.currentIndexChanged.connect(self.toggle_theme)
 
     def _save_settings(self):
         try:
-            settings_path = os.path.join(os.path.expanduser('~'), 'wake_on_lan_settings.json')
-            settings = {
+            settings = self._settings
+            settings.update({
                 'dark_mode': self.dark_mode,
-                'language': self.current_language
-            }
-            with open(settings_path, 'w', encoding='utf-8') as f:
-                json.dump(settings, f, ensure_ascii=False, indent=2)
+                'language': self.current_language,
+                'max_workers': self.jobs.max_workers,
+                'wake_packets_per_sec': self.wake_packets_per_sec,
+                'wake_hosts_per_sec': self.wake_hosts_per_sec,
+                'wake_group_stagger': self.wake_group_stagger,
+                'scheduler': self.scheduler_enabled,
+                'metrics': metrics.enabled,
+                'metrics_textfile': self.metrics_textfile
+            })
+            # Yazma arka planda yapılır; kopyası verilir
+            self.settings_writer.write_json(settings_path(), dict(settings), ensure_ascii=False, indent=2)
         except Exception as e:
             print(f"Ayarlar kaydedilirken hata: {e}")
 
@@ -120,14 +268,12 @@ class WakeOnLANApp(QMainWindow):
         
         # Dil seçimi
         self.language_combo = QComboBox()
-        self.language_combo.addItems(["Türkçe", "English", "Deutsch", "Français", "Italiano", "Русский"])
+        self.language_combo.addItems(list(available_languages().values()))
         self.language_combo.setFixedWidth(120)
-        self.language_combo.currentIndexChanged.connect(self.change_language)
         
         # Tema seçimi
         self.theme_combo = QComboBox()
         self.theme_combo.setFixedWidth(120)
-        self.theme_combo.currentIndexChanged.connect(self.toggle_theme)
         
         top_menu.addWidget(self.language_combo)
         top_menu.addWidget(self.theme_combo)
@@ -139,7 +285,6 @@ class WakeOnLANApp(QMainWindow):
         form_layout = QHBoxLayout()
         
         self.device_name = QLineEdit()
-        self.device_name.setPlaceholderText(self.tr("Cihaz Adı"))
         self.device_name.setObjectName("input_field")  # Stil için ID ekle
         
         self.mac_address = QLineEdit()
@@ -147,7 +292,7 @@ class WakeOnLANApp(QMainWindow):
         self.mac_address.setPlaceholderText("XX:XX:XX:XX:XX:XX")
         self.mac_address.setObjectName("input_field")  # Stil için ID ekle
         
-        self.add_button = QPushButton(self.tr("Ekle"))
+        self.add_button = QPushButton()
         self.add_button.setFixedWidth(100)
         self.add_button.setObjectName("add_button")  # Stil için ID ekle
         self.add_button.clicked.connect(self.add_device)
@@ -158,35 +303,122 @@ class WakeOnLANApp(QMainWindow):
         
         layout.addLayout(form_layout)
         
-        # Cihaz tablosu
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels([
-            self.tr("Cihaz Adı"),
-            self.tr("MAC Adresi"),
-            self.tr("İşlem"),
-            self.tr("Sil")
-        ])
+        # Ağ tarama formu
+        scan_layout = QHBoxLayout()
+        
+        self.scan_input = QLineEdit()
+        self.scan_input.setPlaceholderText("192.168.1.0/24")
+        self.scan_input.setObjectName("input_field")
+        
+        self.scan_button = QPushButton()
+        self.scan_button.setFixedWidth(100)
+        self.scan_button.setObjectName("add_button")
+        self.scan_button.clicked.connect(self.toggle_scan)
+        
+        scan_layout.addWidget(self.scan_input, 1)
+        scan_layout.addWidget(self.scan_button)
+        
+        layout.addLayout(scan_layout)
+        
+        # Arama kutusu: isim, MAC (herhangi bir biçimde), IP veya gruba göre yazarken süzer
+        self.search_input = QLineEdit()
+        self.search_input.setObjectName("input_field")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.textChanged.connect(self.filter_devices)
+        
+        layout.addWidget(self.search_input)
+        
+        # Cihaz tablosu (model/view; sadece görünür satırlar çizilir)
+        # Metinler ve başlıklar retranslate_ui'da dil kataloğundan verilir
+        self.device_model = DeviceTableModel(self.devices, self)
+        self.device_model.device_renamed.connect(self.save_device_changes)
+        self.device_model.device_target_changed.connect(self.save_device_changes)
+        
+        # Arama süzgeci satırları yeniden oluşturmaz; sıralama en üstteki proxy'dedir
+        self.search_model = SearchFilterModel(self.search_index, self)
+        self.search_model.setSourceModel(self.device_model)
+        
+        self.proxy_model = QSortFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.search_model)
+        self.proxy_model.setSortCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        
+        self.table = QTableView()
+        self.table.setModel(self.proxy_model)
+        
+        # Uyandır/Sil butonları delegate ile çizilir
+        self.wake_delegate = ButtonDelegate(self.table)
+        self.wake_delegate.clicked.connect(self._on_wake_clicked)
+        self.delete_delegate = ButtonDelegate(self.table, QColor("red"))
+        self.delete_delegate.clicked.connect(self._on_delete_clicked)
+        self.table.setItemDelegateForColumn(COL_WAKE, self.wake_delegate)
+        self.table.setItemDelegateForColumn(COL_DELETE, self.delete_delegate)
         
         # Tablo ayarları
         self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
-        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Fixed)
-        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Fixed)
-        self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.Fixed)
+        for column in (COL_MAC, COL_TARGET, COL_STATUS, COL_WAKE, COL_DELETE):
+            self.table.horizontalHeader().setSectionResizeMode(column, QHeaderView.ResizeMode.Fixed)
         
-        self.table.setColumnWidth(1, 150)
-        self.table.setColumnWidth(2, 80)
-        self.table.setColumnWidth(3, 50)
+        self.table.setColumnWidth(COL_MAC, 150)
+        self.table.setColumnWidth(COL_TARGET, 120)
+        self.table.setColumnWidth(COL_STATUS, 90)
+        self.table.setColumnWidth(COL_WAKE, 80)
+        self.table.setColumnWidth(COL_DELETE, 50)
         
         # Satır numaralarını gizle
         self.table.verticalHeader().setVisible(False)
         
-        # Sıralama özelliğini etkinleştir
+        # Sıralama özelliğini etkinleştir; kaynak model zaten isme göre sıralı
+        # olduğundan proxy başta sıralama yapmaz, başlığa tıklanınca sıralar
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
         self.table.setSortingEnabled(True)
         
+        # Çoklu seçim (satır bazlı)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        
         self.update_device_table()
         layout.addWidget(self.table)
         
+        # Toplu uyandırma butonları
+        bulk_layout = QHBoxLayout()
+        
+        self.wake_selected_button = QPushButton()
+        self.wake_selected_button.clicked.connect(self.wake_selected)
+        
+        self.wake_all_button = QPushButton()
+        self.wake_all_button.clicked.connect(self.wake_all)
+        
+        self.verify_button = QPushButton()
+        self.verify_button.clicked.connect(self.toggle_verify)
+        
+        self.import_button = QPushButton()
+        self.import_button.clicked.connect(self.import_devices)
+        
+        # Açılır/kapanır tanılama paneli (ölçüm özeti)
+        self.diagnostics_button = QToolButton()
+        self.diagnostics_button.setCheckable(True)
+        self.diagnostics_button.setArrowType(Qt.ArrowType.RightArrow)
+        self.diagnostics_button.setToolButtonStyle(Qt.ToolButtonStyle.ToolButtonTextBesideIcon)
+        self.diagnostics_button.setAutoRaise(True)
+        self.diagnostics_button.toggled.connect(self.toggle_diagnostics)
+        
+        bulk_layout.addWidget(self.import_button)
+        bulk_layout.addWidget(self.diagnostics_button)
+        bulk_layout.addStretch()
+        bulk_layout.addWidget(self.wake_selected_button)
+        bulk_layout.addWidget(self.wake_all_button)
+        bulk_layout.addWidget(self.verify_button)
+        
+        layout.addLayout(bulk_layout)
+        
+        self.diagnostics_panel = QPlainTextEdit()
+        self.diagnostics_panel.setReadOnly(True)
+        self.diagnostics_panel.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.diagnostics_panel.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.diagnostics_panel.setFixedHeight(160)
+        self.diagnostics_panel.setVisible(False)
+        layout.addWidget(self.diagnostics_panel)
+        
         # Alt bilgi bölümü
         bottom_info = QHBoxLayout()
         
@@ -194,6 +426,7 @@ class WakeOnLANApp(QMainWindow):
         separator = QFrame()
         separator.setFrameShape(QFrame.Shape.HLine)
         separator.setFrameShadow(QFrame.Shadow.Sunken)
+        separator.setObjectName("separator")
         layout.addWidget(separator)
         
         # Sürüm ve firma bilgisi
@@ -215,577 +448,654 @@ class WakeOnLANApp(QMainWindow):
 
     def load_devices(self):
         try:
-            devices_path = os.path.join(os.path.expanduser('~'), 'wake_on_lan_devices.json')
-            if os.path.exists(devices_path):
-                with open(devices_path, 'r') as f:
-                    return json.load(f)
-        except:
-            pass
-        return []
+            store = open_store(self.storage_backend, window=self.write_behind_window,
+                               fsync=self.fsync_policy,
+                               on_error=lambda e: self.persistence_error.emit(str(e)))
+            devices = store.load_all()
+        except StorageError as e:
+            # Depo açık bırakılmaz; böylece okunamayan liste boş liste ile ezilmez
+            print(f"Cihaz listesi yüklenirken hata: {e}")
+            self._load_error = e
+            return []
+        self.store = store
+        # Satırlar liste indeksine değil kalıcı kimliğe göre adreslenir
+        if ensure_device_ids(devices):
+            store.replace_all(devices)
+        return devices
 
-    def save_devices(self):
-        try:
-            devices_path = os.path.join(os.path.expanduser('~'), 'wake_on_lan_devices.json')
-            with open(devices_path, 'w') as f:
-                json.dump(self.devices, f)
-        except:
-            self.result_label.setText(self.tr("Cihaz listesi kaydedilemedi!"))
+    def save_devices(self, changed=None, deleted=()):
+        if self.store is None:
+            self.result_label.setText(self.i18n["storage.save_error"])
+            return
+        
+        # Depo değişiklikleri bekletip birleştirir; yazma arka plan thread'inde yapılır
+        if changed is None and not deleted:
+            self.store.replace_all(self.devices.to_list())
+        else:
+            self.store.apply_changes(changed or (), deleted)
+
+    def _watch_store(self):
+        # Atomik yazma (JSON) dosyayı değiştirir ve izleme düşer; her seferinde yeniden eklenir
+        watched = set(self.store_watcher.files())
+        paths = [path for path in store_paths(self.storage_backend)
+                 if path not in watched and os.path.exists(path)]
+        if paths:
+            self.store_watcher.addPaths(paths)
+
+    def _on_store_file_changed(self, path):
+        self._watch_store()
+        # Art arda gelen bildirimler tek kontrolde birleşir
+        self.store_check_timer.start()
+
+    def _refresh_external_schedules(self):
+        """ wol.py schedule veya daemon depoya yazdıysa zamanlamaları depodan alır """
+        if self.store is None or self._schedules_refreshing:
+            return
+        store, devices = self.store, self.devices
+        
+        def check():
+            # I/O worker'ında: koleksiyon sadece okunur; {kimlik: (görülen, depodaki)}
+            if not store.changed_externally():
+                return {}
+            changes = {}
+            for stored in store.load_all():
+                device = devices.get(stored.get("id"))
+                if device is None:
+                    continue
+                seen = device.get("schedules") or []
+                schedules = stored.get("schedules") or []
+                if schedules != seen:
+                    changes[stored.get("id")] = (seen, schedules)
+            return changes
+        
+        def done(changes):
+            self._schedules_refreshing = False
+            # Zamanlamaları GUI değiştirmez (sadece last_run); depodaki hali doğrudur. Bu arada
+            # GUI last_run yazdıysa o cihaz atlanır, sonraki kontrolde yeniden karşılaştırılır.
+            for device_id, (seen, schedules) in changes.items():
+                device = self.devices.get(device_id)
+                if device is not None and (device.get("schedules") or []) == seen:
+                    self.devices.update(device_id, schedules=schedules)
+        
+        def failed(error):
+            self._schedules_refreshing = False
+            print(f"Zamanlamalar yeniden okunamadı: {error}")
+        
+        self._schedules_refreshing = True
+        self.jobs.submit_io(check, on_done=done, on_error=failed)
+
+    def _on_persistence_error(self, error):
+        print(f"Kayıt hatası: {error}")
+        self.result_label.setText(self.i18n["storage.save_error"])
 
     def add_device(self):
+        t = self.i18n.section("add")
+        
         name = self.device_name.text()
         mac = self.mac_address.text()
         
         if name and mac:
-            self.devices.append({
+            # MAC giriş anında doğrulanır ve tek biçime çevrilir
+            try:
+                mac_value = parse_mac(mac)
+            except InvalidMacError:
+                self.result_label.setText(t["invalid_mac"])
+                return
+            if self.devices.has_mac(mac_value):
+                self.result_label.setText(t["duplicate"])
+                return
+            
+            # Koleksiyon ikili arama ile sıralı konuma ekler, model tek satır ekler
+            device = {
+                "id": new_device_id(),
                 "name": name,
-                "mac": mac
-            })
-            self.save_devices()
-            self.update_device_table()
+                "mac": format_mac(mac_value)
+            }
+            self.devices.add(device)
+            self.save_devices(changed=[device])
             self.device_name.clear()
             self.mac_address.clear()
 
     def update_device_table(self):
-        try:
-            self.table.setRowCount(len(self.devices))
-            try:
-                self.table.itemChanged.disconnect(self.save_device_changes)
-            except:
-                pass
-        except:
-            pass
-        
-        # Cihazları isme göre sırala
-        self.devices.sort(key=lambda x: x.get("name", "").lower())
-        
-        # Dil çevirilerini al
-        translations = {
-            "tr": {
-                "wake": "Uyandır",
-                "delete": "❌"
-            },
-            "en": {
-                "wake": "Wake",
-                "delete": "❌"
-            },
-            "de": {
-                "wake": "Aufwecken",
-                "delete": "❌"
-            },
-            "fr": {
-                "wake": "Réveiller",
-                "delete": "❌"
-            },
-            "it": {
-                "wake": "Sveglia",
-                "delete": "❌"
-            },
-            "ru": {
-                "wake": "Разбудить",
-                "delete": "❌"
-            }
-        }
-        
-        # Mevcut dil için çevirileri al
-        t = translations.get(self.current_language, translations["en"])
-        
-        for i, device in enumerate(self.devices):
-            try:
-                name_item = QTableWidgetItem(device.get("name", ""))
-                name_item.setFlags(name_item.flags() | Qt.ItemFlag.ItemIsEditable)
-                
-                mac_item = QTableWidgetItem(device.get("mac", ""))
-                
-                # Uyandır butonu
-                wake_button = QPushButton(t["wake"])
-                wake_button.clicked.connect(lambda checked, mac=device.get("mac", ""): self.wake_device(mac))
-                
-                # Sil butonu
-                delete_button = QPushButton(t["delete"])
-                delete_button.setStyleSheet("color: red;")
-                delete_button.clicked.connect(lambda checked, idx=i: self.delete_device(idx))
-                
-                self.table.setItem(i, 0, name_item)
-                self.table.setItem(i, 1, mac_item)
-                self.table.setCellWidget(i, 2, wake_button)
-                self.table.setCellWidget(i, 3, delete_button)
-            except:
-                continue
+        # Satırlar koleksiyon bildirimleriyle güncellenir; burada sadece buton metinleri ayarlanır
+        t = self.i18n.section("table")
         
-        try:
-            self.table.itemChanged.connect(self.save_device_changes)
-        except:
-            pass
-
-    def delete_device(self, index):
-        # Dil çevirilerini al
-        translations = {
-            "tr": {
-                "deleted": "Cihaz silindi",
-                "error": "Silme hatası!"
-            },
-            "en": {
-                "deleted": "Device deleted",
-                "error": "Delete error!"
-            },
-            "de": {
-                "deleted": "Gerät gelöscht",
-                "error": "Löschungsfehler!"
-            },
-            "fr": {
-                "deleted": "Appareil supprimé",
-                "error": "Erreur de suppression!"
-            },
-            "it": {
-                "deleted": "Dispositivo eliminato",
-                "error": "Errore di eliminazione!"
-            },
-            "ru": {
-                "deleted": "Устройство удалено",
-                "error": "Ошибка удаления!"
-            }
-        }
-        
-        # Mevcut dil için çevirileri al
-        t = translations.get(self.current_language, translations["en"])
+        self.device_model.set_button_texts(t["wake"], t["delete"])
+
+    def _on_wake_clicked(self, proxy_index):
+        device = self.devices.get(proxy_index.data(DeviceIdRole))
+        if device is not None:
+            self.wake_device(device.get("mac", ""))
+
+    def _on_delete_clicked(self, proxy_index):
+        self.delete_device(proxy_index.data(DeviceIdRole))
+
+    def filter_devices(self, text):
+        with Stopwatch("wol_search_seconds"):
+            self.search_model.set_query(text)
+
+    def _build_search_index(self):
+        if self.search_index.build_step():
+            self.search_build_timer.stop()
+
+    def delete_device(self, device_id):
+        t = self.i18n.section("delete")
         
         try:
-            if 0 <= index < len(self.devices):
-                del self.devices[index]
-                self.save_devices()
-                self.update_device_table()
+            if self.devices.remove(device_id) is not None:
+                self.save_devices(deleted=[device_id])
                 self.result_label.setText(t["deleted"])
         except:
             self.result_label.setText(t["error"])
 
-    def save_device_changes(self, item):
-        try:
-            if item.column() == 0:  # Sadece isim değişikliklerini kaydet
-                row = item.row()
-                if row < len(self.devices):
-                    self.devices[row]["name"] = item.text()
-                    self.save_devices()
-        except:
-            pass
+    def save_device_changes(self, device_id, value):
+        # Model isim/hedef değişikliğini cihaz kaydına zaten yazdı
+        device = self.devices.get(device_id)
+        if device is not None:
+            self.save_devices(changed=[device])
 
     def wake_device(self, mac):
-        # Dil çevirilerini al
-        translations = {
-            "tr": {
-                "invalid_mac": "Geçersiz MAC adresi!",
-                "sent": "Magic packet gönderildi!",
-                "error": "Hata oluştu!"
-            },
-            "en": {
-                "invalid_mac": "Invalid MAC address!",
-                "sent": "Magic packet sent!",
-                "error": "Error occurred!"
-            },
-            "de": {
-                "invalid_mac": "Ungültige MAC-Adresse!",
-                "sent": "Magic Packet gesendet!",
-                "error": "Fehler aufgetreten!"
-            },
-            "fr": {
-                "invalid_mac": "Adresse MAC invalide!",
-                "sent": "Paquet magique envoyé!",
-                "error": "Erreur survenue!"
-            },
-            "it": {
-                "invalid_mac": "Indirizzo MAC non valido!",
-                "sent": "Magic packet inviato!",
-                "error": "Errore!"
-            },
-            "ru": {
-                "invalid_mac": "Неверный MAC-адрес!",
-                "sent": "Magic packet отправлен!",
-                "error": "Произошла ошибка!"
-            }
-        }
-        
-        # Mevcut dil için çevirileri al
-        t = translations.get(self.current_language, translations["en"])
+        t = self.i18n.section("wake")
         
         if not mac:
             self.result_label.setText(t["invalid_mac"])
             return
+        
+        def done(result):
+            self.set_wake_status([result])
+            if result.ok:
+                self.result_label.setText(t["sent"])
+            elif result.error == "invalid_mac":
+                self.result_label.setText(t["invalid_mac"])
+            else:
+                self.result_label.setText(t["error"])
+        
+        def failed(error):
+            self.set_wake_status([], failed_macs=[mac])
+            self.result_label.setText(t["error"])
+        
+        self.set_wake_status([], pending_macs=[mac])
+        # Kayıt bulunursa önbellekteki hazır paket kullanılır
+        records = self.devices.find_mac(mac)[:1] or [{"name": "", "mac": mac}]
+        self.monitor.mark_waking(record.get("id") for record in records if record.get("id"))
+        self.jobs.submit_wake(self.wake_engine.wake_devices, records,
+                              on_done=lambda report: done(report.results[0]), on_error=failed)
+
+    def set_wake_status(self, results, pending_macs=(), failed_macs=()):
+        changed = {}
+        for mac in pending_macs:
+            changed[mac] = "pending"
+        for mac in failed_macs:
+            changed[mac] = "error"
+        for result in results:
+            changed[result.mac] = "sent" if result.ok else "error"
+        # Sadece etkilenen satırlar yeniden çizilir
+        self.device_model.set_status(changed)
+
+    def selected_devices(self):
+        devices = []
+        for index in self.table.selectionModel().selectedRows():
+            # Satır iki proxy'den geçer; kayıt kimlikle bulunur
+            device = self.devices.get(index.data(DeviceIdRole))
+            if device is not None:
+                devices.append(device)
+        return devices
+
+    def wake_selected(self):
+        self.wake_many(self.selected_devices())
+
+    def wake_all(self):
+        self.wake_many(self.devices)
+
+    def wake_many(self, devices):
+        # Süren toplu uyandırma varsa iki düğme de iptal eder
+        if self.storm_thread is not None:
+            self.storm_thread.cancel()
+            return
+        
+        t = self.i18n.section("wake_many")
+        
+        if not devices:
+            self.result_label.setText(t["none"])
+            return
+        
+        # Listenin kopyası alınır; kayıtlar paylaşılır ki paket önbelleği kalıcı olsun
+        devices = list(devices)
+        macs = [device.get("mac", "") for device in devices]
+        
+        self.set_wake_status([], pending_macs=macs)
+        self.monitor.mark_waking(device.get("id") for device in devices)
+        
+        if len(devices) == 1:
+            def done(report):
+                self.set_wake_status(report.results)
+                self.result_label.setText(t["sent"].format(
+                    sent=report.sent, total=len(report.results), rate=report.packets_per_sec))
             
-        try:
-            send_magic_packet(mac)
-            self.result_label.setText(t["sent"])
-        except:
+            def failed(error):
+                self.set_wake_status([], failed_macs=macs)
+                self.result_label.setText(t["error"])
+            
+            self.jobs.submit_wake(self.wake_engine.wake_devices, devices, on_done=done, on_error=failed)
+            return
+        
+        # Çok cihaz hız sınırıyla ve gruplar arasında beklenerek uyandırılır
+        self._storm = WakeStorm(self.wake_engine, self.wake_packets_per_sec, self.wake_hosts_per_sec,
+                                self.wake_group_stagger)
+        # Bu uyandırmanın bekleme durumuna aldığı ve henüz sonucu gelmeyen MAC'ler
+        self._storm_pending = set(macs)
+        self.storm_thread = StormThread(self._storm, devices, self)
+        self.storm_thread.batch.connect(self._on_storm_batch)
+        self.storm_thread.progress.connect(self._on_storm_progress)
+        self.storm_thread.done.connect(lambda result: self._on_storm_finished("finished"))
+        self.storm_thread.cancelled.connect(lambda: self._on_storm_finished("cancelled"))
+        self.storm_thread.failed.connect(lambda error: self._on_storm_finished("error"))
+        self.storm_thread.start()
+        self._set_storm_buttons(True)
+    
+    def _set_storm_buttons(self, running):
+        t = self.i18n.section("ui")
+        if running:
+            cancel = self.i18n["storm.cancel"]
+            self.wake_selected_button.setText(cancel)
+            self.wake_all_button.setText(cancel)
+        else:
+            self.wake_selected_button.setText(t["wake_selected"])
+            self.wake_all_button.setText(t["wake_all"])
+    
+    def _on_storm_progress(self, done, total, eta):
+        self.result_label.setText(self.i18n("storm.progress", done=done, total=total, eta=eta))
+    
+    def _on_storm_batch(self, results):
+        self._storm_pending.difference_update(result.mac for result in results)
+        self.set_wake_status(results)
+
+    def _on_storm_finished(self, outcome):
+        storm = self._storm
+        if outcome != "finished":
+            # Sadece bu uyandırmanın gönderemediği cihazların bekleme durumu kaldırılır;
+            # doğrulama veya tekil uyandırmanın beklemeleri kalır
+            status = self.device_model.status
+            pending = [mac for mac in self._storm_pending if status.get(mac) == "pending"]
+            self.device_model.set_status({mac: "" for mac in pending})
+        self._storm_pending = set()
+        elapsed = time.monotonic() - storm.started if storm.started is not None else 0.0
+        self.result_label.setText(self.i18n(f"storm.{outcome}", sent=storm.sent, total=storm.total,
+                                            elapsed=elapsed))
+        self.storm_thread = None
+        self._set_storm_buttons(False)
+
+    def _arm_schedule_timer(self):
+        # En geç MAX_SLEEP saniyede bir uyanılır; bilgisayar uykudan dönünce kaçırılanlar bulunur
+        due = self.scheduler.next_due()
+        delay = MAX_SLEEP if due is None else min(MAX_SLEEP, max(0.0, due - time.time()))
+        self.schedule_timer.start(int(delay * 1000))
+    
+    def _run_schedules(self):
+        # Dosya izleme bir bildirimi kaçırmış olabilir; her tikte de kontrol edilir
+        self._refresh_external_schedules()
+        now = time.time()
+        firings = self.scheduler.pop_due(now)
+        if firings and not self.scheduler_lock.acquire():
+            # İşleri kilidi tutan süreç (wol.py daemon) çalıştırıyor
+            firings = []
+        woken = {}
+        for firing in firings:
+            device = self.devices.get(firing.device_id)
+            if device is not None:
+                woken[firing.device_id] = device
+        if woken:
+            devices = list(woken.values())
+            if self.storm_thread is None:
+                self.wake_many(devices)
+            else:
+                # Süren toplu uyandırma iptal edilmez; zamanlanmış cihazlar ayrıca gönderilir
+                self.monitor.mark_waking(woken)
+                self.jobs.submit_wake(self.wake_engine.wake_devices, devices,
+                                      on_done=lambda report: self.set_wake_status(report.results))
+            # last_run kaydedilir; yeniden başlatmada kaçırılan çalışmalar buna göre bulunur
+            for firing in firings:
+                device = woken.get(firing.device_id)
+                if device is not None:
+                    self.devices.update(firing.device_id, schedules=mark_run(device, firing.index, now))
+            self.save_devices(changed=devices)
+        self._arm_schedule_timer()
+    
+    def toggle_verify(self):
+        if self.verify_thread is not None:
+            self.verify_thread.cancel()
+            return
+        
+        # Seçim yoksa tüm cihazlar doğrulanır
+        devices = self.selected_devices() or list(self.devices)
+        if not devices:
+            self.wake_many(devices)
+            return
+        
+        t = self.i18n.section("verify")
+        self._verify_counts = {"total": len(devices), "up": 0, "timeout": 0, "no_target": 0}
+        macs = [device.get("mac", "") for device in devices]
+        # Bu doğrulamanın bekleme durumuna aldığı ve henüz sonucu gelmeyen MAC'ler
+        self._verify_pending = set(macs)
+        self.set_wake_status([], pending_macs=macs)
+        self.monitor.mark_waking(device.get("id") for device in devices)
+        
+        verifier = WakeVerifier(self.wake_engine, max_in_flight=self.verify_in_flight)
+        self.verify_thread = VerifyThread(verifier, devices, self)
+        self.verify_thread.result.connect(self._on_verify_result)
+        self.verify_thread.progress.connect(self._on_verify_progress)
+        self.verify_thread.done.connect(lambda results: self._on_verify_finished("finished"))
+        self.verify_thread.cancelled.connect(lambda: self._on_verify_finished("cancelled"))
+        self.verify_thread.failed.connect(lambda error: self._on_verify_finished("error"))
+        self.verify_thread.start()
+        self.verify_button.setText(t["cancel"])
+
+    def _on_verify_result(self, result):
+        counts = self._verify_counts
+        if result.up:
+            counts["up"] += 1
+            status = "up"
+            # Uyanma süresi cihaz kaydında saklanır
+            if self.devices.get(result.device_id) is not None:
+                self.devices.update(result.device_id, last_wake_latency=round(result.latency, 3))
+                self.save_devices(changed=[self.devices.get(result.device_id)])
+        elif result.error == "no_target":
+            counts["no_target"] += 1
+            status = "sent"
+        elif result.error == "timeout":
+            counts["timeout"] += 1
+            status = "timeout"
+        else:
+            status = "error"
+        self._verify_pending.discard(result.mac)
+        self.device_model.set_status({result.mac: status})
+
+    def _on_verify_progress(self, done, total):
+        t = self.i18n.section("verify")
+        self.result_label.setText(t["progress"].format(done=done, total=total, up=self._verify_counts["up"]))
+
+    def _on_verify_finished(self, outcome):
+        t = self.i18n.section("verify")
+        if outcome != "finished":
+            # Sadece bu doğrulamanın sonucu gelmemiş cihazlarının bekleme durumu kaldırılır
+            status = self.device_model.status
+            pending = [mac for mac in self._verify_pending if status.get(mac) == "pending"]
+            self.device_model.set_status({mac: "" for mac in pending})
+        self._verify_pending = set()
+        self.result_label.setText(t[outcome].format(**self._verify_counts))
+        self.verify_button.setText(t["verify"])
+        self.verify_thread = None
+
+    def import_devices(self):
+        t = self.i18n.section("import")
+        path, _ = QFileDialog.getOpenFileName(self, t["title"], "", t["filter"])
+        if path:
+            self.import_file(path)
+
+    def import_file(self, path, fmt=None):
+        t = self.i18n.section("import")
+        self.result_label.setText(t["running"])
+        self.import_button.setEnabled(False)
+        
+        def failed(error):
+            print(f"İçe aktarma hatası: {error}")
+            self.import_button.setEnabled(True)
             self.result_label.setText(t["error"])
+        
+        # Dosya worker thread'inde akış halinde okunur ve envanterin MAC dizini kopyasına göre
+        # planlanır; GUI sadece sonucu uygular
+        snapshot = self.devices.mac_snapshot()
+        self.jobs.submit_io(lambda: plan_import(iter_records(path, fmt), snapshot),
+                            on_done=lambda plan: self._apply_import(plan, snapshot), on_error=failed)
+
+    def _apply_import(self, plan, snapshot):
+        t = self.i18n.section("import")
+        self.import_button.setEnabled(True)
+        added, updates, skipped = plan
+        if self.devices.changes != snapshot.changes:
+            # Planlama sürerken eklenen MAC'ler tekrar eklenmez, silinen cihazlar güncellenmez
+            fresh = [device for device in added if not self.devices.has_mac(device["mac"])]
+            skipped += len(added) - len(fresh)
+            added = fresh
+            updates = {device_id: changes for device_id, changes in updates.items()
+                       if self.devices.get(device_id) is not None}
+        if added or updates:
+            # Tek tablo yenilemesi ve tek kayıt işlemi
+            self.devices.apply_batch(added, updates)
+            changed = added + [self.devices.get(device_id) for device_id in updates]
+            self.save_devices(changed=changed)
+        self.result_label.setText(t["done"].format(
+            added=len(added), updated=len(updates), skipped=skipped))
+
+    def toggle_scan(self):
+        if self.scan_thread is not None:
+            self.scan_thread.cancel()
+            return
+        
+        t = self.i18n.section("scan")
+        
+        # Virgül veya boşlukla ayrılmış CIDR listesi; boşsa yerel ağ taranır
+        text = self.scan_input.text().strip() or local_network() or ""
+        networks = [part for part in text.replace(",", " ").split() if part]
+        try:
+            for network in networks:
+                ipaddress.ip_network(network, strict=False)
+        except ValueError:
+            networks = []
+        if not networks:
+            self.result_label.setText(t["invalid"])
+            return
+        
+        self._scan_found = 0
+        self._scan_added = 0
+        scanner = DiscoveryScanner(concurrency=self.scan_concurrency)
+        self.scan_thread = ScanThread(scanner, networks, self)
+        self.scan_thread.host_found.connect(self._on_host_found)
+        self.scan_thread.progress.connect(self._on_scan_progress)
+        self.scan_thread.done.connect(lambda hosts: self._on_scan_finished("finished"))
+        self.scan_thread.cancelled.connect(lambda: self._on_scan_finished("cancelled"))
+        self.scan_thread.failed.connect(lambda error: self._on_scan_finished("error"))
+        self.scan_thread.start()
+        self.scan_button.setText(t["cancel"])
+
+    def _on_host_found(self, host):
+        self._scan_found += 1
+        # MAC adresi çözülemeyen (ör. farklı alt ağdaki) cihazlar uyandırılamaz
+        if host.mac is None:
+            return
+        
+        existing = self.devices.find_mac(host.mac)
+        if existing:
+            # Bilinen cihazın IP'si değiştiyse sadece o satırı güncelle
+            device = existing[0]
+            if device.get("ip") != host.ip:
+                self.devices.update(device.get("id"), ip=host.ip)
+                self.save_devices(changed=[device])
+            return
+        
+        device = {
+            "id": new_device_id(),
+            "name": host.hostname or host.ip,
+            "mac": format_mac(host.mac),
+            "ip": host.ip
+        }
+        self.devices.add(device)
+        self.save_devices(changed=[device])
+        self._scan_added += 1
+
+    def _on_scan_progress(self, done, total, found):
+        t = self.i18n.section("scan")
+        self.result_label.setText(t["progress"].format(done=done, total=total, found=found))
+
+    def _on_scan_finished(self, outcome):
+        t = self.i18n.section("scan")
+        self.result_label.setText(t[outcome].format(found=self._scan_found, added=self._scan_added))
+        self.scan_button.setText(t["scan"])
+        self.scan_thread = None
 
+    def closeEvent(self, event):
+        # Süren taramayı durdur
+        if self.scan_thread is not None:
+            self.scan_thread.cancel()
+            self.scan_thread.wait()
+        if self.verify_thread is not None:
+            self.verify_thread.cancel()
+            self.verify_thread.wait()
+        if self.storm_thread is not None:
+            self.storm_thread.cancel()
+            self.storm_thread.wait()
+        self.monitor_thread.cancel()
+        self.monitor_thread.wait()
+        self.schedule_timer.stop()
+        self.store_check_timer.stop()
+        self.scheduler_lock.release()
+        self.metrics_timer.stop()
+        self.heartbeat_timer.stop()
+        self.search_build_timer.stop()
+        if self.watchdog is not None:
+            self.watchdog.stop()
+        
+        # Bekleyen kayıtların diske yazılmasını bekle
+        self.jobs.wait()
+        if self.store is not None:
+            self.store.close()
+        self.settings_writer.close()
+        self.wake_engine.close()
+        super().closeEvent(event)
+
+    def toggle_diagnostics(self, shown):
+        self.diagnostics_button.setArrowType(Qt.ArrowType.DownArrow if shown else Qt.ArrowType.RightArrow)
+        self.diagnostics_panel.setVisible(shown)
+        if shown:
+            self._refresh_metrics()
+            self.metrics_timer.start()
+        elif not (metrics.enabled and self.metrics_textfile):
+            self.metrics_timer.stop()
+    
+    def _refresh_metrics(self):
+        if self.metrics_textfile and metrics.enabled:
+            self.jobs.submit_io(metrics.write_textfile, self.metrics_textfile,
+                                on_error=lambda error: print(f"Ölçüm dosyası yazılamadı: {error}"))
+        if not self.diagnostics_button.isChecked():
+            return
+        if not metrics.enabled:
+            self.diagnostics_panel.setPlainText(self.i18n["diagnostics.disabled"])
+            return
+        histograms, counters = metrics.summary()
+        lines = [f"{'':56s} {'n':>7s} {'p50 ms':>9s} {'p95 ms':>9s}"]
+        for name, labels, count, p50, p95, _ in histograms:
+            lines.append(f"{name + labels:56s} {count:7d} {p50 * 1000:9.2f} {p95 * 1000:9.2f}")
+        lines.append("")
+        for name, labels, value in counters:
+            lines.append(f"{name + labels:56s} {value:7g}")
+        # Kaydırma konumu korunur
+        scroll = self.diagnostics_panel.verticalScrollBar().value()
+        self.diagnostics_panel.setPlainText("\n".join(lines))
+        self.diagnostics_panel.verticalScrollBar().setValue(scroll)
+    
     def toggle_theme(self, index):
         self.dark_mode = index == 1  # 1 = Dark mode
         self.load_style()
         self._save_settings()
 
-    def update_theme_combo(self):
-        current_index = 1 if self.dark_mode else 0
-        self.theme_combo.clear()
-        self.theme_combo.addItems([self.tr("Aydınlık"), self.tr("Karanlık")])
-        self.theme_combo.setCurrentIndex(current_index)
-
     def load_style(self):
-        if self.dark_mode:
-            style = """
-            QMainWindow, QWidget {
-                background-color: #2b2b2b;
-                color: #ffffff;
-            }
-            QPushButton {
-                background-color: #444444;
-                border: none;
-                padding: 5px;
-                color: white;
-            }
-            QLineEdit#input_field {
-                background-color: #3b3b3b;
-                border: 1px solid #555555;
-                border-radius: 3px;
-                color: white;
-                padding: 5px;
-            }
-            QTableWidget {
-                background-color: #2b2b2b;
-                color: white;
-                gridline-color: #555555;
-            }
-            QTableWidget QHeaderView::section {
-                background-color: #2b2b2b;
-                color: white;
-                border: 1px solid #555555;
-            }
-            QTableWidget::item {
-                color: white;
-            }
-            QFrame {
-                color: #555555;
-            }
-            QLabel {
-                color: #ffffff;
-            }
-            QComboBox {
-                background-color: #444444;
-                color: white;
-                border: 1px solid #555555;
-                border-radius: 3px;
-                padding: 5px;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                border: none;
-            }
-            QComboBox QAbstractItemView {
-                background-color: #2b2b2b;
-                color: white;
-                selection-background-color: #555555;
-            }
-            QPushButton#add_button {
-                background-color: #444444;
-                color: white;
-                border: 1px solid #555555;
-                border-radius: 3px;
-                padding: 5px;
-            }
-            """
-        else:
-            style = """
-            QMainWindow, QWidget {
-                background-color: #ffffff;
-                color: #000000;
-            }
-            QPushButton {
-                background-color: #e0e0e0;
-                border: none;
-                padding: 5px;
-                color: #000000;
-            }
-            QLineEdit#input_field {
-                background-color: #ffffff;
-                border: 1px solid #cccccc;
-                border-radius: 3px;
-                color: #000000;
-                padding: 5px;
-            }
-            QTableWidget {
-                background-color: #ffffff;
-                color: #000000;
-                gridline-color: #cccccc;
-            }
-            QTableWidget QHeaderView::section {
-                background-color: #f0f0f0;
-                color: #000000;
-                border: 1px solid #cccccc;
-            }
-            QTableWidget::item {
-                color: #000000;
-            }
-            QFrame {
-                color: #cccccc;
-            }
-            QLabel {
-                color: #000000;
-            }
-            QComboBox {
-                background-color: #f0f0f0;
-                color: #000000;
-                border: 1px solid #cccccc;
-                border-radius: 3px;
-                padding: 5px;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                border: none;
-            }
-            QComboBox QAbstractItemView {
-                background-color: #ffffff;
-                color: #000000;
-                selection-background-color: #e0e0e0;
-            }
-            QPushButton#add_button {
-                background-color: #f0f0f0;
-                color: #000000;
-                border: 1px solid #cccccc;
-                border-radius: 3px;
-                padding: 5px;
-            }
-            """
-        
-        self.setStyleSheet(style)
+        # Palette ve stil sayfası bir kez derlenir; pencereye ayrıca stil sayfası verilmez
+        with Stopwatch("wol_theme_switch_seconds"):
+            self.theme.apply("dark" if self.dark_mode else "light")
 
     def change_language(self, index):
-        lang_map = {
-            0: "tr",    # Türkçe
-            1: "en",    # English
-            2: "de",    # Deutsch
-            3: "fr",    # Français
-            4: "it",    # Italiano
-            5: "ru"     # Русский
-        }
-        self.current_language = lang_map.get(index, "en")
-        self.retranslate_ui()
-        self.update_device_table()  # Tabloyu güncelle
+        # Seçim kutusu available_languages() sırasıyla doldurulur
+        languages = list(available_languages())
+        self.current_language = languages[index] if 0 <= index < len(languages) else FALLBACK_LANGUAGE
+        with Stopwatch("wol_language_switch_seconds"):
+            self.i18n.set_language(self.current_language)
+            self.retranslate_ui()
+            self.update_device_table()  # Tabloyu güncelle
         self._save_settings()
 
     def retranslate_ui(self):
-        translations = {
-            "tr": {
-                "title": APP_NAME,
-                "device_name": "Cihaz Adı",
-                "mac_address": "MAC Adresi",
-                "add": "Ekle",
-                "error": "Hata oluştu!",
-                "sent": "Magic packet gönderildi!",
-                "deleted": "Cihaz silindi",
-                "delete": "Sil",
-                "delete_error": "Silme hatası!",
-                "invalid_mac": "Geçersiz MAC adresi!",
-                "light": "Aydınlık",
-                "dark": "Karanlık",
-                "wake": "Uyandır",
-                "action": "İşlem",
-                "company": "<a href='https://webadhere.com' style='color: #666666; text-decoration: none;'>WebAdHere</a> Yazılım"
-            },
-            "en": {
-                "title": APP_NAME,
-                "device_name": "Device Name",
-                "mac_address": "MAC Address",
-                "add": "Add",
-                "error": "Error occurred!",
-                "sent": "Magic packet sent!",
-                "deleted": "Device deleted",
-                "delete": "Delete",
-                "delete_error": "Delete error!",
-                "invalid_mac": "Invalid MAC address!",
-                "light": "Light",
-                "dark": "Dark",
-                "wake": "Wake",
-                "action": "Action",
-                "company": "<a href='https://webadhere.com' style='color: #666666; text-decoration: none;'>WebAdHere</a> Software"
-            },
-            "de": {
-                "title": APP_NAME,
-                "device_name": "Gerätename",
-                "mac_address": "MAC-Adresse",
-                "add": "Hinzufügen",
-                "error": "Fehler aufgetreten!",
-                "sent": "Magic Packet gesendet!",
-                "deleted": "Gerät gelöscht",
-                "delete": "Löschen",
-                "delete_error": "Löschungsfehler!",
-                "invalid_mac": "Ungültige MAC-Adresse!",
-                "light": "Hell",
-                "dark": "Dunkel",
-                "wake": "Aufwecken",
-                "action": "Aktion",
-                "company": "<a href='https://webadhere.com' style='color: #666666; text-decoration: none;'>WebAdHere</a> Software"
-            },
-            "fr": {
-                "title": APP_NAME,
-                "device_name": "Nom de l'appareil",
-                "mac_address": "Adresse MAC",
-                "add": "Ajouter",
-                "error": "Erreur survenue!",
-                "sent": "Paquet magique envoyé!",
-                "deleted": "Appareil supprimé",
-                "delete": "Supprimer",
-                "delete_error": "Erreur de suppression!",
-                "invalid_mac": "Adresse MAC invalide!",
-                "light": "Clair",
-                "dark": "Sombre",
-                "wake": "Réveiller",
-                "action": "Action",
-                "company": "<a href='https://webadhere.com' style='color: #666666; text-decoration: none;'>WebAdHere</a> Logiciel"
-            },
-            "it": {
-                "title": APP_NAME,
-                "device_name": "Nome dispositivo",
-                "mac_address": "Indirizzo MAC",
-                "add": "Aggiungi",
-                "error": "Errore!",
-                "sent": "Magic packet inviato!",
-                "deleted": "Dispositivo eliminato",
-                "delete": "Elimina",
-                "delete_error": "Errore di eliminazione!",
-                "invalid_mac": "Indirizzo MAC non valido!",
-                "light": "Chiaro",
-                "dark": "Scuro",
-                "wake": "Sveglia",
-                "action": "Azione",
-                "company": "<a href='https://webadhere.com' style='color: #666666; text-decoration: none;'>WebAdHere</a> Software"
-            },
-            "ru": {
-                "title": APP_NAME,
-                "device_name": "Имя устройства",
-                "mac_address": "MAC-адрес",
-                "add": "Добавить",
-                "error": "Произошла ошибка!",
-                "sent": "Magic packet отправлен!",
-                "deleted": "Устройство удалено",
-                "delete": "Удалить",
-                "delete_error": "Ошибка удаления!",
-                "invalid_mac": "Неверный MAC-адрес!",
-                "light": "Светлая",
-                "dark": "Темная",
-                "wake": "Разбудить",
-                "action": "Действие",
-                "company": "<a href='https://webadhere.com' style='color: #666666; text-decoration: none;'>WebAdHere</a> Программное"
-            }
-        }
-        
-        t = translations[self.current_language]
+        t = self.i18n.section("ui")
         
-        self.setWindowTitle(t["title"])
+        self.setWindowTitle(APP_NAME)
         self.device_name.setPlaceholderText(t["device_name"])
         self.mac_address.setPlaceholderText(t["mac_address"])
+        self.search_input.setPlaceholderText(t["search"])
         self.add_button.setText(t["add"])
+        self._set_storm_buttons(self.storm_thread is not None)
+        self.import_button.setText(t["import"])
+        self.diagnostics_button.setText(self.i18n["diagnostics.title"])
+        if self.verify_thread is None:
+            self.verify_button.setText(t["verify"])
+        if self.scan_thread is None:
+            self.scan_button.setText(t["scan"])
         
         # Tablo başlıklarını güncelle
-        headers = [t["device_name"], t["mac_address"], t["action"], t["delete"]]
-        self.table.setHorizontalHeaderLabels(headers)
-        
-        # Sütun genişliklerini dile göre ayarla
-        column_widths = {
-            "tr": {"mac": 150, "action": 80, "delete": 50},
-            "en": {"mac": 150, "action": 80, "delete": 80},
-            "de": {"mac": 150, "action": 90, "delete": 90},
-            "fr": {"mac": 150, "action": 90, "delete": 100},
-            "it": {"mac": 150, "action": 80, "delete": 80},
-            "ru": {"mac": 150, "action": 110, "delete": 90}
-        }
+        headers = [t["device_name"], t["mac_address"], t["target"], t["status"], t["action"], t["delete"]]
+        self.device_model.set_headers(headers)
+        self.device_model.set_liveness_texts(
+            {"online": t["online"], "offline": t["offline"], "waking": t["waking"]})
         
-        widths = column_widths.get(self.current_language, column_widths["en"])
-        self.table.setColumnWidth(1, widths["mac"])
-        self.table.setColumnWidth(2, widths["action"])
-        self.table.setColumnWidth(3, widths["delete"])
+        # Sütun genişlikleri de dil kataloğundadır
+        widths = self.i18n.section("layout")
+        self.table.setColumnWidth(COL_MAC, widths["mac"])
+        self.table.setColumnWidth(COL_WAKE, widths["action"])
+        self.table.setColumnWidth(COL_DELETE, widths["delete"])
         
-        # Tema seçeneklerini güncelle (mevcut seçimi koru)
-        current_theme = self.theme_combo.currentIndex()
-        self.theme_combo.clear()
-        self.theme_combo.addItems([t["light"], t["dark"]])
-        self.theme_combo.setCurrentIndex(current_theme)
+        # Tema seçeneklerini güncelle; yeniden doldururken toggle_theme tetiklenmez
+        with QSignalBlocker(self.theme_combo):
+            self.theme_combo.clear()
+            self.theme_combo.addItems([t["light"], t["dark"]])
+            self.theme_combo.setCurrentIndex(1 if self.dark_mode else 0)
         
         # Alt bilgiyi güncelle
         self.version_label.setText(t["company"])
 
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
+    # --trace-startup ve --profile[=DOSYA] dışındaki argümanlar Qt'ye bırakılır
+    trace = StartupTrace("--trace-startup" in sys.argv)
+    profiler = None
+    qt_args = []
+    for arg in sys.argv:
+        if arg == "--profile" or arg.startswith("--profile="):
+            profiler = SessionProfiler(arg.partition("=")[2] or "wol_profile.prof")
+        elif arg != "--trace-startup":
+            qt_args.append(arg)
+    if profiler is not None:
+        profiler.start()
+    
+    trace.mark("modüller yüklendi")
+    
+    app = QApplication(qt_args)
+    trace.mark("QApplication")
     
     # Sistem temasını al
     system_dark_mode = app.styleHints().colorScheme() == Qt.ColorScheme.Dark
     print(f"Sistem teması: {'Dark' if system_dark_mode else 'Light'}")
     
     # Sistem dilini al
-    system_locale = locale.getdefaultlocale()[0].lower()
-    system_language = "en"  # Varsayılan
-    
-    # Sistem diline göre varsayılan dili belirle
-    lang_map = {
-        "tr": "tr",
-        "en": "en",
-        "de": "de",
-        "fr": "fr",
-        "it": "it",
-        "ru": "ru"
-    }
-    
-    for lang_code in lang_map:
-        if system_locale.startswith(lang_code):
-            system_language = lang_map[lang_code]
-            break
-    
+    system_language = detect_language(locale.getlocale()[0] or os.environ.get("LANG", ""))
     print(f"Sistem dili: {system_language}")
     
-    # Ayarlar dosyası yolu
-    settings_path = os.path.join(os.path.expanduser('~'), 'wake_on_lan_settings.json')
-    
-    # Kaydedilmiş ayarları kontrol et
-    saved_settings = None
-    try:
-        if os.path.exists(settings_path):
-            with open(settings_path, 'r', encoding='utf-8') as f:
-                saved_settings = json.load(f)
-                # Eğer dark_mode ayarı yoksa sistem temasını kullan
-                if 'dark_mode' not in saved_settings:
-                    saved_settings['dark_mode'] = system_dark_mode
-    except Exception as e:
-        print(f"Ayarlar yüklenirken hata: {e}")
-        saved_settings = None
-    
-    # Eğer kaydedilmiş ayar yoksa sistem ayarlarını kullan
-    if not saved_settings:
-        saved_settings = {
-            'dark_mode': system_dark_mode,
-            'language': system_language
-        }
-        # Sistem ayarlarını kaydet
-        try:
-            with open(settings_path, 'w', encoding='utf-8') as f:
-                json.dump(saved_settings, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"Ayarlar kaydedilirken hata: {e}")
+    # Ayarlar burada bir kez okunur ve pencereye verilir
+    settings = load_settings()
+    trace.mark("ayarlar okundu")
     
-    # Ana pencereyi oluştur
+    # Ana pencereyi oluştur (tema ve dil gösterilmeden önce uygulanır)
     window = WakeOnLANApp(
-        system_dark_mode=system_dark_mode,  # Her zaman sistem temasını gönder
-        system_language=saved_settings.get('language', system_language)
+        system_dark_mode=system_dark_mode,
+        system_language=system_language,
+        settings=settings,
+        trace=trace
     )
     
     # Pencereyi göster
     window.show()
+    trace.mark("pencere gösterildi")
     
-    # Eğer kaydedilmiş tema ayarı varsa, onu uygula
-    if saved_settings and 'dark_mode' in saved_settings:
-        window.dark_mode = saved_settings['dark_mode']
-        window.load_style()
-        window.update_theme_combo()
+    # Event loop'un ilk turu: ilk çizim yapılmıştır
+    QTimer.singleShot(0, lambda: (trace.mark("ilk çizim"), trace.report()))
     
-    sys.exit(app.exec()) 
\ No newline at end of file
+    exit_code = app.exec()
+    if profiler is not None:
+        profiler.stop()
+    sys.exit(exit_code)
@@ -0,0 +1,183 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# Gecikme histogramlarının kova üst sınırları (saniye)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+                   30.0, 60.0, 120.0)
+
+# Bilinen ölçümler: isim -> (tip, açıklama); açıklamalar Prometheus çıktısında HELP satırıdır
+DEFINITIONS = {
+    "wol_wake_packets_total": ("counter", "Magic packets handed to the socket, by outcome"),
+    "wol_wake_send_seconds": ("histogram", "Duration of one wake_devices batch"),
+    "wol_verify_total": ("counter", "Wake-and-verify results, by outcome"),
+    "wol_verify_seconds": ("histogram", "Time from the first magic packet until the device answered"),
+    "wol_persistence_write_seconds": ("histogram", "Background store and settings writes, by writer"),
+    "wol_persistence_errors_total": ("counter", "Failed background writes, by writer"),
+    "wol_table_refresh_seconds": ("histogram", "Full device table rebuilds (model reset)"),
+    "wol_theme_switch_seconds": ("histogram", "Applying a theme"),
+    "wol_language_switch_seconds": ("histogram", "Switching the interface language"),
+    "wol_search_seconds": ("histogram", "Search box queries, including the table filter update"),
+    "wol_api_requests_total": ("counter", "HTTP API requests, by response status"),
+    "wol_event_loop_lag_seconds": ("histogram", "GUI event loop heartbeat delay"),
+    "wol_event_loop_stalls_total": ("counter", "GUI event loop stalls longer than the watchdog threshold"),
+}
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        # Son eleman +Inf kovası
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """ Kova sınırları arasında doğrusal yaklaşımla tahmini yüzdelik """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for upper, count in zip(self.buckets, self.counts):
+            if count and seen + count >= rank:
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+            lower = upper
+        return self.buckets[-1]
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}"
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metrics:
+    """ Sayaçlar ve gecikme histogramları; kapalıyken hiçbir şey kaydedilmez
+
+    Sıcak yollar çağrıdan önce `if metrics.enabled:` ile kontrol eder; kapalıyken maliyet tek
+    bir öznitelik okumasıdır.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._gauges = {}
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def gauge(self, name, help_text, fn):
+        """ Değeri okunurken fn() ile hesaplanan gösterge (ör. cihaz sayısı) """
+        self._gauges[name] = (help_text, fn)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def summary(self):
+        """ Tanılama paneli için: [(isim, etiketler, sayı, p50, p95, toplam)] ve [(isim, etiketler, değer)] """
+        with self._lock:
+            histograms = [(name, _format_labels(labels), h.count, h.quantile(0.5), h.quantile(0.95), h.sum)
+                          for (name, labels), h in sorted(self._histograms.items())]
+            counters = [(name, _format_labels(labels), value)
+                        for (name, labels), value in sorted(self._counters.items())]
+        counters.extend((name, "", fn()) for name, (_, fn) in sorted(self._gauges.items()))
+        return histograms, counters
+
+    def render(self):
+        """ Prometheus metin biçimi (0.0.4) """
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((key, (h.counts[:], h.sum, h.count, h.buckets))
+                                for key, h in self._histograms.items())
+
+        def header(name, kind, help_text=None):
+            if help_text is None:
+                help_text = DEFINITIONS.get(name, (kind, ""))[1]
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        previous = None
+        for (name, labels), value in counters:
+            if name != previous:
+                header(name, "counter")
+                previous = name
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        previous = None
+        for (name, labels), (counts, total, count, buckets) in histograms:
+            if name != previous:
+                header(name, "histogram")
+                previous = name
+            cumulative = 0
+            for upper, bucket_count in zip(buckets, counts):
+                cumulative += bucket_count
+                lines.append(f"{name}_bucket{_format_labels(labels, [('le', upper)])} {cumulative}")
+            lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+        for name, (help_text, fn) in sorted(self._gauges.items()):
+            header(name, "gauge", help_text)
+            lines.append(f"{name} {_format_value(fn())}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        """ node_exporter textfile toplayıcısı için; yarım dosya okunmasın diye atomik yazılır """
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(temp_path, path)
+
+
+# Uygulama genelinde tek kayıt defteri; GUI ayarlara göre, API sunucusu her zaman açar
+metrics = Metrics()
+
+
+class Stopwatch:
+    """ `with Stopwatch("isim"):` bloğunun süresini ölçümler açıksa kaydeder """
+
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name, **labels):
+        self.name = name
+        self.labels = labels
+        self.start = None
+
+    def __enter__(self):
+        if metrics.enabled:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.start is not None:
+            metrics.observe(self.name, time.perf_counter() - self.start, **self.labels)
@@ -0,0 +1,264 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+
+from verify import Probes, DEFAULT_DEADLINE
+
+# Cihaz durumları
+UNKNOWN = "unknown"
+ONLINE = "online"
+OFFLINE = "offline"
+WAKING = "waking"
+
+# Yoklama aralıkları (saniye): durum değişince kısa aralıkla başlar, sabit kaldıkça uzar
+DEFAULT_MIN_INTERVAL = 2.0
+DEFAULT_MAX_INTERVAL = 300.0
+DEFAULT_BACKOFF_FACTOR = 2.0
+
+# Saniyedeki en fazla yoklama ve aynı anda süren en fazla yoklama
+DEFAULT_MAX_RATE = 50.0
+DEFAULT_MAX_IN_FLIGHT = 64
+
+
+class _Entry:
+    __slots__ = ("device_id", "ip", "mac", "port", "state", "interval", "generation", "waking_until")
+
+    def __init__(self, device_id, ip, mac, port):
+        self.device_id = device_id
+        self.ip = ip
+        self.mac = mac
+        self.port = port
+        self.state = UNKNOWN
+        self.interval = DEFAULT_MIN_INTERVAL
+        self.generation = 0
+        self.waking_until = 0.0
+
+
+class LivenessMonitor:
+    """ Cihazları heap tabanlı zamanlayıcıyla yoklar; değişen cihazlar sık, sabitler seyrek yoklanır
+
+    track/untrack/mark_waking herhangi bir thread'den çağrılabilir; komutlar kuyruğa alınır
+    ve monitörün event loop'unda uygulanır. Durum değişiklikleri on_change(device_id, state)
+    ile bildirilir.
+    """
+
+    def __init__(self, probes=None, on_change=None, max_rate=DEFAULT_MAX_RATE,
+                 max_in_flight=DEFAULT_MAX_IN_FLIGHT, min_interval=DEFAULT_MIN_INTERVAL,
+                 max_interval=DEFAULT_MAX_INTERVAL, backoff_factor=DEFAULT_BACKOFF_FACTOR,
+                 waking_timeout=DEFAULT_DEADLINE):
+        self.probes = probes or Probes()
+        self.on_change = on_change
+        self.max_rate = max(0.1, float(max_rate))
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.waking_timeout = waking_timeout
+        self.probes_sent = 0
+        self.coalesced = 0
+        self._entries = {}
+        self._heap = []
+        self._seq = itertools.count()
+        self._commands = deque()
+        self._inflight = {}
+        self._loop = None
+        self._wakeup = None
+        self._tokens = 0.0
+        self._refilled = 0.0
+
+    # Thread-safe arayüz
+    def track(self, device_id, ip, mac, port=None):
+        self._command(self._track, device_id, ip, mac, port)
+
+    def untrack(self, device_id):
+        self._command(self._untrack, device_id)
+
+    def retain(self, device_ids):
+        self._command(self._retain, set(device_ids))
+
+    def mark_waking(self, device_ids):
+        self._command(self._mark_waking, list(device_ids))
+
+    def state(self, device_id):
+        entry = self._entries.get(device_id)
+        return entry.state if entry is not None else UNKNOWN
+
+    def _command(self, fn, *args):
+        self._commands.append((fn, args))
+        loop = self._loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                pass
+
+    # Loop içinde çalışan işlemler
+    def _track(self, device_id, ip, mac, port):
+        entry = self._entries.get(device_id)
+        if entry is not None and (entry.ip, entry.mac, entry.port) == (ip, mac, port):
+            return
+        if entry is None:
+            entry = self._entries[device_id] = _Entry(device_id, ip, mac, port)
+        else:
+            # Hedef değişti: eski yoklama sonucu geçersiz, hemen tekrar yokla
+            entry.ip, entry.mac, entry.port = ip, mac, port
+            entry.interval = self.min_interval
+        if ip:
+            self._schedule(entry, 0.0)
+        else:
+            entry.generation += 1
+            self._set_state(entry, UNKNOWN)
+
+    def _untrack(self, device_id):
+        entry = self._entries.pop(device_id, None)
+        if entry is not None:
+            # Heap'teki kaydı silmek yerine nesli artırılır; sırası gelince atlanır
+            entry.generation += 1
+
+    def _retain(self, device_ids):
+        for device_id in [d for d in self._entries if d not in device_ids]:
+            self._untrack(device_id)
+
+    def _mark_waking(self, device_ids):
+        until = time.monotonic() + self.waking_timeout
+        for device_id in device_ids:
+            entry = self._entries.get(device_id)
+            if entry is None or not entry.ip or entry.state == ONLINE:
+                continue
+            entry.waking_until = until
+            entry.interval = self.min_interval
+            self._set_state(entry, WAKING)
+            self._schedule(entry, self.min_interval)
+
+    def _schedule(self, entry, delay):
+        entry.generation += 1
+        heapq.heappush(self._heap, (time.monotonic() + delay, next(self._seq), entry.device_id,
+                                    entry.generation))
+
+    def _set_state(self, entry, state):
+        if entry.state != state:
+            entry.state = state
+            if self.on_change:
+                self.on_change(entry.device_id, state)
+
+    def _apply(self, entry, alive):
+        previous = entry.state
+        if alive:
+            state = ONLINE
+        elif entry.state == WAKING and time.monotonic() < entry.waking_until:
+            state = WAKING
+        else:
+            state = OFFLINE
+
+        if state != previous or state == WAKING:
+            entry.interval = self.min_interval
+        else:
+            entry.interval = min(entry.interval * self.backoff_factor, self.max_interval)
+        self._set_state(entry, state)
+        self._schedule(entry, entry.interval)
+
+    async def _take_token(self):
+        # Token bucket: envanter ne kadar büyük olursa olsun yoklama hızı max_rate'i aşmaz
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.max_rate, self._tokens + (now - self._refilled) * self.max_rate)
+            self._refilled = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return
+            await asyncio.sleep((1.0 - self._tokens) / self.max_rate)
+
+    async def _probe(self, ip, mac, port):
+        # Aynı hedefe süren bir yoklama varsa sonucu paylaşılır
+        key = (ip, port)
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return bool(await asyncio.shield(task))
+        self.probes_sent += 1
+        task = asyncio.ensure_future(self.probes.check(ip, mac, port))
+        self._inflight[key] = task
+        try:
+            return bool(await task)
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _check(self, entry, slots):
+        try:
+            alive = await self._probe(entry.ip, entry.mac, entry.port)
+        finally:
+            slots.release()
+        if self._entries.get(entry.device_id) is entry:
+            self._apply(entry, alive)
+
+    def _drain_commands(self):
+        while self._commands:
+            fn, args = self._commands.popleft()
+            fn(*args)
+
+    async def run(self):
+        """ İptal edilene kadar çalışır """
+        self._wakeup = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        self._refilled = time.monotonic()
+        slots = asyncio.Semaphore(self.max_in_flight)
+        tasks = set()
+        try:
+            while True:
+                self._drain_commands()
+                now = time.monotonic()
+                while self._heap and self._heap[0][0] <= now:
+                    _, _, device_id, generation = heapq.heappop(self._heap)
+                    entry = self._entries.get(device_id)
+                    if entry is None or entry.generation != generation:
+                        continue
+                    await self._take_token()
+                    await slots.acquire()
+                    task = asyncio.ensure_future(self._check(entry, slots))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                    self._drain_commands()
+                    now = time.monotonic()
+
+                timeout = self._heap[0][0] - now if self._heap else None
+                self._wakeup.clear()
+                if self._commands:
+                    continue
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._loop = None
+
+
+class CollectionFeed:
+    """ DeviceCollection dinleyicisi: eklenen/silinen/değişen cihazları monitöre iletir """
+
+    def __init__(self, monitor, collection):
+        self.monitor = monitor
+        self.collection = collection
+        collection.subscribe(self)
+        self.end_reset()
+
+    def _track(self, device):
+        self.monitor.track(device.get("id"), device.get("ip", ""), device.get("mac", ""),
+                           device.get("verify_port"))
+
+    def end_insert(self, row, device):
+        self._track(device)
+
+    def end_remove(self, row, device):
+        self.monitor.untrack(device.get("id"))
+
+    def updated(self, row, device):
+        self._track(device)
+
+    def end_reset(self):
+        self.monitor.retain(device.get("id") for device in self.collection)
+        for device in self.collection:
+            self._track(device)
@@ -0,0 +1,212 @@
+import json
+import os
+import threading
+import time
+
+from metrics import metrics
+
+# Birleştirme penceresi (saniye) ve fsync politikası varsayılanları
+DEFAULT_WINDOW = 0.5
+DEFAULT_FSYNC = "file"
+# Yazılamayan değişiklikler en az bu kadar sonra yeniden denenir (saniye)
+RETRY_DELAY = 1.0
+
+# none: fsync yok, file: dosya fsync, full: dosya + dizin fsync
+FSYNC_POLICIES = ("none", "file", "full")
+
+
+def atomic_write_json(path, data, fsync=DEFAULT_FSYNC, **kwargs):
+    """ Geçici dosyaya yazıp os.replace ile yerine koyar; yarım yazılmış dosya kalmaz """
+    # tempfile sadece yazarken yüklenir (komut satırı açılışını yavaşlatmasın)
+    import tempfile
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+    try:
+        # mkstemp 0600 ile açar; mevcut dosyanın izinlerini koru
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except OSError:
+            mode = 0o644
+        os.chmod(tmp_path, mode)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, **kwargs)
+            f.flush()
+            if fsync in ("file", "full"):
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    if fsync == "full" and hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+class WriteBehind:
+    """ Pencere içindeki yazma isteklerini birleştirip arka plan thread'inde tek seferde yazar
+
+    Alt sınıflar _merge(pending, change), _write(pending) ve _requeue(failed, pending)
+    metotlarını uygular. Yazılamayan değişiklikler kaybolmaz; sonradan gelenlerle birleştirilip
+    yeniden denenir.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW, on_error=None):
+        self.window = window
+        self.on_error = on_error
+        self.requests = 0
+        self.writes = 0
+        self.errors = 0
+        self._pending = None
+        self._deadline = None
+        self._writing = False
+        self._flush_now = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = None
+
+    @property
+    def coalesced(self):
+        # Birleştirme sayesinde yapılmayan yazma sayısı
+        return max(0, self.requests - self.writes - self.errors - (1 if self._pending is not None else 0))
+
+    def stats(self):
+        with self._cond:
+            return {
+                "requests": self.requests,
+                "writes": self.writes,
+                "coalesced": self.coalesced,
+                "errors": self.errors,
+            }
+
+    def _submit(self, change):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("write-behind kapatıldı")
+            self._pending = self._merge(self._pending, change)
+            self.requests += 1
+            if self._deadline is None:
+                # Pencere ilk değişiklikle başlar; gecikme pencereyi aşmaz
+                self._deadline = time.monotonic() + self.window
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._pending is not None:
+                        remaining = self._deadline - time.monotonic()
+                        if remaining <= 0 or self._flush_now or self._closed:
+                            break
+                        self._cond.wait(remaining)
+                    elif self._closed:
+                        return
+                    else:
+                        self._flush_now = False
+                        self._cond.notify_all()
+                        self._cond.wait()
+                pending = self._pending
+                self._pending = None
+                self._deadline = None
+                self._writing = True
+
+            started = time.perf_counter()
+            try:
+                self._write(pending)
+            except Exception as e:
+                with self._cond:
+                    self.errors += 1
+                    # Kapatılırken son deneme de başarısızsa vazgeçilir (on_error bildirir)
+                    if not self._closed:
+                        self._pending = self._requeue(pending, self._pending)
+                        self._deadline = time.monotonic() + max(self.window, RETRY_DELAY)
+                        self._flush_now = False
+                if metrics.enabled:
+                    metrics.inc("wol_persistence_errors_total", writer=type(self).__name__)
+                if self.on_error:
+                    self.on_error(e)
+            else:
+                with self._cond:
+                    self.writes += 1
+                if metrics.enabled:
+                    metrics.observe("wol_persistence_write_seconds", time.perf_counter() - started,
+                                    writer=type(self).__name__)
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """ Bekleyen yazmaları hemen yapar ve bitmesini bekler; yazma başarısızsa False """
+        end = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            if self._thread is None:
+                return True
+            self._flush_now = True
+            errors = self.errors
+            self._cond.notify_all()
+            while self._pending is not None or self._writing:
+                if self.errors != errors:
+                    # Değişiklikler yeniden denenmek üzere bekliyor
+                    self._flush_now = False
+                    return False
+                remaining = None if end is None else end - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            self._flush_now = False
+            return True
+
+    def close(self):
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def _merge(self, pending, change):
+        raise NotImplementedError
+
+    def _write(self, pending):
+        raise NotImplementedError
+
+    def _requeue(self, failed, pending):
+        """ Yazılamayan failed ile sonradan gelen pending'i (daha yeni) birleştirir """
+        raise NotImplementedError
+
+
+class JsonFileWriter(WriteBehind):
+    """ JSON dosyaları için: her dosyanın sadece en son içeriği yazılır """
+
+    def __init__(self, window=DEFAULT_WINDOW, fsync=DEFAULT_FSYNC, on_error=None):
+        super().__init__(window, on_error)
+        self.fsync = fsync
+
+    def write_json(self, path, data, **kwargs):
+        self._submit((path, data, kwargs))
+
+    def _merge(self, pending, change):
+        pending = pending or {}
+        path, data, kwargs = change
+        pending[path] = (data, kwargs)
+        return pending
+
+    def _requeue(self, failed, pending):
+        if pending is not None:
+            failed.update(pending)
+        return failed
+
+    def _write(self, pending):
+        for path, (data, kwargs) in pending.items():
+            atomic_write_json(path, data, fsync=self.fsync, **kwargs)
@@ -0,0 +1,343 @@
+import heapq
+import itertools
+import os
+import time
+from datetime import datetime, timedelta
+
+# Zamanı geçmiş iş bu süreden (saniye) fazla gecikmişse "kaçırılmış" sayılır
+DEFAULT_GRACE = 120
+# Kaçırılan işler için politika: "once" bir kez çalıştırır, "skip" atlar
+CATCH_UP_POLICIES = ("once", "skip")
+DEFAULT_CATCH_UP = "once"
+# Zamanlayıcı en fazla bu kadar (saniye) uyur; uyku/saat değişikliği böylece fark edilir
+MAX_SLEEP = 30
+# Zamanlanmış işleri çalıştıran süreç bu dosyayı kilitler (depo ile aynı dizinde)
+SCHEDULER_LOCK = "wake_on_lan_scheduler.lock"
+# Eşleşme aranacak en uzak yıl (ör. 30 Şubat gibi hiç gelmeyen ifadeler için)
+_SEARCH_YEARS = 5
+
+_ALIASES = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+_MONTH_NAMES = {name: i for i, name in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), 1)}
+_DAY_NAMES = {name: i for i, name in enumerate(("sun", "mon", "tue", "wed", "thu", "fri", "sat"))}
+# dakika, saat, ayın günü, ay, haftanın günü (0 ve 7 = pazar)
+_FIELDS = ((0, 59, None), (0, 23, None), (1, 31, None), (1, 12, _MONTH_NAMES), (0, 7, _DAY_NAMES))
+
+
+def _parse_field(text, low, high, names):
+    values = set()
+    for part in text.split(","):
+        part, _, step = part.partition("/")
+        step = int(step) if step else 1
+        if step < 1:
+            raise ValueError(f"geçersiz adım: {text}")
+        if part == "*":
+            start, end = low, high
+        else:
+            first, _, last = part.partition("-")
+            start = _value(first, names)
+            end = _value(last, names) if last else (high if step > 1 else start)
+        if not low <= start <= end <= high:
+            raise ValueError(f"aralık dışında: {text}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+def _value(text, names):
+    if names and text.lower() in names:
+        return names[text.lower()]
+    return int(text)
+
+
+def _to_wall(timestamp, tz):
+    """ Zaman damgasını saat diliminde (tz None ise yerel saat) naive duvar saatine çevirir """
+    if tz is None:
+        return datetime.fromtimestamp(timestamp)
+    return datetime.fromtimestamp(timestamp, tz).replace(tzinfo=None)
+
+
+def _to_timestamp(wall, tz):
+    if tz is None:
+        return wall.timestamp()
+    return wall.replace(tzinfo=tz).timestamp()
+
+
+class Cron:
+    """ Beş alanlı cron ifadesi: dakika saat gün ay haftanın-günü """
+
+    __slots__ = ("text", "minutes", "hours", "days", "months", "weekdays", "_any_day", "_any_weekday")
+
+    def __init__(self, text):
+        self.text = text
+        fields = _ALIASES.get(text.strip().lower(), text).split()
+        if len(fields) != 5:
+            raise ValueError(f"cron ifadesi 5 alanlı olmalı: {text}")
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            _parse_field(field, *spec) for field, spec in zip(fields, _FIELDS))
+        # 7 de pazar gününü ifade eder
+        self.weekdays = frozenset(day % 7 for day in weekdays)
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, wall):
+        day = wall.day in self.days
+        weekday = (wall.weekday() + 1) % 7 in self.weekdays
+        # Klasik cron kuralı: iki gün alanı da kısıtlıysa biri eşleşmesi yeter
+        if self._any_day or self._any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, after, tz=None):
+        """ after zaman damgasından sonraki ilk çalışma anı; yoksa None """
+        wall = _to_wall(after, tz).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = wall.year + _SEARCH_YEARS
+        while wall.year <= limit:
+            if wall.month not in self.months:
+                wall = (wall.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(wall):
+                wall = wall.replace(hour=0, minute=0) + timedelta(days=1)
+            elif wall.hour not in self.hours:
+                wall = wall.replace(minute=0) + timedelta(hours=1)
+            elif wall.minute not in self.minutes:
+                wall += timedelta(minutes=1)
+            else:
+                timestamp = _to_timestamp(wall, tz)
+                # Saat geri alınırken aynı duvar saati ikinci kez gelir; iş bir kez çalışır
+                if timestamp > after:
+                    return timestamp
+                wall += timedelta(minutes=1)
+        return None
+
+
+class OneShot:
+    """ Tek seferlik çalışma: ISO 8601 tarih/saat; saat dilimi verilmemişse tz kullanılır """
+
+    __slots__ = ("text", "_wall", "_aware")
+
+    def __init__(self, text):
+        self.text = text
+        moment = datetime.fromisoformat(text)
+        self._aware = moment.tzinfo is not None
+        self._wall = moment
+
+    def next_after(self, after, tz=None):
+        timestamp = self._wall.timestamp() if self._aware else _to_timestamp(self._wall, tz)
+        return timestamp if timestamp > after else None
+
+
+def _zone(name):
+    if not name:
+        return None
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError) as e:
+        raise ValueError(f"bilinmeyen saat dilimi: {name}") from e
+
+
+def parse_schedule(entry):
+    """ Cihaz kaydındaki {"cron"|"at", "tz", "catch_up", "created", "last_run"} girdisini doğrular
+
+    Dönüş: (kural, saat dilimi, kaçırma politikası). Geçersizse ValueError.
+    """
+    if not isinstance(entry, dict):
+        raise ValueError(f"geçersiz zamanlama: {entry!r}")
+    if entry.get("cron"):
+        rule = Cron(entry["cron"])
+    elif entry.get("at"):
+        rule = OneShot(entry["at"])
+    else:
+        raise ValueError(f"zamanlamada 'cron' veya 'at' gerekli: {entry!r}")
+    catch_up = entry.get("catch_up", DEFAULT_CATCH_UP)
+    if catch_up not in CATCH_UP_POLICIES:
+        raise ValueError(f"geçersiz kaçırma politikası: {catch_up}")
+    return rule, _zone(entry.get("tz")), catch_up
+
+
+class _Job:
+    __slots__ = ("device_id", "index", "rule", "tz", "catch_up", "due", "active")
+
+    def __init__(self, device_id, index, rule, tz, catch_up):
+        self.device_id = device_id
+        self.index = index
+        self.rule = rule
+        self.tz = tz
+        self.catch_up = catch_up
+        self.due = None
+        self.active = True
+
+
+class Firing:
+    """ Çalışma zamanı gelen bir zamanlama """
+
+    __slots__ = ("device_id", "index", "due", "late")
+
+    def __init__(self, device_id, index, due, late):
+        self.device_id = device_id
+        self.index = index
+        self.due = due
+        self.late = late
+
+
+class Scheduler:
+    """ Cihazlardaki zamanlamaları tek bir heap'te tutar
+
+    Her zamanlama heap'te bir sonraki çalışma anıyla durur; bir tik sadece zamanı gelenleri
+    çıkarır (iş başına O(log n)), liste taranmaz. Silinen işler heap'ten hemen atılmaz,
+    sıraları geldiğinde yok sayılır.
+    """
+
+    def __init__(self, grace=DEFAULT_GRACE, clock=time.time):
+        self.grace = grace
+        self.clock = clock
+        self._heap = []
+        self._jobs = {}
+        self._seq = itertools.count()
+        self.skipped = 0
+
+    def __len__(self):
+        return sum(len(jobs) for jobs in self._jobs.values())
+
+    def _push(self, job, after):
+        job.due = job.rule.next_after(after, job.tz)
+        if job.due is not None:
+            heapq.heappush(self._heap, (job.due, next(self._seq), job))
+
+    def sync(self, device):
+        """ Cihazın zamanlamalarını (yeniden) yükler; geçersiz girdiler atlanır """
+        device_id = device.get("id")
+        self.remove(device_id)
+        now = self.clock()
+        jobs = []
+        for index, entry in enumerate(device.get("schedules") or ()):
+            try:
+                rule, tz, catch_up = parse_schedule(entry)
+            except ValueError as e:
+                print(f"Zamanlama atlandı ({device.get('name', device_id)}): {e}")
+                continue
+            job = _Job(device_id, index, rule, tz, catch_up)
+            # Son çalışmadan sonraki an geçmişte kalmışsa iş kaçırılmıştır (uyku/yeniden başlatma)
+            # Hiç çalışmamışsa eklendiği andan itibaren bakılır
+            last_run = entry.get("last_run") or entry.get("created")
+            self._push(job, last_run if isinstance(last_run, (int, float)) else now)
+            jobs.append(job)
+        if jobs:
+            self._jobs[device_id] = jobs
+
+    def remove(self, device_id):
+        for job in self._jobs.pop(device_id, ()):
+            job.active = False
+
+    def reset(self, devices):
+        for device_id in list(self._jobs):
+            self.remove(device_id)
+        self._heap = []
+        for device in devices:
+            self.sync(device)
+
+    def next_due(self):
+        """ En yakın çalışma anı (zaman damgası) veya None """
+        heap = self._heap
+        while heap and not heap[0][2].active:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def pop_due(self, now=None):
+        """ Zamanı gelen işleri çıkarır ve sonraki çalışmalarını heap'e koyar """
+        now = self.clock() if now is None else now
+        heap = self._heap
+        firings = []
+        while heap and heap[0][0] <= now:
+            due, _, job = heapq.heappop(heap)
+            if not job.active or job.due != due:
+                continue
+            late = now - due
+            if late > self.grace and job.catch_up == "skip":
+                self.skipped += 1
+            else:
+                firings.append(Firing(job.device_id, job.index, due, late))
+            # Kaç çalışma kaçırılmış olursa olsun sıradaki an şimdiden sonradır
+            self._push(job, now)
+        return firings
+
+
+def mark_run(device, index, when):
+    """ Çalışan zamanlamanın last_run alanı güncellenmiş yeni listesini döner """
+    schedules = [dict(entry) for entry in device.get("schedules") or ()]
+    if 0 <= index < len(schedules):
+        schedules[index]["last_run"] = round(when, 3)
+    return schedules
+
+
+class ScheduleFeed:
+    """ DeviceCollection dinleyicisi: cihazlardaki zamanlama değişikliklerini zamanlayıcıya iletir """
+
+    def __init__(self, scheduler, collection):
+        self.scheduler = scheduler
+        self.collection = collection
+        collection.subscribe(self)
+        self.end_reset()
+
+    def end_insert(self, row, device):
+        if device.get("schedules"):
+            self.scheduler.sync(device)
+
+    def end_remove(self, row, device):
+        self.scheduler.remove(device.get("id"))
+
+    def updated(self, row, device):
+        self.scheduler.sync(device)
+
+    def end_reset(self):
+        self.scheduler.reset(device for device in self.collection if device.get("schedules"))
+
+
+class SchedulerLock:
+    """ Zamanlanmış işleri tek bir sürecin (GUI veya daemon) çalıştırması için dosya kilidi
+
+    Kilit işletim sistemindedir; süreç kapanınca veya çökünce kendiliğinden kalkar.
+    """
+
+    def __init__(self, directory=None):
+        self.path = os.path.join(directory or os.path.expanduser('~'), SCHEDULER_LOCK)
+        self._file = None
+
+    @property
+    def held(self):
+        return self._file is not None
+
+    def acquire(self):
+        """ Kilit bu süreçteyse veya şimdi alındıysa True; beklemez """
+        if self._file is not None:
+            return True
+        try:
+            f = open(self.path, "a+b")
+        except OSError:
+            # Kilit dosyası açılamıyorsa işler yine de çalıştırılır (hiç çalışmamasından iyidir)
+            return True
+        try:
+            if os.name == "nt":
+                import msvcrt
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            return False
+        self._file = f
+        return True
+
+    def release(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
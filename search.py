@@ -0,0 +1,282 @@
+from array import array
+from bisect import bisect_left
+
+from devices import mac_key
+
+# Dizinlenen parça uzunluğu (trigram)
+GRAM = 3
+# Her alanın sonuna eklenir; böylece her konumda bir trigram başlar ve kısa sorgular
+# trigramların öneki olarak aranabilir
+_PAD = "\x00" * (GRAM - 1)
+# Alanlar arasına konur; sorgu iki alanı birleştirerek eşleşmez
+_FIELD_SEPARATOR = "\x01"
+_MAC_SEPARATORS = str.maketrans("", "", ":-.")
+_HEX_DIGITS = frozenset("0123456789abcdef")
+# Silinen kayıtlar bu sayıyı ve canlı kayıt sayısını aşınca dizin yeniden kurulur
+_COMPACT_MIN = 1024
+# build_step'in bir çağrıda dizinlediği kayıt sayısı (GUI boştayken parça parça kurulur)
+BUILD_CHUNK = 500
+# Alan konumlarına karşılık gelen dilimler; trigramlar C düzeyinde map ile çıkarılır.
+# Daha uzun bir alan geldikçe uzatılır (bkz. _slices)
+_SLICES = [slice(i, i + GRAM) for i in range(256)]
+
+
+def _slices(length):
+    if length > len(_SLICES):
+        _SLICES.extend(slice(i, i + GRAM) for i in range(len(_SLICES), length))
+    return _SLICES[:length]
+
+
+def search_fields(device):
+    """ Aranan alanlar: isim, ayraçsız MAC, IP, grup ve etiketler (küçük harfe çevrilmiş) """
+    packed = device.get("_mac")
+    if packed is None:
+        key = mac_key(device.get("mac", ""))
+        mac = f"{key:012x}" if key is not None else (device.get("mac") or "").casefold()
+    else:
+        mac = packed.hex()
+    fields = [(device.get("name") or "").casefold(), mac, device.get("ip") or "",
+              (device.get("group") or "").casefold()]
+    tags = device.get("tags")
+    if tags:
+        fields.extend(tag.casefold() for tag in ([tags] if isinstance(tags, str) else tags))
+    return [field for field in fields if field]
+
+
+def query_variants(token):
+    """ Sorgu parçası ve MAC gibi görünüyorsa ayraçsız hali (aa:bb, aa-bb, aabb.ccdd) """
+    bare = token.translate(_MAC_SEPARATORS)
+    if bare and bare != token and _HEX_DIGITS.issuperset(bare):
+        # Sadece noktalı rakamlar IP parçasıdır, MAC olarak da aranmaz
+        if ":" in token or "-" in token or not bare.isdigit():
+            return (token, bare)
+    return (token,)
+
+
+class SearchIndex:
+    """ Cihaz koleksiyonu üzerinde trigram dizini; koleksiyon değiştikçe güncellenir
+
+    Her kayda bir yuva numarası verilir, her trigram için yuva numaraları bir dizide tutulur.
+    Değişen kayıt eski yuvasını boşaltıp yeni yuva alır; boş yuvalar birikince dizin yeniden
+    kurulur. Kurulum build_step ile parça parça yapılabilir; bitmeden arama yapılırsa kalanı
+    hemen dizinlenir.
+    """
+
+    def __init__(self, collection, on_stale=None):
+        self.collection = collection
+        # Koleksiyon sıfırlanınca çağrılır (yeniden kurulumu zamanlamak için)
+        self.on_stale = on_stale
+        # Aranabilir içerik her değiştiğinde artar
+        self.generation = 0
+        self._built = False
+        # Kurulum sürerken dizinlenmeyi bekleyen kayıtlar (koleksiyonun anlık kopyası)
+        self._pending = None
+        self._position = 0
+        self._clear()
+        collection.subscribe(self)
+
+    def _clear(self):
+        self._devices = []
+        self._texts = []
+        self._slot_of = {}
+        self._postings = {}
+        self._sorted_grams = None
+        self._dead = 0
+        # Yuvalar koleksiyon sırasıyla verildi ve o günden beri satırlar değişmedi
+        self._aligned = False
+
+    @property
+    def ready(self):
+        return self._built
+
+    def build_step(self, count=BUILD_CHUNK):
+        """ Kurulumu en fazla count kayıt ilerletir; dizin hazırsa True """
+        if self._built:
+            return True
+        if self._pending is None:
+            self._clear()
+            self._pending = list(self.collection)
+            self._position = 0
+            self._aligned = True
+        pending, start = self._pending, self._position
+        end = min(len(pending), start + count)
+        current = self.collection.get
+        slot_of = self._slot_of
+        for device in pending[start:end]:
+            device_id = device.get("id")
+            # Kurulum sırasında silinen veya zaten eklenmiş kayıtlar atlanır
+            if device_id not in slot_of and current(device_id) is device:
+                self._add(device, search_fields(device))
+        self._position = end
+        if end == len(pending):
+            # Kurulum sırasında koleksiyon değişmediyse yuvalar satırlarla aynı sıradadır
+            self._aligned = self._aligned and len(self._devices) == len(self.collection)
+            self._pending = None
+            self._built = True
+        return self._built
+
+    def build(self):
+        self._built = False
+        self._pending = None
+        self.build_step(len(self.collection) + 1)
+
+    @property
+    def _active(self):
+        return self._built or self._pending is not None
+
+    def _add(self, device, fields):
+        slot = len(self._devices)
+        self._devices.append(device)
+        self._texts.append(_FIELD_SEPARATOR.join(fields))
+        self._slot_of[device.get("id")] = slot
+        grams = set()
+        for field in fields:
+            grams.update(map((field + _PAD).__getitem__, _slices(len(field))))
+        postings = self._postings
+        for gram in grams:
+            posting = postings.get(gram)
+            if posting is None:
+                posting = postings[gram] = array("I")
+                self._sorted_grams = None
+            posting.append(slot)
+
+    def _remove(self, device_id):
+        slot = self._slot_of.pop(device_id, None)
+        if slot is None:
+            return
+        self._devices[slot] = self._texts[slot] = None
+        self._dead += 1
+
+    def _maybe_compact(self):
+        if self._built and self._dead > _COMPACT_MIN and self._dead > len(self._slot_of):
+            # Yeniden kurulum ilk kurulum gibi parça parça yapılır (on_stale zamanlar)
+            self._built = False
+            self._pending = None
+            if self.on_stale is not None:
+                self.on_stale()
+
+    # DeviceCollection bildirimleri
+    def end_insert(self, row, device):
+        self.generation += 1
+        self._aligned = False
+        if self._active:
+            self._add(device, search_fields(device))
+
+    def begin_move(self, old_row, new_row):
+        self._aligned = False
+
+    def end_remove(self, row, device):
+        self.generation += 1
+        self._aligned = False
+        if self._active:
+            self._remove(device.get("id"))
+            self._maybe_compact()
+
+    def updated(self, row, device):
+        slot = self._slot_of.get(device.get("id"))
+        if slot is None:
+            # Henüz dizinlenmedi; sırası gelince güncel haliyle eklenir
+            self.generation += 1
+            self._aligned = False
+            return
+        fields = search_fields(device)
+        if self._texts[slot] == _FIELD_SEPARATOR.join(fields):
+            # Aranmayan bir alan değişti (ör. doğrulama portu)
+            return
+        self.generation += 1
+        self._aligned = False
+        self._remove(device.get("id"))
+        self._add(device, fields)
+        self._maybe_compact()
+
+    def end_reset(self):
+        self.generation += 1
+        self._built = False
+        self._pending = None
+        self._clear()
+        if self.on_stale is not None:
+            self.on_stale()
+
+    # Arama; eşleşme fonksiyonları her yuva eşleşiyorsa küme kurmadan None döner
+    def _match_prefix(self, token):
+        # Kısa parça: onunla başlayan tüm trigramların yuvaları (dolgu sayesinde kesin eşleşme)
+        if self._sorted_grams is None:
+            self._sorted_grams = sorted(self._postings)
+        grams = self._sorted_grams
+        postings = [self._postings[grams[i]]
+                    for i in range(bisect_left(grams, token), bisect_left(grams, token + "\U0010ffff"))]
+        total = len(self._devices)
+        if any(len(posting) == total for posting in postings):
+            return None
+        slots = set()
+        for posting in postings:
+            slots.update(posting)
+        return slots
+
+    def _match_grams(self, token):
+        # En seyrek trigramın yuvaları aday olur, aday metinlerinde parça aranarak doğrulanır;
+        # büyük kümeleri kesiştirmekten ucuzdur
+        smallest = None
+        for gram in {token[i:i + GRAM] for i in range(len(token) - GRAM + 1)}:
+            posting = self._postings.get(gram)
+            if posting is None:
+                return set()
+            if smallest is None or len(posting) < len(smallest):
+                smallest = posting
+        if len(token) == GRAM:
+            return None if len(smallest) == len(self._devices) else set(smallest)
+        texts = self._texts
+        slots = {slot for slot in smallest if token in (texts[slot] or "")}
+        return None if len(slots) == len(self._devices) else slots
+
+    def _match(self, token):
+        if len(token) < GRAM:
+            return self._match_prefix(token)
+        return self._match_grams(token)
+
+    def _search_slots(self, tokens):
+        """ Tüm parçaları içeren canlı yuvalar; her kayıt eşleşiyorsa None """
+        if not self._built:
+            self.build_step(len(self.collection) + 1)
+        result = None
+        for token in tokens:
+            matches = [self._match(variant) for variant in query_variants(token)]
+            if None in matches:
+                continue
+            slots = set().union(*matches)
+            result = slots if result is None else result & slots
+            if not result:
+                return result
+        if result is not None and self._dead:
+            devices = self._devices
+            result = {slot for slot in result if devices[slot] is not None}
+        return result
+
+    def search(self, query):
+        """ Boşlukla ayrılmış tüm parçaları içeren cihazlar; boş sorguda None """
+        tokens = query.casefold().split()
+        if not tokens:
+            return None
+        slots = self._search_slots(tokens)
+        if slots is None:
+            return list(self.collection)
+        return [self._devices[slot] for slot in slots]
+
+    def rows(self, query):
+        """ Eşleşen cihazların koleksiyondaki sıralı satırları; boş sorguda None """
+        tokens = query.casefold().split()
+        if not tokens:
+            return None
+        slots = self._search_slots(tokens)
+        collection = self.collection
+        if slots is None or len(slots) == len(collection):
+            return range(len(collection))
+        if self._aligned:
+            # Kurulumdan beri satır eklenmedi/silinmedi/taşınmadı: yuva numarası satır numarasıdır
+            return sorted(slots)
+        devices = self._devices
+        if len(slots) * 16 < len(collection):
+            return sorted(collection.index_of(devices[slot].get("id")) for slot in slots)
+        # Sonuç büyükse koleksiyonu bir kez taramak satır aramaktan ucuz
+        matched = {id(devices[slot]) for slot in slots}
+        return [row for row, device in enumerate(collection) if id(device) in matched]
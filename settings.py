@@ -0,0 +1,33 @@
+import json
+import os
+
+from i18n import available_languages, FALLBACK_LANGUAGE
+
+SETTINGS_FILE = "wake_on_lan_settings.json"
+
+
+def settings_path(directory=None):
+    return os.path.join(directory or os.path.expanduser('~'), SETTINGS_FILE)
+
+
+def load_settings(path=None):
+    """ Ayar dosyasını okur; dosya yoksa boş sözlük, okunamazsa None döner """
+    path = path or settings_path()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            settings = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Ayarlar yüklenirken hata: {e}")
+        return None
+    return settings if isinstance(settings, dict) else None
+
+
+def detect_language(locale_name):
+    """ 'tr_TR' gibi yerel ayar adından desteklenen dili seçer; yoksa İngilizce """
+    locale_name = (locale_name or "").lower()
+    for code in available_languages():
+        if locale_name.startswith(code):
+            return code
+    return FALLBACK_LANGUAGE
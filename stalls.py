@@ -0,0 +1,129 @@
+import logging
+import logging.handlers
+import os
+import sys
+import threading
+import time
+import traceback
+
+from metrics import metrics
+
+# Ana thread bu aralıkla (saniye) kalp atışı verir; bu süreden fazla gecikme takılma sayılır
+DEFAULT_INTERVAL = 0.1
+DEFAULT_THRESHOLD = 0.25
+STALL_LOG = "wake_on_lan_stalls.log"
+# Döner günlük: dosya başına boyut ve saklanan eski dosya sayısı
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 3
+
+
+def stall_log_path(directory=None):
+    return os.path.join(directory or os.path.expanduser('~'), STALL_LOG)
+
+
+def _handler_name(frames):
+    """ Event loop'un çağırdığı Python fonksiyonu: son modül çerçevesinden sonraki ilk çerçeve """
+    modules = [i for i, frame in enumerate(frames) if frame.name == "<module>"]
+    index = modules[-1] + 1 if modules else 0
+    if index >= len(frames):
+        # Python kodu çalışmıyor; takılma Qt'nin kendi içinde (çizim, yerleşim vb.)
+        return "(Qt)"
+    frame = frames[index]
+    return f"{frame.name} ({os.path.basename(frame.filename)}:{frame.lineno})"
+
+
+class StallWatchdog:
+    """ Ana thread'in event loop gecikmesini yardımcı bir thread'den izler
+
+    Ana thread beat() çağırır (ör. QTimer ile); yardımcı thread son kalp atışı eşikten eski
+    kalırsa ana thread'in Python yığınını ve o an çalışan işleyiciyi döner günlüğe yazar.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, interval=DEFAULT_INTERVAL, log_path=None):
+        self.threshold = threshold
+        self.interval = interval
+        self.log_path = log_path or stall_log_path()
+        self.stalls = 0
+        self._main_id = threading.main_thread().ident
+        self._last_beat = time.monotonic()
+        self._stall_started = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._logger = None
+
+    def _log(self):
+        if self._logger is None:
+            logger = logging.getLogger("wol.watchdog")
+            logger.propagate = False
+            if not logger.handlers:
+                handler = logging.handlers.RotatingFileHandler(
+                    self.log_path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8")
+                handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+                logger.addHandler(handler)
+                logger.setLevel(logging.INFO)
+            self._logger = logger
+        return self._logger
+
+    def beat(self):
+        """ Ana thread'den çağrılır; gecikme histogramını ve biten takılmaları kaydeder """
+        now = time.monotonic()
+        lag = now - self._last_beat - self.interval
+        self._last_beat = now
+        if metrics.enabled:
+            metrics.observe("wol_event_loop_lag_seconds", max(0.0, lag))
+        started = self._stall_started
+        if started is not None:
+            self._stall_started = None
+            self._log().warning("takılma bitti: %.0f ms", (now - started) * 1000)
+
+    def start(self):
+        if self._thread is None:
+            self._last_beat = time.monotonic()
+            self._thread = threading.Thread(target=self._run, name="StallWatchdog", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            last = self._last_beat
+            if self._stall_started is not None:
+                continue
+            late = time.monotonic() - last - self.interval
+            if late > self.threshold:
+                self._stall_started = last + self.interval
+                self._capture(late)
+
+    def _capture(self, late):
+        frame = sys._current_frames().get(self._main_id)
+        frames = traceback.extract_stack(frame) if frame is not None else []
+        self.stalls += 1
+        if metrics.enabled:
+            metrics.inc("wol_event_loop_stalls_total")
+        self._log().warning("event loop %.0f ms takıldı, işleyici: %s\n%s", late * 1000, _handler_name(frames),
+                            "".join(traceback.format_list(frames)).rstrip())
+
+
+class SessionProfiler:
+    """ --profile: oturumu cProfile ile çalıştırır, çıkışta rapor yazar """
+
+    def __init__(self, path, top=30):
+        import cProfile
+        self.path = path
+        self.top = top
+        self._profile = cProfile.Profile()
+
+    def start(self):
+        self._profile.enable()
+
+    def stop(self, stream=None):
+        import pstats
+        self._profile.disable()
+        self._profile.dump_stats(self.path)
+        stream = stream or sys.stderr
+        print(f"Profil kaydedildi: {self.path} (python -m pstats {self.path})", file=stream)
+        pstats.Stats(self._profile, stream=stream).sort_stats("cumulative").print_stats(self.top)
@@ -0,0 +1,368 @@
+import json
+import os
+import sqlite3
+import threading
+
+from devices import Device, PausedGC, ensure_device_ids, persistent_fields
+from persistence import WriteBehind, atomic_write_json, DEFAULT_WINDOW, DEFAULT_FSYNC
+
+# Cihaz kaydında ayrı sütunu olan alanlar; diğerleri "extra" içinde JSON olarak saklanır
+_COLUMNS = ("id", "name", "mac")
+
+DEVICES_JSON = "wake_on_lan_devices.json"
+DEVICES_DB = "wake_on_lan_devices.db"
+
+# fsync politikasının SQLite karşılığı
+_SQLITE_SYNCHRONOUS = {"none": "OFF", "file": "NORMAL", "full": "FULL"}
+
+
+class StorageError(Exception):
+    """ Cihaz deposu okunamadı veya yazılamadı """
+
+
+def _read_json_devices(path):
+    """ JSON cihaz listesini okur ve kimliği olmayan kayıtlara kimlik verir: (liste, kimlik verildi mi) """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            devices = json.load(f)
+    except (OSError, ValueError) as e:
+        raise StorageError(f"{path}: {e}") from e
+    if not isinstance(devices, list) or not all(isinstance(d, dict) for d in devices):
+        raise StorageError(f"{path}: beklenmeyen içerik")
+    return devices, ensure_device_ids(devices)
+
+
+class DeviceStore:
+    """ Depolama arka uçlarının ortak arayüzü """
+
+    def load_all(self):
+        raise NotImplementedError
+
+    def upsert_many(self, devices):
+        raise NotImplementedError
+
+    def delete_many(self, device_ids):
+        raise NotImplementedError
+
+    def replace_all(self, devices):
+        raise NotImplementedError
+
+    def apply_changes(self, upserts=(), deletes=()):
+        if upserts:
+            self.upsert_many(upserts)
+        if deletes:
+            self.delete_many(deletes)
+
+    def changed_externally(self):
+        """ Son okumadan beri başka bir süreç (CLI, daemon) depoya yazdıysa True """
+        return False
+
+    def upsert(self, device):
+        self.upsert_many([device])
+
+    def delete(self, device_id):
+        self.delete_many([device_id])
+
+    def close(self):
+        pass
+
+
+class JsonDeviceStore(DeviceStore):
+    """ Eski biçim: tüm liste her değişiklikte tek bir JSON dosyasına yazılır """
+
+    def __init__(self, path, fsync=DEFAULT_FSYNC):
+        self.path = path
+        self.fsync = fsync
+        self._devices = {}
+        self._lock = threading.Lock()
+        # Son okunan veya yazılan dosyanın değişiklik zamanı (ns)
+        self._mtime = None
+
+    def _stat(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return 0
+
+    def changed_externally(self):
+        return self._mtime is not None and self._stat() != self._mtime
+
+    def load_all(self):
+        # Okumadan önce alınır; okuma sırasında gelen yazma sonraki kontrolde fark edilir
+        self._mtime = self._stat()
+        if not os.path.exists(self.path):
+            return []
+        devices, assigned = _read_json_devices(self.path)
+        with self._lock:
+            # Kimlikler anahtar olmadan önce verilir; kimliksiz kayıtlar tek anahtarda birleşmez
+            self._devices = {d["id"]: dict(d) for d in devices}
+            if assigned:
+                try:
+                    self._write()
+                except StorageError:
+                    # Dosya yazılamıyorsa kimlikler ilk değişiklikle birlikte yazılır
+                    pass
+        return devices
+
+    def _write(self):
+        try:
+            # Yarıda kalan yazma eski dosyayı bozmaz
+            atomic_write_json(self.path, list(self._devices.values()), fsync=self.fsync)
+        except OSError as e:
+            raise StorageError(f"{self.path}: {e}") from e
+        self._mtime = self._stat()
+
+    def apply_changes(self, upserts=(), deletes=()):
+        # Tüm değişiklikler için dosya bir kez yazılır
+        with self._lock:
+            for device in upserts:
+                self._devices[device.get("id")] = persistent_fields(device)
+            for device_id in deletes:
+                self._devices.pop(device_id, None)
+            self._write()
+
+    def upsert_many(self, devices):
+        with self._lock:
+            for device in devices:
+                self._devices[device.get("id")] = persistent_fields(device)
+            self._write()
+
+    def delete_many(self, device_ids):
+        with self._lock:
+            for device_id in device_ids:
+                self._devices.pop(device_id, None)
+            self._write()
+
+    def replace_all(self, devices):
+        with self._lock:
+            self._devices = {d.get("id"): persistent_fields(d) for d in devices}
+            self._write()
+
+
+class SqliteDeviceStore(DeviceStore):
+    """ Her cihaz ayrı satır; ekleme/silme/güncelleme tek satırlık işlemlerdir """
+
+    def __init__(self, path, legacy_json_path=None, fsync=DEFAULT_FSYNC):
+        self.path = path
+        # Yazmalar worker thread'inden gelir; bağlantıyı kilitle paylaş
+        self._lock = threading.Lock()
+        # Son okumadaki PRAGMA data_version değeri
+        self._data_version = None
+        try:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(f"PRAGMA synchronous={_SQLITE_SYNCHRONOUS.get(fsync, 'NORMAL')}")
+            with self._conn:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS devices ("
+                    "id TEXT PRIMARY KEY, name TEXT NOT NULL, mac TEXT NOT NULL, extra TEXT)")
+                self._conn.execute("CREATE INDEX IF NOT EXISTS idx_devices_mac ON devices(mac)")
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_devices_name ON devices(name COLLATE NOCASE)")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        except sqlite3.Error as e:
+            raise StorageError(f"{path}: {e}") from e
+
+        if legacy_json_path:
+            self._import_legacy(legacy_json_path)
+
+    def _import_legacy(self, json_path):
+        # Eski JSON listesi sadece bir kez içe aktarılır; dosyaya dokunulmaz
+        if self._meta("legacy_imported") or not os.path.exists(json_path):
+            return
+        devices = _read_json_devices(json_path)[0]
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.executemany(self._UPSERT, [self._row(d) for d in devices])
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO meta (key, value) VALUES ('legacy_imported', ?)",
+                        (json_path,))
+            except sqlite3.Error as e:
+                raise StorageError(f"{self.path}: {e}") from e
+
+    def _meta(self, key):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    _UPSERT = ("INSERT INTO devices (id, name, mac, extra) VALUES (?, ?, ?, ?) "
+               "ON CONFLICT(id) DO UPDATE SET name = excluded.name, mac = excluded.mac, "
+               "extra = excluded.extra")
+
+    @staticmethod
+    def _row(device):
+        extra = {k: v for k, v in persistent_fields(device).items() if k not in _COLUMNS}
+        return (device.get("id"), device.get("name", ""), device.get("mac", ""),
+                json.dumps(extra, ensure_ascii=False) if extra else None)
+
+    @staticmethod
+    def _device(row):
+        # Ara sözlük oluşturmadan doğrudan sıkıştırılmış kayıt
+        if row[3]:
+            return Device(row[0], row[1], row[2], **json.loads(row[3]))
+        return Device(row[0], row[1], row[2])
+
+    def changed_externally(self):
+        # data_version sadece başka bağlantıların işlemleriyle değişir
+        if self._data_version is None:
+            return False
+        with self._lock:
+            try:
+                return self._conn.execute("PRAGMA data_version").fetchone()[0] != self._data_version
+            except sqlite3.Error as e:
+                raise StorageError(f"{self.path}: {e}") from e
+
+    def load_all(self):
+        with self._lock, PausedGC():
+            try:
+                self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+                rows = self._conn.execute("SELECT id, name, mac, extra FROM devices").fetchall()
+            except sqlite3.Error as e:
+                raise StorageError(f"{self.path}: {e}") from e
+            return [self._device(row) for row in rows]
+
+    def upsert_many(self, devices):
+        rows = [self._row(d) for d in devices]
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.executemany(self._UPSERT, rows)
+            except sqlite3.Error as e:
+                raise StorageError(f"{self.path}: {e}") from e
+
+    def delete_many(self, device_ids):
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.executemany("DELETE FROM devices WHERE id = ?",
+                                           [(device_id,) for device_id in device_ids])
+            except sqlite3.Error as e:
+                raise StorageError(f"{self.path}: {e}") from e
+
+    def apply_changes(self, upserts=(), deletes=()):
+        # Eklemeler ve silmeler tek bir işlemde yazılır
+        rows = [self._row(d) for d in upserts]
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.executemany(self._UPSERT, rows)
+                    self._conn.executemany("DELETE FROM devices WHERE id = ?",
+                                           [(device_id,) for device_id in deletes])
+            except sqlite3.Error as e:
+                raise StorageError(f"{self.path}: {e}") from e
+
+    def replace_all(self, devices):
+        rows = [self._row(d) for d in devices]
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.execute("DELETE FROM devices")
+                    self._conn.executemany(self._UPSERT, rows)
+            except sqlite3.Error as e:
+                raise StorageError(f"{self.path}: {e}") from e
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class DeferredDeviceStore(WriteBehind, DeviceStore):
+    """ Başka bir deponun önünde durur; ardışık değişiklikleri birleştirip arka planda yazar """
+
+    def __init__(self, store, window=DEFAULT_WINDOW, on_error=None):
+        WriteBehind.__init__(self, window, on_error)
+        self.store = store
+
+    def load_all(self):
+        self.flush()
+        return self.store.load_all()
+
+    def apply_changes(self, upserts=(), deletes=()):
+        self._submit(("changes", [persistent_fields(d) for d in upserts], list(deletes)))
+
+    def changed_externally(self):
+        return self.store.changed_externally()
+
+    def upsert_many(self, devices):
+        self.apply_changes(upserts=devices)
+
+    def delete_many(self, device_ids):
+        self.apply_changes(deletes=device_ids)
+
+    def replace_all(self, devices):
+        self._submit(("replace", [persistent_fields(d) for d in devices], []))
+
+    def _merge(self, pending, change):
+        kind, devices, deletes = change
+        if pending is None or kind == "replace":
+            pending = {"replace": None, "upserts": {}, "deletes": set()}
+        if kind == "replace":
+            pending["replace"] = {d.get("id"): d for d in devices}
+            return pending
+
+        if pending["replace"] is not None:
+            # Bekleyen tam yazma varsa değişiklikleri doğrudan ona uygula
+            for device in devices:
+                pending["replace"][device.get("id")] = device
+            for device_id in deletes:
+                pending["replace"].pop(device_id, None)
+            return pending
+
+        for device in devices:
+            pending["deletes"].discard(device.get("id"))
+            pending["upserts"][device.get("id")] = device
+        for device_id in deletes:
+            pending["upserts"].pop(device_id, None)
+            pending["deletes"].add(device_id)
+        return pending
+
+    def _requeue(self, failed, pending):
+        if pending is None:
+            return failed
+        if pending["replace"] is not None:
+            # Yeni tam yazma eskisini kapsar
+            return pending
+        return self._merge(failed, ("changes", list(pending["upserts"].values()), list(pending["deletes"])))
+
+    def _write(self, pending):
+        if pending["replace"] is not None:
+            self.store.replace_all(list(pending["replace"].values()))
+        else:
+            self.store.apply_changes(list(pending["upserts"].values()), list(pending["deletes"]))
+
+    def close(self):
+        WriteBehind.close(self)
+        self.store.close()
+
+
+def open_store(kind="sqlite", directory=None, window=DEFAULT_WINDOW, fsync=DEFAULT_FSYNC, on_error=None):
+    """ Ayarlardaki arka uca göre cihaz deposunu açar; window > 0 ise yazmalar birleştirilir """
+    directory = directory or os.path.expanduser('~')
+    json_path = os.path.join(directory, DEVICES_JSON)
+    if kind == "json":
+        store = JsonDeviceStore(json_path, fsync=fsync)
+    else:
+        store = SqliteDeviceStore(os.path.join(directory, DEVICES_DB), legacy_json_path=json_path,
+                                  fsync=fsync)
+    if window and window > 0:
+        return DeferredDeviceStore(store, window, on_error)
+    return store
+
+
+def store_paths(kind="sqlite", directory=None):
+    """ Başka süreçler yazınca değişen depo dosyaları """
+    directory = directory or os.path.expanduser('~')
+    names = (DEVICES_JSON,) if kind == "json" else (DEVICES_DB, DEVICES_DB + "-wal")
+    return [os.path.join(directory, name) for name in names]
+
+
+def store_mtime(kind="sqlite", directory=None):
+    """ Depo dosyalarının son değişiklik zamanı (ns); başka süreçlerin yazdığını fark etmek için """
+    mtimes = []
+    for path in store_paths(kind, directory):
+        try:
+            mtimes.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            pass
+    return max(mtimes, default=0)
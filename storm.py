@@ -0,0 +1,172 @@
+import asyncio
+import time
+
+# Varsayılan hız sınırları: saniyede paket ve saniyede uyandırılan cihaz
+DEFAULT_PACKETS_PER_SEC = 1000.0
+DEFAULT_HOSTS_PER_SEC = 100.0
+# Farklı gruplar (raf/sigorta hattı) arasındaki bekleme (saniye)
+DEFAULT_GROUP_STAGGER = 5.0
+# Öncelik verilmemiş cihazların önceliği (küçük sayı önce uyanır)
+DEFAULT_PRIORITY = 100
+
+# İlerleme bildirimleri arasındaki en kısa süre
+PROGRESS_INTERVAL = 0.1
+
+
+class TokenBucket:
+    """ Saniyede rate jeton üretir, en fazla burst jeton biriktirir; rate <= 0 sınırsızdır
+
+    Jetonlar geçen süreye göre hesaplanır; uyku süreleri birikmediği için uzun
+    çalışmalarda hız hedeften kaymaz.
+    """
+
+    def __init__(self, rate, burst=None, clock=time.monotonic):
+        self.rate = float(rate or 0)
+        # Varsayılan kapasite ~20 ms'lik jeton: toplu gönderime izin verir, patlama yapmaz
+        self.burst = float(burst) if burst else max(1.0, self.rate / 50)
+        self.clock = clock
+        self.tokens = self.burst
+        self._updated = clock()
+
+    @property
+    def unlimited(self):
+        return self.rate <= 0
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def available(self):
+        if self.unlimited:
+            return float("inf")
+        self._refill()
+        return self.tokens
+
+    def consume(self, count):
+        if not self.unlimited:
+            self._refill()
+            self.tokens -= count
+
+    def wait_time(self, count=1):
+        """ count jeton birikene kadar geçecek süre """
+        if self.unlimited:
+            return 0.0
+        self._refill()
+        return max(0.0, (min(count, self.burst) - self.tokens) / self.rate)
+
+
+def plan_storm(devices, group_key="group", priority_key="priority", group_stagger=DEFAULT_GROUP_STAGGER):
+    """ Cihazları gruplara ayırır ve gönderim sırasını belirler
+
+    Dönüş: [(en erken başlangıç saniyesi, cihaz)] listesi. Gruplar en öncelikli üyelerine göre
+    sıralanır; her grup bir öncekinden group_stagger saniye sonra başlar.
+    """
+    groups = {}
+    for device in devices:
+        groups.setdefault(device.get(group_key) or "", []).append(device)
+
+    def priority(device):
+        try:
+            return int(device.get(priority_key, DEFAULT_PRIORITY))
+        except (TypeError, ValueError):
+            return DEFAULT_PRIORITY
+
+    ordered = sorted(groups.items(), key=lambda item: (min(priority(d) for d in item[1]), item[0]))
+    plan = []
+    for index, (_, members) in enumerate(ordered):
+        members.sort(key=priority)
+        offset = index * group_stagger
+        plan.extend((offset, device) for device in members)
+    return plan
+
+
+class WakeStorm:
+    """ Toplu uyandırmayı hız sınırları ve grup aralıklarıyla yayarak gönderir """
+
+    def __init__(self, engine, packets_per_sec=DEFAULT_PACKETS_PER_SEC, hosts_per_sec=DEFAULT_HOSTS_PER_SEC,
+                 group_stagger=DEFAULT_GROUP_STAGGER, repeat=1, group_key="group", priority_key="priority"):
+        self.engine = engine
+        # Her cihaza gönderilen paket sayısı (kayıp ağlarda güvenilirlik için)
+        self.repeat = max(1, int(repeat))
+        self.packets = TokenBucket(packets_per_sec)
+        if self.packets.burst < self.repeat:
+            # Bir cihazın tüm paketleri aynı partide gider; kapasite daha küçükse hiç gönderilemez
+            self.packets.burst = self.packets.tokens = float(self.repeat)
+        self.hosts = TokenBucket(hosts_per_sec)
+        self.group_stagger = group_stagger
+        self.group_key = group_key
+        self.priority_key = priority_key
+        self.total = 0
+        self.sent = 0
+        self.failed = 0
+        self.started = None
+
+    def eta(self):
+        """ Kalan süre tahmini (saniye) """
+        remaining = self.total - self.sent - self.failed
+        if remaining <= 0 or self.started is None:
+            return 0.0
+        rates = [bucket.rate / need for bucket, need in ((self.hosts, 1), (self.packets, self.repeat))
+                 if not bucket.unlimited]
+        elapsed = time.monotonic() - self.started
+        done = self.sent + self.failed
+        if done and elapsed > 0.5:
+            # Gözlenen hız grup beklemelerini de içerir
+            rates.append(done / elapsed)
+        rate = min(rates) if rates else 0.0
+        return remaining / rate if rate > 0 else 0.0
+
+    def _batch_size(self):
+        size = min(self.hosts.available(), self.packets.available() // self.repeat)
+        return int(size) if size != float("inf") else None
+
+    async def run(self, devices, on_batch=None, on_progress=None):
+        """ İptal edilirse CancelledError yükselir; o ana kadarki sayaçlar nesnede kalır """
+        plan = plan_storm(devices, self.group_key, self.priority_key, self.group_stagger)
+        self.total = len(plan)
+        self.sent = self.failed = 0
+        self.started = start = time.monotonic()
+        reported = 0.0
+        position = 0
+
+        while position < len(plan):
+            now = time.monotonic()
+            # Sırası gelmiş (grup beklemesi dolmuş) cihazlar
+            ready = position
+            while ready < len(plan) and start + plan[ready][0] <= now:
+                ready += 1
+            if ready == position:
+                await asyncio.sleep(start + plan[position][0] - now)
+                continue
+
+            size = self._batch_size()
+            if size is not None and size < 1:
+                await asyncio.sleep(max(self.hosts.wait_time(1), self.packets.wait_time(self.repeat), 0.001))
+                continue
+            end = ready if size is None else min(ready, position + size)
+            batch = [device for _, device in plan[position:end]]
+            position = end
+
+            self.hosts.consume(len(batch))
+            self.packets.consume(len(batch) * self.repeat)
+            report = self.engine.wake_devices(batch)
+            for _ in range(self.repeat - 1):
+                # Herhangi bir tekrarda başarısız olan cihaz (ilk hatasıyla) başarısız sayılır
+                again = self.engine.wake_devices(batch)
+                for index, error in again.errors.items():
+                    report.errors.setdefault(index, error)
+                report.elapsed += again.elapsed
+            self.sent += report.sent
+            self.failed += report.failed
+            if on_batch:
+                on_batch(report.results)
+
+            now = time.monotonic()
+            if on_progress and (now - reported >= PROGRESS_INTERVAL or position == len(plan)):
+                reported = now
+                on_progress(self.sent + self.failed, self.total, self.eta())
+            # Diğer görevlere (iptal dahil) sıra ver
+            await asyncio.sleep(0)
+
+        return self.sent, self.failed, time.monotonic() - start
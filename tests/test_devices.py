@@ -0,0 +1,138 @@
+import pytest
+
+from devices import MAC_MAX, DeviceCollection, InvalidMacError, parse_mac
+
+
+@pytest.mark.parametrize("text, value", [
+    ("aa:bb:cc:dd:ee:ff", 0xAABBCCDDEEFF),
+    ("AA-BB-CC-DD-EE-FF", 0xAABBCCDDEEFF),
+    ("aabb.ccdd.eeff", 0xAABBCCDDEEFF),
+    ("aabb-ccdd-eeff", 0xAABBCCDDEEFF),
+    ("aabb:ccdd:eeff", 0xAABBCCDDEEFF),
+    ("AaBbCcDdEeFf", 0xAABBCCDDEEFF),
+    ("  00:11:22:33:44:55\n", 0x001122334455),
+    ("000000000000", 0),
+    (0x001122334455, 0x001122334455),
+    (MAC_MAX, MAC_MAX),
+])
+def test_parse_mac_accepts(text, value):
+    assert parse_mac(text) == value
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "aa:bb:cc:dd:ee",
+    "aa:bb:cc:dd:ee:ff:00",
+    "aa:bb-cc:dd:ee:ff",
+    "aabb.ccdd-eeff",
+    "aa.bb.cc.dd.ee.ff",
+    "aabbccddeef",
+    "aabbccddeeff0",
+    "gg:bb:cc:dd:ee:ff",
+    "aa bb cc dd ee ff",
+    None,
+    -1,
+    MAC_MAX + 1,
+])
+def test_parse_mac_rejects(text):
+    with pytest.raises(InvalidMacError):
+        parse_mac(text)
+
+
+class Recorder:
+    """ Koleksiyon bildirimlerini sırayla kaydeder """
+
+    def __init__(self):
+        self.events = []
+
+    def __getattr__(self, event):
+        return lambda *args: self.events.append((event, args[0]) if args else (event,))
+
+
+def make(*names):
+    collection = DeviceCollection(
+        {"id": name, "name": name, "mac": f"00:00:00:00:00:{i:02x}"} for i, name in enumerate(names))
+    recorder = Recorder()
+    collection.subscribe(recorder)
+    return collection, recorder
+
+
+def names(collection):
+    return [device["name"] for device in collection]
+
+
+@pytest.mark.parametrize("existing, added, row", [
+    ((), "a", 0),
+    (("b", "d"), "a", 0),
+    (("b", "d"), "c", 1),
+    (("b", "d"), "e", 2),
+    # Sıralama büyük/küçük harf duyarsızdır
+    (("alpha", "Charlie"), "bravo", 1),
+    (("alpha", "Charlie"), "DELTA", 2),
+    # Aynı isim mevcut kayıtların arkasına eklenir
+    (("b", "b", "c"), "B", 2),
+])
+def test_insert_keeps_sorted_order(existing, added, row):
+    collection, recorder = make(*existing)
+    assert collection.add({"id": "new", "name": added, "mac": "00:11:22:33:44:55"}) == row
+    assert collection[row]["id"] == "new"
+    keys = [name.casefold() for name in names(collection)]
+    assert keys == sorted(keys)
+    assert recorder.events == [("begin_insert", row), ("end_insert", row)]
+    assert collection.index_of("new") == row
+    assert collection.has_mac("00-11-22-33-44-55")
+
+
+@pytest.mark.parametrize("renamed, new_name, order, events", [
+    # Aynı yerde kalır: taşıma bildirilmez
+    ("b", "bb", ["a", "bb", "c", "d"], [("updated", 1)]),
+    ("b", "B", ["a", "B", "c", "d"], [("updated", 1)]),
+    # Aşağı ve yukarı taşıma
+    ("a", "cc", ["b", "c", "cc", "d"], [("begin_move", 0), ("end_move", 0), ("updated", 2)]),
+    ("d", "0", ["0", "a", "b", "c"], [("begin_move", 3), ("end_move", 3), ("updated", 0)]),
+    ("a", "z", ["b", "c", "d", "z"], [("begin_move", 0), ("end_move", 0), ("updated", 3)]),
+    # Eşit isimli kaydın arkasına geçer
+    ("a", "c", ["b", "c", "c", "d"], [("begin_move", 0), ("end_move", 0), ("updated", 2)]),
+])
+def test_rename_moves_to_sorted_row(renamed, new_name, order, events):
+    collection, recorder = make("a", "b", "c", "d")
+    row = collection.update(renamed, name=new_name)
+    assert names(collection) == order
+    assert collection[row]["id"] == renamed
+    assert collection.index_of(renamed) == row
+    assert recorder.events == events
+    assert [collection.index_of(device["id"]) for device in collection] == list(range(4))
+
+
+@pytest.mark.parametrize("removed, row, order", [
+    ("a", 0, ["b", "c"]),
+    ("b", 1, ["a", "c"]),
+    ("c", 2, ["a", "b"]),
+])
+def test_remove_shifts_rows(removed, row, order):
+    collection, recorder = make("c", "a", "b")
+    device = collection.remove(removed)
+    assert device["id"] == removed
+    assert names(collection) == order
+    assert recorder.events == [("begin_remove", row), ("end_remove", row)]
+    assert collection.get(removed) is None
+    assert collection.index_of(removed) == -1
+    assert not collection.has_mac(device["mac"])
+    assert [collection.index_of(name) for name in order] == [0, 1]
+
+
+def test_remove_unknown_id_is_ignored():
+    collection, recorder = make("a")
+    assert collection.remove("missing") is None
+    assert collection.update("missing", name="x") == -1
+    assert recorder.events == []
+    assert names(collection) == ["a"]
+
+
+def test_duplicate_macs_are_indexed_separately():
+    collection, _ = make("a", "b")
+    collection.update("b", mac="00:00:00:00:00:00")
+    assert sorted(device["id"] for device in collection.find_mac("000000000000")) == ["a", "b"]
+    collection.remove("a")
+    assert [device["id"] for device in collection.find_mac("00:00:00:00:00:00")] == ["b"]
+    assert not collection.has_mac("00:00:00:00:00:01")
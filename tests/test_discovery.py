@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from discovery import ArpCache, DiscoveryScanner, FakeNetworkProber, Host, Prober
+
+HOSTS = {"10.0.0.2": "00:11:22:33:44:02", "10.0.0.5": "00:11:22:33:44:05"}
+
+
+def make_scanner(prober, **kwargs):
+    # Sistemin ARP tablosu okunmaz
+    return DiscoveryScanner([prober], arp_cache=ArpCache(reader=dict), **kwargs)
+
+
+def run_scan(scanner, networks):
+    found, progress = [], []
+    hosts = asyncio.run(scanner.scan(networks, found.append, lambda *args: progress.append(args)))
+    return hosts, found, progress
+
+
+def test_scan_finds_fake_hosts():
+    hosts, found, _ = run_scan(make_scanner(FakeNetworkProber(HOSTS, hostnames={"10.0.0.5": "nas"})),
+                               ["10.0.0.0/29"])
+    assert sorted(host.ip for host in hosts) == ["10.0.0.2", "10.0.0.5"]
+    # Her cihaz bulunduğu anda da bildirilir
+    assert sorted(host.ip for host in found) == ["10.0.0.2", "10.0.0.5"]
+    by_ip = {host.ip: host for host in hosts}
+    assert by_ip["10.0.0.2"].mac == 0x001122334402
+    assert by_ip["10.0.0.5"].hostname == "nas"
+    assert all(host.prober == "fake" for host in hosts)
+
+
+def test_scan_reports_progress_counts():
+    _, _, progress = run_scan(make_scanner(FakeNetworkProber(HOSTS), concurrency=2),
+                              ["10.0.0.0/29", "10.0.0.9/32"])
+    # /29: ağ ve broadcast hariç 6 adres, /32: tek adres
+    assert progress[-1] == (7, 7, 2)
+    done = [count for count, _, _ in progress]
+    assert done == sorted(done)
+    assert all(total == 7 for _, total, _ in progress)
+
+
+def test_scan_without_hosts():
+    hosts, found, progress = run_scan(make_scanner(FakeNetworkProber({})), ["192.168.1.0/30"])
+    assert hosts == [] and found == []
+    assert progress[-1] == (2, 2, 0)
+
+
+def test_missing_mac_is_read_from_arp_cache():
+    class NoMacProber(Prober):
+        async def probe(self, ip, timeout):
+            return Host(ip) if ip == "10.0.0.1" else None
+
+    cache = ArpCache(reader=lambda: {"10.0.0.1": 0x0000AABBCCDD})
+    hosts = asyncio.run(DiscoveryScanner([NoMacProber()], arp_cache=cache).scan(["10.0.0.0/30"]))
+    assert [(host.ip, host.mac) for host in hosts] == [("10.0.0.1", 0x0000AABBCCDD)]
+
+
+def test_scan_cancellation_stops_workers():
+    hosts = {f"10.1.0.{i}": f"00:11:22:33:55:{i:02x}" for i in range(1, 255)}
+    scanner = make_scanner(FakeNetworkProber(hosts, latency=0.01), concurrency=4)
+    found, progress = [], []
+
+    async def main():
+        task = asyncio.ensure_future(scanner.scan(["10.1.0.0/24"], found.append,
+                                                  lambda *args: progress.append(args)))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # İptalden sonra çalışmaya devam eden işçi kalmaz
+        await asyncio.sleep(0.05)
+        remaining = len(found)
+        await asyncio.sleep(0.05)
+        return remaining, [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+    remaining, tasks = asyncio.run(main())
+    assert tasks == []
+    assert 0 < remaining < 254
+    assert len(found) == remaining
+    assert all(count < 254 for count, _, _ in progress)
@@ -0,0 +1,111 @@
+import os
+
+import pytest
+
+from devices import DeviceCollection
+from importers import detect_format, iter_records, plan_import
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def record(mac, ip="", name="", **route):
+    return dict({"mac": mac, "ip": ip, "name": name}, **route)
+
+
+# Geçersiz MAC'li satırlar None olarak gelir; MAC'siz veya tamamlanmamış kayıtlar hiç gelmez
+CASES = [
+    ("nmap.xml", "nmap", [
+        record(0xAABBCC000001, "192.168.1.1", "router.lan"),
+        record(0xAABBCC000003, "192.168.1.3"),
+        None,
+    ]),
+    ("arp.txt", "arp", [
+        record(0xAABBCC000010, "192.168.1.10"),
+        record(0xAABBCC000012, "192.168.1.12"),
+        None,
+    ]),
+    ("ip-neigh.txt", "ip-neigh", [
+        record(0xAABBCC000020, "192.168.1.20"),
+        record(0xAABBCC000022, "fe80::1"),
+        None,
+    ]),
+    ("dhcpd.leases", "isc-leases", [
+        record(0xAABBCC000030, "192.168.1.30", "laptop"),
+        record(0xAABBCC000031, "192.168.1.31"),
+        record(0xAABBCC000030, "192.168.1.32", "laptop"),
+        None,
+    ]),
+    ("dnsmasq.leases", "dnsmasq", [
+        record(0xAABBCC000040, "192.168.1.40", "printer"),
+        record(0xAABBCC000041, "192.168.1.41"),
+        None,
+    ]),
+    ("devices.csv", "csv", [
+        record(0xAABBCC000050, "192.168.1.50", "nas", broadcast="192.168.1.255", broadcast_port=9),
+        record(0xAABBCC000051, "", "desk"),
+        None,
+        None,
+    ]),
+]
+
+
+@pytest.mark.parametrize("name, fmt, expected", CASES)
+def test_reader_records(name, fmt, expected):
+    assert list(iter_records(os.path.join(FIXTURES, name), fmt)) == expected
+
+
+@pytest.mark.parametrize("name, fmt, expected", CASES)
+def test_detect_format(name, fmt, expected):
+    path = os.path.join(FIXTURES, name)
+    assert detect_format(path) == fmt
+    assert list(iter_records(path)) == expected
+
+
+@pytest.mark.parametrize("name, added, skipped", [
+    ("nmap.xml", 2, 1),
+    ("arp.txt", 2, 1),
+    ("ip-neigh.txt", 2, 1),
+    # Aynı MAC'in ikinci kirası yeni cihaz değildir
+    ("dhcpd.leases", 2, 2),
+    ("dnsmasq.leases", 2, 1),
+    ("devices.csv", 2, 2),
+])
+def test_plan_into_empty_inventory(name, added, skipped):
+    devices, updates, skip_count = plan_import(iter_records(os.path.join(FIXTURES, name)), DeviceCollection())
+    assert len(devices) == added
+    assert updates == {}
+    assert skip_count == skipped
+
+
+def test_plan_keeps_last_lease_and_names():
+    devices, _, _ = plan_import(iter_records(os.path.join(FIXTURES, "dhcpd.leases")), DeviceCollection())
+    by_mac = {device["mac"]: device for device in devices}
+    assert by_mac["AA:BB:CC:00:00:30"]["ip"] == "192.168.1.32"
+    assert by_mac["AA:BB:CC:00:00:30"]["name"] == "laptop"
+    # İsimsiz kayıt IP ile adlandırılır
+    assert by_mac["AA:BB:CC:00:00:31"]["name"] == "192.168.1.31"
+
+
+def test_plan_against_inventory():
+    collection = DeviceCollection([
+        {"id": "router", "name": "router", "mac": "aa:bb:cc:00:00:01", "ip": "192.168.1.254"},
+        {"id": "host3", "name": "host3", "mac": "AABBCC000003", "ip": "192.168.1.3"},
+    ])
+    # Worker thread'inde kullanılan anlık kopya da aynı sonucu verir
+    for inventory in (collection, collection.mac_snapshot()):
+        devices, updates, skipped = plan_import(iter_records(os.path.join(FIXTURES, "nmap.xml")), inventory)
+        assert devices == []
+        assert updates == {"router": {"ip": "192.168.1.1"}}
+        # Değişmeyen host3 ve MAC'siz satır
+        assert skipped == 2
+
+
+def test_plan_csv_routes():
+    devices, _, _ = plan_import(iter_records(os.path.join(FIXTURES, "devices.csv")), DeviceCollection())
+    nas = next(device for device in devices if device["name"] == "nas")
+    assert nas["broadcast"] == "192.168.1.255"
+    assert nas["broadcast_port"] == 9
+    assert nas["ip"] == "192.168.1.50"
+    desk = next(device for device in devices if device["name"] == "desk")
+    assert desk["mac"] == "AA:BB:CC:00:00:51"
+    assert "ip" not in desk and "broadcast" not in desk
@@ -0,0 +1,107 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from scheduler import Cron
+
+UTC = timezone.utc
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=UTC).timestamp()
+
+
+@pytest.mark.parametrize("expression, after, expected", [
+    # Sadece ayın günü
+    ("0 9 15 * *", utc(2024, 1, 20, 12, 0), utc(2024, 2, 15, 9, 0)),
+    ("0 9 15 * *", utc(2024, 2, 15, 8, 59), utc(2024, 2, 15, 9, 0)),
+    # Sadece haftanın günü (1 = pazartesi, 0 ve 7 = pazar)
+    ("0 9 * * 1", utc(2024, 1, 3, 0, 0), utc(2024, 1, 8, 9, 0)),
+    ("0 0 * * 7", utc(2024, 1, 1, 0, 0), utc(2024, 1, 7, 0, 0)),
+    ("0 0 * * 0", utc(2024, 1, 1, 0, 0), utc(2024, 1, 7, 0, 0)),
+    ("0 8 * jan-mar mon-fri", utc(2024, 3, 29, 8, 0), utc(2025, 1, 1, 8, 0)),
+    # İki gün alanı da kısıtlıysa biri eşleşmesi yeter: 13'ü veya cuma
+    ("0 9 13 * 5", utc(2024, 10, 5, 0, 0), utc(2024, 10, 11, 9, 0)),
+    ("0 9 13 * 5", utc(2024, 10, 11, 9, 0), utc(2024, 10, 13, 9, 0)),
+    ("0 9 13 * 5", utc(2024, 10, 13, 9, 0), utc(2024, 10, 18, 9, 0)),
+    ("0 9 1-7 * 1", utc(2024, 10, 8, 0, 0), utc(2024, 10, 14, 9, 0)),
+    # Gün alanlarından biri * ise diğeri eşleşmeli
+    ("0 9 13 * *", utc(2024, 10, 5, 0, 0), utc(2024, 10, 13, 9, 0)),
+    ("0 9 * * 5", utc(2024, 10, 12, 0, 0), utc(2024, 10, 18, 9, 0)),
+])
+def test_day_fields(expression, after, expected):
+    assert Cron(expression).next_after(after, UTC) == expected
+
+
+@pytest.mark.parametrize("expression, after, expected", [
+    # Saat, gün, ay ve yıl taşmaları
+    ("*/15 * * * *", utc(2024, 5, 1, 10, 50), utc(2024, 5, 1, 11, 0)),
+    ("0 0 * * *", utc(2024, 5, 31, 23, 59), utc(2024, 6, 1, 0, 0)),
+    ("59 23 31 12 *", utc(2024, 12, 31, 23, 59), utc(2025, 12, 31, 23, 59)),
+    # 31'i olmayan aylar atlanır
+    ("0 0 31 * *", utc(2024, 1, 31, 0, 0), utc(2024, 3, 31, 0, 0)),
+    ("0 0 31 * *", utc(2024, 3, 31, 0, 0), utc(2024, 5, 31, 0, 0)),
+    ("0 12 30 * *", utc(2024, 1, 30, 12, 0), utc(2024, 3, 30, 12, 0)),
+    # Artık yıl
+    ("0 0 29 2 *", utc(2024, 3, 1, 0, 0), utc(2028, 2, 29, 0, 0)),
+    ("@monthly", utc(2024, 12, 15, 0, 0), utc(2025, 1, 1, 0, 0)),
+    ("@yearly", utc(2024, 1, 1, 0, 0), utc(2025, 1, 1, 0, 0)),
+])
+def test_rollover(expression, after, expected):
+    assert Cron(expression).next_after(after, UTC) == expected
+
+
+def test_next_is_strictly_after():
+    cron = Cron("30 6 * * *")
+    first = cron.next_after(utc(2024, 5, 1, 6, 29, 30), UTC)
+    assert first == utc(2024, 5, 1, 6, 30)
+    assert cron.next_after(first, UTC) == utc(2024, 5, 2, 6, 30)
+
+
+def test_impossible_date_returns_none():
+    assert Cron("0 0 30 2 *").next_after(utc(2024, 1, 1, 0, 0), UTC) is None
+
+
+@pytest.mark.parametrize("expression", ["", "* * * *", "60 * * * *", "* 24 * * *", "* * 0 * *",
+                                        "* * * 13 *", "* * * * 8", "*/0 * * * *", "5-1 * * * *"])
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        Cron(expression)
+
+
+def runs(expression, after, count, tz):
+    cron = Cron(expression)
+    result = []
+    for _ in range(count):
+        after = cron.next_after(after, tz)
+        result.append(after)
+    return result
+
+
+@pytest.fixture
+def berlin():
+    zoneinfo = pytest.importorskip("zoneinfo")
+    try:
+        return zoneinfo.ZoneInfo("Europe/Berlin")
+    except zoneinfo.ZoneInfoNotFoundError:
+        pytest.skip("tzdata yok")
+
+
+def test_dst_spring_forward(berlin):
+    # 31 Mart 2024: 02:00 CET -> 03:00 CEST; 02:30 hiç gelmez, iş geçişten sonra bir kez çalışır
+    assert runs("30 2 * * *", utc(2024, 3, 30, 12, 0), 2, berlin) == [
+        utc(2024, 3, 31, 1, 30), utc(2024, 4, 1, 0, 30)]
+    # Saatlik iş atlanan saatte iki kez çalışmaz
+    assert runs("0 * * * *", utc(2024, 3, 30, 23, 30), 4, berlin) == [
+        utc(2024, 3, 31, 0, 0), utc(2024, 3, 31, 1, 0), utc(2024, 3, 31, 2, 0), utc(2024, 3, 31, 3, 0)]
+
+
+def test_dst_fall_back(berlin):
+    # 27 Ekim 2024: 03:00 CEST -> 02:00 CET; tekrar eden 02:30 için iş bir kez çalışır
+    assert runs("30 2 * * *", utc(2024, 10, 26, 12, 0), 2, berlin) == [
+        utc(2024, 10, 27, 0, 30), utc(2024, 10, 28, 1, 30)]
+    assert runs("0 * * * *", utc(2024, 10, 26, 23, 30), 3, berlin) == [
+        utc(2024, 10, 27, 0, 0), utc(2024, 10, 27, 2, 0), utc(2024, 10, 27, 3, 0)]
+    # Duvar saatine göre her gün aynı saatte
+    assert runs("0 7 * * *", utc(2024, 10, 26, 0, 0), 2, berlin) == [
+        utc(2024, 10, 26, 5, 0), utc(2024, 10, 27, 6, 0)]
@@ -0,0 +1,134 @@
+import pytest
+
+from devices import DeviceCollection
+from search import SearchIndex, query_variants, search_fields
+
+
+def make(count=0, **kwargs):
+    collection = DeviceCollection(
+        {"id": f"d{i}", "name": f"host-{i:03d}", "mac": f"02:00:00:00:{i // 256:02x}:{i % 256:02x}",
+         "ip": f"10.0.{i // 256}.{i % 256}", "group": "rack-a" if i % 2 else "rack-b"}
+        for i in range(count))
+    return collection, SearchIndex(collection, **kwargs)
+
+
+def expected(collection, query):
+    """ Dizinsiz karşılaştırma: her parça (veya MAC hali) bir alanın içinde geçmeli """
+    tokens = query.casefold().split()
+
+    def matches(device, token):
+        return any(variant in field for variant in query_variants(token) for field in search_fields(device))
+
+    return [row for row, device in enumerate(collection) if all(matches(device, token) for token in tokens)]
+
+
+def check(collection, index, query):
+    rows = list(index.rows(query))
+    assert rows == expected(collection, query)
+    found = sorted(device["id"] for device in index.search(query))
+    assert found == sorted(collection[row]["id"] for row in rows)
+    return rows
+
+
+QUERIES = ["host", "host-00", "h", "-0", "07", "rack-a", "10.0.0.1", "02:00:00:00:00:0a", "0000000a",
+           "ho 5", "zzz", "k-", "a 1 0"]
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_matches_naive_search(query):
+    collection, index = make(40)
+    index.build()
+    check(collection, index, query)
+
+
+def test_empty_query():
+    _, index = make(3)
+    assert index.search("  ") is None
+    assert index.rows("") is None
+
+
+def test_incremental_add_remove_rename():
+    collection, index = make(20)
+    index.build()
+    generation = index.generation
+
+    collection.add({"id": "new", "name": "Printer Lobby", "mac": "aa:bb:cc:dd:ee:ff", "ip": "10.9.9.9"})
+    assert index.generation > generation
+    assert [collection[row]["id"] for row in check(collection, index, "lobby")] == ["new"]
+    assert [collection[row]["id"] for row in check(collection, index, "aa-bb")] == ["new"]
+
+    collection.update("new", name="Scanner Hall")
+    assert check(collection, index, "lobby") == []
+    assert [collection[row]["id"] for row in check(collection, index, "hall")] == ["new"]
+    # Yeniden sıralanan satırlar da doğru döner
+    check(collection, index, "host")
+    check(collection, index, "a")
+
+    collection.update("d3", ip="192.168.50.3")
+    assert [collection[row]["id"] for row in check(collection, index, "168.50")] == ["d3"]
+    assert check(collection, index, "10.0.0.3") == []
+
+    collection.remove("new")
+    collection.remove("d0")
+    assert check(collection, index, "hall") == []
+    assert check(collection, index, "host-000") == []
+    for query in QUERIES:
+        check(collection, index, query)
+
+
+@pytest.mark.parametrize("query", ["h", "s", "9", "-", "ho", "19", "t-", "ll", "p"])
+def test_queries_shorter_than_a_trigram(query):
+    collection, index = make(25)
+    collection.add({"id": "x", "name": "hall", "mac": "aa:bb:cc:dd:ee:ff"})
+    index.build()
+    # Alanın sonundaki kısa parça (ör. "ll") da bulunur
+    check(collection, index, query)
+
+
+def test_fields_longer_than_256_characters():
+    collection, index = make(5)
+    index.build()
+    name = "x" * 300 + "needle" + "y" * 400
+    collection.add({"id": "long", "name": name, "mac": "aa:bb:cc:dd:ee:ff", "tags": ["t" * 1000 + "end"]})
+    for query in ("needle", "edl", "xne", "yy", "y", "tend", "nd"):
+        assert "long" in [collection[row]["id"] for row in check(collection, index, query)], query
+    # Baştan kurulan dizin de aynı sonucu verir
+    index.build()
+    assert [collection[row]["id"] for row in check(collection, index, "needle")] == ["long"]
+
+
+def test_search_during_partial_build():
+    collection, index = make(50)
+    assert not index.build_step(10)
+    collection.remove("d45")
+    collection.add({"id": "late", "name": "late-host", "mac": "aa:bb:cc:dd:ee:01"})
+    collection.update("d2", name="renamed")
+    # Arama kurulumun kalanını hemen tamamlar
+    for query in ("host", "late", "renamed", "host-045", "host-002"):
+        check(collection, index, query)
+    assert index.ready
+
+
+def test_compaction_goes_through_on_stale():
+    stale = []
+    collection, index = make(20, on_stale=lambda: stale.append(True))
+    index.build()
+    for i in range(1100):
+        collection.update("d1", name=f"churn-{i}")
+    # Boş yuvalar birikince dizin yeniden kurulum için bayat işaretlenir
+    assert stale
+    assert not index.ready
+    while not index.build_step(7):
+        pass
+    assert [collection[row]["id"] for row in check(collection, index, "churn-1099")] == ["d1"]
+    check(collection, index, "host")
+
+
+def test_reset_rebuilds():
+    stale = []
+    collection, index = make(10, on_stale=lambda: stale.append(True))
+    index.build()
+    collection.reset([{"id": "only", "name": "solo", "mac": "aa:bb:cc:dd:ee:ff"}])
+    assert stale == [True]
+    assert [collection[row]["id"] for row in check(collection, index, "sol")] == ["only"]
+    assert check(collection, index, "host") == []
@@ -0,0 +1,104 @@
+from PyQt6.QtGui import QColor, QPalette
+
+# Tema renkleri; renklerin çoğu palette ile, sadece kenarlık/dolgu stil sayfası ile verilir
+THEMES = {
+    "light": {
+        "window": "#ffffff",
+        "text": "#000000",
+        "base": "#ffffff",
+        "alternate": "#f7f7f7",
+        "button": "#e0e0e0",
+        "field": "#f0f0f0",
+        "border": "#cccccc",
+        "highlight": "#e0e0e0",
+        "highlight_text": "#000000",
+        "placeholder": "#888888",
+    },
+    "dark": {
+        "window": "#2b2b2b",
+        "text": "#ffffff",
+        "base": "#3b3b3b",
+        "alternate": "#333333",
+        "button": "#444444",
+        "field": "#444444",
+        "border": "#555555",
+        "highlight": "#555555",
+        "highlight_text": "#ffffff",
+        "placeholder": "#aaaaaa",
+    },
+}
+
+# Sadece palette ile ifade edilemeyen kurallar (kenarlık, dolgu, köşe yuvarlama)
+_STYLESHEET = """
+QPushButton {{ background-color: {button}; border: none; padding: 5px; }}
+QPushButton#add_button, QComboBox, QLineEdit#input_field {{
+    border: 1px solid {border}; border-radius: 3px; padding: 5px;
+}}
+QPushButton#add_button, QComboBox {{ background-color: {field}; }}
+QComboBox::drop-down {{ border: none; }}
+QComboBox::down-arrow {{ image: none; border: none; }}
+QTableView {{ gridline-color: {border}; }}
+QTableView QHeaderView::section {{ background-color: {field}; border: 1px solid {border}; }}
+QFrame#separator {{ color: {border}; }}
+"""
+
+
+def build_palette(colors):
+    palette = QPalette()
+    roles = {
+        QPalette.ColorRole.Window: colors["window"],
+        QPalette.ColorRole.WindowText: colors["text"],
+        QPalette.ColorRole.Base: colors["base"],
+        QPalette.ColorRole.AlternateBase: colors["alternate"],
+        QPalette.ColorRole.Text: colors["text"],
+        QPalette.ColorRole.Button: colors["button"],
+        QPalette.ColorRole.ButtonText: colors["text"],
+        QPalette.ColorRole.Highlight: colors["highlight"],
+        QPalette.ColorRole.HighlightedText: colors["highlight_text"],
+        QPalette.ColorRole.ToolTipBase: colors["base"],
+        QPalette.ColorRole.ToolTipText: colors["text"],
+        QPalette.ColorRole.PlaceholderText: colors["placeholder"],
+        QPalette.ColorRole.Mid: colors["border"],
+    }
+    for role, color in roles.items():
+        palette.setColor(role, QColor(color))
+    return palette
+
+
+class ThemeManager:
+    """ Temaları bir kez QPalette + kısa stil sayfasına derler ve uygulama düzeyinde uygular
+
+    Tema değişince pencereye ayrı stil sayfası verilmez; tablo satırları delegate ile
+    çizildiği için maliyet satır sayısından bağımsızdır.
+    """
+
+    def __init__(self, app, style="Fusion"):
+        self.app = app
+        # Palette'i tam olarak uygulayan platformdan bağımsız stil
+        if style:
+            app.setStyle(style)
+        self.current = None
+        self._palettes = {}
+        self._stylesheets = {}
+
+    def palette(self, name):
+        palette = self._palettes.get(name)
+        if palette is None:
+            palette = self._palettes[name] = build_palette(THEMES[name])
+        return palette
+
+    def stylesheet(self, name):
+        sheet = self._stylesheets.get(name)
+        if sheet is None:
+            sheet = self._stylesheets[name] = _STYLESHEET.format(**THEMES[name])
+        return sheet
+
+    def apply(self, name):
+        """ Tema zaten uygulanmışsa hiçbir şey yapmaz """
+        if name == self.current:
+            return False
+        # Stil sayfası palette'ten sonra verilir; yeniden cilalanan widget'lar yeni renkleri alır
+        self.app.setPalette(self.palette(name))
+        self.app.setStyleSheet(self.stylesheet(name))
+        self.current = name
+        return True
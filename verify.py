@@ -0,0 +1,212 @@
+import asyncio
+import os
+import socket
+import struct
+import time
+from dataclasses import dataclass
+
+from devices import mac_key
+from metrics import metrics
+from discovery import ArpCache, TcpConnectProber, read_neighbours, DEFAULT_TCP_PORTS
+
+# Varsayılan doğrulama parametreleri (saniye)
+DEFAULT_DEADLINE = 180.0
+DEFAULT_INITIAL_BACKOFF = 2.0
+DEFAULT_MAX_BACKOFF = 30.0
+DEFAULT_BACKOFF_FACTOR = 2.0
+DEFAULT_PROBE_INTERVAL = 1.0
+DEFAULT_PROBE_TIMEOUT = 1.0
+DEFAULT_MAX_IN_FLIGHT = 128
+
+
+@dataclass
+class VerifyResult:
+    device_id: str
+    mac: str
+    ip: str
+    up: bool
+    latency: float = None
+    attempts: int = 0
+    method: str = ""
+    error: str = ""
+
+
+def parse_target(text):
+    """ "10.0.0.5" veya "10.0.0.5:22" -> (ip, port|None) """
+    text = (text or "").strip()
+    if not text:
+        return "", None
+    if text.count(":") == 1:
+        host, _, port = text.partition(":")
+        if port.isdigit() and 0 < int(port) < 65536:
+            return host.strip(), int(port)
+        raise ValueError(text)
+    return text, None
+
+
+def format_target(device):
+    ip = device.get("ip", "")
+    port = device.get("verify_port")
+    return f"{ip}:{port}" if ip and port else ip
+
+
+def _icmp_checksum(data):
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+class Probes:
+    """ Erişilebilirlik yoklamaları: ICMP (izin varsa), TCP bağlantısı, güncel ARP kaydı (Linux) """
+
+    def __init__(self, timeout=DEFAULT_PROBE_TIMEOUT, tcp_ports=DEFAULT_TCP_PORTS, neighbour_cache=None,
+                 use_icmp=True):
+        self.timeout = timeout
+        self._tcp = TcpConnectProber(tcp_ports)
+        self.neighbour_cache = neighbour_cache or ArpCache(reader=read_neighbours)
+        # Ayrıcalıksız ICMP soketi (Linux ping_group_range) yoksa bir kez denenip kapatılır
+        self.use_icmp = use_icmp and hasattr(socket, "IPPROTO_ICMP")
+        self._icmp_seq = 0
+
+    async def icmp(self, ip):
+        if not self.use_icmp:
+            return False
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+        except (PermissionError, OSError):
+            self.use_icmp = False
+            return False
+        loop = asyncio.get_running_loop()
+        try:
+            sock.setblocking(False)
+            self._icmp_seq = (self._icmp_seq + 1) & 0xFFFF
+            header = struct.pack("!BBHHH", 8, 0, 0, os.getpid() & 0xFFFF, self._icmp_seq)
+            payload = b"wol-manager"
+            checksum = _icmp_checksum(header + payload)
+            packet = struct.pack("!BBHHH", 8, 0, checksum, os.getpid() & 0xFFFF, self._icmp_seq) + payload
+            await loop.sock_sendto(sock, packet, (ip, 0))
+            await asyncio.wait_for(loop.sock_recv(sock, 1024), self.timeout)
+            return True
+        except (OSError, asyncio.TimeoutError):
+            return False
+        finally:
+            sock.close()
+
+    async def tcp(self, ip, port):
+        return await self._tcp.connect(ip, port, self.timeout)
+
+    async def arp(self, ip, mac, since=None):
+        # Uykudan önce kalmış kayıt sayılmaz: durum REACHABLE olmalı ve since (monotonic) verildiyse
+        # kayıt o andan sonra doğrulanmış olmalı. Tablo okuma (ip neigh) event loop'u bloklamasın.
+        loop = asyncio.get_running_loop()
+        entry = await loop.run_in_executor(None, self.neighbour_cache.lookup, ip, True)
+        if entry is None:
+            return False
+        neighbour_mac, state, confirmed = entry
+        if neighbour_mac != mac_key(mac) or state != "REACHABLE":
+            return False
+        return since is None or (confirmed is not None and confirmed < time.monotonic() - since)
+
+    async def check(self, ip, mac, port=None, since=None):
+        """ Cihaz yanıt veriyorsa ilk yanıt veren yöntemin adını, aksi halde boş metin döner
+
+        Yoklamalar (ICMP, her TCP portu, ARP) aynı anda başlar; toplam süre timeout'u aşmaz.
+        """
+        methods = {asyncio.ensure_future(self.icmp(ip)): "icmp"}
+        for tcp_port in ((port,) if port else self._tcp.ports):
+            methods[asyncio.ensure_future(self.tcp(ip, tcp_port))] = "tcp"
+        methods[asyncio.ensure_future(self.arp(ip, mac, since))] = "arp"
+        loop = asyncio.get_running_loop()
+        end = loop.time() + self.timeout
+        pending = set(methods)
+        try:
+            while pending:
+                remaining = end - loop.time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.cancelled() and task.exception() is None and task.result():
+                        return methods[task]
+            return ""
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+class WakeVerifier:
+    """ Magic packet gönderir, cihaz yanıt verene kadar üstel geri çekilmeyle tekrarlar """
+
+    def __init__(self, engine, probes=None, deadline=DEFAULT_DEADLINE,
+                 initial_backoff=DEFAULT_INITIAL_BACKOFF, max_backoff=DEFAULT_MAX_BACKOFF,
+                 backoff_factor=DEFAULT_BACKOFF_FACTOR, probe_interval=DEFAULT_PROBE_INTERVAL,
+                 max_in_flight=DEFAULT_MAX_IN_FLIGHT):
+        self.engine = engine
+        self.probes = probes or Probes()
+        self.deadline = deadline
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.backoff_factor = backoff_factor
+        self.probe_interval = probe_interval
+        self.max_in_flight = max(1, int(max_in_flight))
+
+    def _send(self, device):
+        # UDP gönderimi bloklamaz; event loop içinde doğrudan yapılabilir
+        return self.engine.wake_devices([device]).sent == 1
+
+    async def verify(self, device):
+        device_id = device.get("id", "")
+        mac = device.get("mac", "")
+        ip = device.get("ip", "")
+        port = device.get("verify_port")
+
+        start = time.monotonic()
+        if not self._send(device):
+            return VerifyResult(device_id, mac, ip, False, attempts=1, error="send_failed")
+        if not ip:
+            # Hedef adres yoksa sadece gönderim yapılır
+            return VerifyResult(device_id, mac, ip, False, attempts=1, error="no_target")
+
+        attempts = 1
+        backoff = self.initial_backoff
+        next_send = start + backoff
+        end = start + self.deadline
+        while True:
+            method = await self.probes.check(ip, mac, port, since=start)
+            now = time.monotonic()
+            if method:
+                return VerifyResult(device_id, mac, ip, True, now - start, attempts, method)
+            if now >= end:
+                return VerifyResult(device_id, mac, ip, False, attempts=attempts, error="timeout")
+            if now >= next_send:
+                self._send(device)
+                attempts += 1
+                backoff = min(backoff * self.backoff_factor, self.max_backoff)
+                next_send = now + backoff
+            await asyncio.sleep(max(0.0, min(self.probe_interval, next_send - now, end - now)))
+
+    async def run(self, devices, on_result=None, on_progress=None):
+        """ Tüm cihazları aynı anda en fazla max_in_flight doğrulama ile işler """
+        devices = list(devices)
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+        results = []
+
+        async def one(device):
+            async with semaphore:
+                result = await self.verify(device)
+            results.append(result)
+            if metrics.enabled:
+                metrics.inc("wol_verify_total", outcome="up" if result.up else result.error)
+                if result.up:
+                    metrics.observe("wol_verify_seconds", result.latency)
+            if on_result:
+                on_result(result)
+            if on_progress:
+                on_progress(len(results), len(devices))
+
+        await asyncio.gather(*(one(device) for device in devices))
+        return results
@@ -0,0 +1,356 @@
+""" Komut satırı arayüzü: Qt yüklemeden cihaz listeler, uyandırır ve içe aktarır
+
+    python wol.py list [--json]
+    python wol.py wake NAME|MAC [...] | --all | --group GROUP
+    python wol.py import PATH [--format FMT]
+    python wol.py schedule list | add NAME|MAC (--cron EXPR | --at ISO) | remove NAME|MAC [INDEX]
+    python wol.py daemon
+    python wol.py serve [--bind ADDR] [--listen-port PORT] [--token TOKEN]
+"""
+import argparse
+import os
+import sys
+
+from devices import DeviceCollection, ensure_device_ids, mac_key, format_mac
+from storage import open_store, StorageError
+
+# Çıkış kodları
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_NOT_FOUND = 2
+
+
+def _open(args):
+    # CLI kısa ömürlüdür; yazmalar birleştirilmeden doğrudan yapılır
+    store = open_store(args.storage, directory=args.dir, window=0)
+    devices = store.load_all()
+    if ensure_device_ids(devices):
+        store.replace_all(devices)
+    return store, DeviceCollection(devices)
+
+
+def _resolve(collection, targets):
+    """ İsim (büyük/küçük harf duyarsız) veya MAC ile cihazları bulur """
+    by_name = {}
+    for device in collection:
+        by_name.setdefault(device.get("name", "").casefold(), []).append(device)
+
+    devices = []
+    missing = []
+    for target in targets:
+        matches = by_name.get(target.casefold())
+        if not matches:
+            key = mac_key(target)
+            if key is not None:
+                # Listede olmayan MAC'e de paket gönderilebilir
+                matches = collection.find_mac(key) or [{"name": "", "mac": format_mac(key)}]
+        if matches:
+            devices.extend(matches)
+        else:
+            missing.append(target)
+    return devices, missing
+
+
+def cmd_list(args):
+    store, collection = _open(args)
+    store.close()
+    if args.json:
+        import json
+        from devices import persistent_fields
+        json.dump([persistent_fields(d) for d in collection], sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+        return EXIT_OK
+    for device in collection:
+        print("\t".join((device.get("name", ""), device.get("mac", ""), device.get("ip", ""),
+                         device.get("group", ""))))
+    return EXIT_OK
+
+
+def cmd_wake(args):
+    store, collection = _open(args)
+    store.close()
+    if args.all:
+        devices, missing = list(collection), []
+    elif args.group:
+        devices, missing = [d for d in collection if d.get("group") == args.group], []
+    else:
+        devices, missing = _resolve(collection, args.targets)
+    for target in missing:
+        print(f"not found: {target}", file=sys.stderr)
+    if not devices:
+        return EXIT_NOT_FOUND
+
+    from wol_engine import WakeEngine, BROADCAST_IP, DEFAULT_PORT
+    with WakeEngine(args.host or BROADCAST_IP, args.port or DEFAULT_PORT) as engine:
+        report = engine.wake_devices(devices)
+    for result in report.results:
+        if not result.ok:
+            print(f"error: {result.name or result.mac}: {result.error}", file=sys.stderr)
+    if not args.quiet:
+        print(f"sent {report.sent}/{len(report.devices)}")
+    return EXIT_OK if not report.failed and not missing else EXIT_ERROR
+
+
+def cmd_import(args):
+    from importers import iter_records, plan_import, FORMATS
+    if args.format and args.format not in FORMATS:
+        print(f"error: unknown format: {args.format}", file=sys.stderr)
+        return EXIT_ERROR
+    store, collection = _open(args)
+    try:
+        added, updates, skipped = plan_import(iter_records(args.path, args.format), collection)
+        if added or updates:
+            collection.apply_batch(added, updates)
+            store.apply_changes(added + [collection.get(device_id) for device_id in updates])
+    finally:
+        store.close()
+    print(f"added {len(added)}, updated {len(updates)}, skipped {skipped}")
+    return EXIT_OK
+
+
+def _resolve_one(collection, target):
+    devices, _ = _resolve(collection, [target])
+    # Zamanlamalar cihaz kaydında saklanır; listede olmayan MAC'e zamanlama eklenemez
+    devices = [device for device in devices if device.get("id")]
+    if len(devices) != 1:
+        print(f"{'ambiguous' if devices else 'not found'}: {target}", file=sys.stderr)
+        return None
+    return devices[0]
+
+
+def _format_time(timestamp):
+    import datetime
+    return datetime.datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M") if timestamp else "-"
+
+
+def cmd_schedule(args):
+    from scheduler import parse_schedule
+    import time
+    store, collection = _open(args)
+    try:
+        if args.action == "list":
+            now = time.time()
+            for device in collection:
+                for index, entry in enumerate(device.get("schedules") or ()):
+                    try:
+                        rule, tz, catch_up = parse_schedule(entry)
+                        next_run = rule.next_after(max(now, entry.get("last_run") or 0), tz)
+                    except ValueError as e:
+                        next_run, catch_up = None, f"invalid: {e}"
+                    print("\t".join((device.get("name", ""), str(index), entry.get("cron") or entry.get("at", ""),
+                                     entry.get("tz", ""), catch_up, _format_time(next_run))))
+            return EXIT_OK
+
+        device = _resolve_one(collection, args.target)
+        if device is None:
+            return EXIT_NOT_FOUND
+        schedules = list(device.get("schedules") or ())
+        if args.action == "add":
+            entry = {"cron": args.cron} if args.cron else {"at": args.at}
+            entry["created"] = round(time.time(), 3)
+            if args.tz:
+                entry["tz"] = args.tz
+            if args.catch_up:
+                entry["catch_up"] = args.catch_up
+            try:
+                parse_schedule(entry)
+            except ValueError as e:
+                print(f"error: {e}", file=sys.stderr)
+                return EXIT_ERROR
+            schedules.append(entry)
+        elif args.index is None:
+            schedules = []
+        elif 0 <= args.index < len(schedules):
+            del schedules[args.index]
+        else:
+            print(f"not found: {args.target} #{args.index}", file=sys.stderr)
+            return EXIT_NOT_FOUND
+        collection.update(device.get("id"), schedules=schedules)
+        store.upsert(device)
+    finally:
+        store.close()
+    return EXIT_OK
+
+
+def _store_mtime(args):
+    from storage import store_mtime
+    return store_mtime(args.storage, args.dir)
+
+
+def _wake_scheduled(engine, devices, settings):
+    if len(devices) == 1:
+        report = engine.wake_devices(devices)
+        return report.sent, report.failed
+    # Aynı anda çalışan çok sayıda zamanlama GUI'deki gibi hız sınırıyla uyandırılır
+    import asyncio
+    from storm import WakeStorm, DEFAULT_PACKETS_PER_SEC, DEFAULT_HOSTS_PER_SEC, DEFAULT_GROUP_STAGGER
+    storm = WakeStorm(engine, settings.get("wake_packets_per_sec", DEFAULT_PACKETS_PER_SEC),
+                      settings.get("wake_hosts_per_sec", DEFAULT_HOSTS_PER_SEC),
+                      settings.get("wake_group_stagger", DEFAULT_GROUP_STAGGER))
+    sent, failed, _ = asyncio.run(storm.run(devices))
+    return sent, failed
+
+
+def cmd_daemon(args):
+    """ Zamanlanmış uyandırmaları GUI olmadan çalıştırır; depo değişince yeniden yükler """
+    import time
+    from scheduler import Scheduler, ScheduleFeed, SchedulerLock, mark_run, MAX_SLEEP
+    from settings import load_settings
+    from wol_engine import WakeEngine, BROADCAST_IP, DEFAULT_PORT
+
+    settings = load_settings() or {}
+    store, collection = _open(args)
+    if args.metrics_textfile:
+        from metrics import metrics
+        metrics.enabled = True
+        metrics.gauge("wol_schedules", "Scheduled wakes loaded", lambda: len(scheduler))
+    scheduler = Scheduler()
+    ScheduleFeed(scheduler, collection)
+    # GUI de zamanlayıcı olarak açıksa işleri sadece kilidi alan süreç çalıştırır
+    lock = SchedulerLock(args.dir)
+    if not args.quiet:
+        print(f"{len(scheduler)} schedules loaded", flush=True)
+
+    try:
+        with WakeEngine(args.host or BROADCAST_IP, args.port or DEFAULT_PORT) as engine:
+            while True:
+                due = scheduler.next_due()
+                delay = MAX_SLEEP if due is None else min(MAX_SLEEP, due - time.time())
+                if delay > 0:
+                    time.sleep(delay)
+
+                # GUI veya CLI depoyu değiştirdiyse zamanlamalar yeniden okunur; kendi yazmalarımız
+                # sayılmaz, aradaki başka yazmalar da kaçmaz
+                if store.changed_externally():
+                    collection.reset(store.load_all())
+
+                now = time.time()
+                firings = scheduler.pop_due(now)
+                if firings and not lock.acquire():
+                    # İşleri kilidi tutan süreç (GUI) çalıştırıyor
+                    if not args.quiet:
+                        print(f"{_format_time(now)} skipped: another process runs the schedules", flush=True)
+                    continue
+                woken = {}
+                for firing in firings:
+                    device = collection.get(firing.device_id)
+                    if device is not None:
+                        woken[firing.device_id] = device
+                if not woken:
+                    continue
+                sent, failed = _wake_scheduled(engine, list(woken.values()), settings)
+                # last_run kaydedilir; yeniden başlatmada kaçırılan çalışmalar buna göre bulunur
+                for firing in firings:
+                    device = woken.get(firing.device_id)
+                    if device is not None:
+                        collection.update(firing.device_id, schedules=mark_run(device, firing.index, now))
+                store.upsert_many(list(woken.values()))
+                if not args.quiet:
+                    print(f"{_format_time(now)} sent {sent}/{sent + failed}", flush=True)
+                if args.metrics_textfile:
+                    metrics.write_textfile(args.metrics_textfile)
+    except KeyboardInterrupt:
+        return EXIT_OK
+    finally:
+        lock.release()
+        store.close()
+
+
+def cmd_serve(args):
+    import asyncio
+    from api import ApiServer, DeviceIndex
+    from wol_engine import WakeEngine, BROADCAST_IP, DEFAULT_PORT
+
+    store = open_store(args.storage, directory=args.dir, window=0)
+    index = DeviceIndex(store, stamp=lambda: _store_mtime(args))
+    token = args.token or os.environ.get("WOL_API_TOKEN")
+    # GET /metrics her zaman açıktır
+    from metrics import metrics
+    metrics.enabled = True
+    try:
+        with WakeEngine(args.host or BROADCAST_IP, args.port or DEFAULT_PORT) as engine:
+            server = ApiServer(index, engine, token=token)
+            if not args.quiet:
+                print(f"listening on http://{args.bind}:{args.listen_port} ({len(index.collection)} devices)",
+                      flush=True)
+            asyncio.run(server.serve(args.bind, args.listen_port))
+    except KeyboardInterrupt:
+        return EXIT_OK
+    finally:
+        store.close()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="wol", description="WOL Manager command line")
+    parser.add_argument("--storage", choices=("sqlite", "json"), default="sqlite")
+    parser.add_argument("--dir", help="device store directory (default: home)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="list devices")
+    list_parser.add_argument("--json", action="store_true")
+    list_parser.set_defaults(func=cmd_list)
+
+    wake_parser = commands.add_parser("wake", help="send magic packets")
+    wake_parser.add_argument("targets", nargs="*", metavar="NAME|MAC")
+    selection = wake_parser.add_mutually_exclusive_group()
+    selection.add_argument("--all", action="store_true")
+    selection.add_argument("--group")
+    wake_parser.add_argument("--host", help="broadcast address")
+    wake_parser.add_argument("--port", type=int)
+    wake_parser.add_argument("-q", "--quiet", action="store_true")
+    wake_parser.set_defaults(func=cmd_wake)
+
+    import_parser = commands.add_parser("import", help="import devices from a file")
+    import_parser.add_argument("path")
+    # Biçimler importers.FORMATS'tadır; modül sadece import komutunda yüklenir
+    import_parser.add_argument("--format", help="nmap, arp, ip-neigh, isc-leases, dnsmasq or csv")
+    import_parser.set_defaults(func=cmd_import)
+
+    schedule_parser = commands.add_parser("schedule", help="list, add or remove scheduled wakes")
+    schedule_commands = schedule_parser.add_subparsers(dest="action", required=True)
+    schedule_commands.add_parser("list")
+    add_parser = schedule_commands.add_parser("add")
+    add_parser.add_argument("target", metavar="NAME|MAC")
+    rule = add_parser.add_mutually_exclusive_group(required=True)
+    rule.add_argument("--cron", help='cron expression, e.g. "30 7 * * mon-fri" or @daily')
+    rule.add_argument("--at", help="one-off ISO time, e.g. 2026-01-05T07:30")
+    add_parser.add_argument("--tz", help="time zone, e.g. Europe/Istanbul (default: local)")
+    add_parser.add_argument("--catch-up", choices=("once", "skip"),
+                            help="missed runs after sleep or restart (default: once)")
+    remove_parser = schedule_commands.add_parser("remove")
+    remove_parser.add_argument("target", metavar="NAME|MAC")
+    remove_parser.add_argument("index", type=int, nargs="?", help="schedule number (default: all)")
+    schedule_parser.set_defaults(func=cmd_schedule)
+
+    daemon_parser = commands.add_parser("daemon", help="run scheduled wakes without the GUI")
+    daemon_parser.add_argument("--host", help="broadcast address")
+    daemon_parser.add_argument("--port", type=int)
+    daemon_parser.add_argument("-q", "--quiet", action="store_true")
+    daemon_parser.add_argument("--metrics-textfile", help="write Prometheus metrics to this file after each run")
+    daemon_parser.set_defaults(func=cmd_daemon)
+
+    serve_parser = commands.add_parser("serve", help="serve the HTTP API (POST /wake, GET /devices, GET /status)")
+    serve_parser.add_argument("--bind", default="127.0.0.1", help="listen address (default: 127.0.0.1)")
+    serve_parser.add_argument("--listen-port", type=int, default=8765)
+    serve_parser.add_argument("--token", help="require 'Authorization: Bearer TOKEN' (or WOL_API_TOKEN)")
+    serve_parser.add_argument("--host", help="broadcast address")
+    serve_parser.add_argument("--port", type=int)
+    serve_parser.add_argument("-q", "--quiet", action="store_true")
+    serve_parser.set_defaults(func=cmd_serve)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "wake" and not (args.targets or args.all or args.group):
+        parser.error("wake: NAME|MAC, --all or --group is required")
+    try:
+        return args.func(args)
+    except (StorageError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EXIT_ERROR
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,355 @@
+import socket
+import sys
+import time
+import threading
+import ctypes
+from collections import OrderedDict, namedtuple
+
+from devices import Device, parse_mac, InvalidMacError
+from metrics import metrics
+
+# Varsayılan hedef (wakeonlan kütüphanesiyle aynı)
+BROADCAST_IP = "255.255.255.255"
+DEFAULT_PORT = 9
+
+# Tek bir sendmmsg çağrısında gönderilecek en fazla paket sayısı
+SENDMMSG_BATCH = 256
+
+PACKET_SIZE = 102
+# Önbellekteki paket tipi: sabit adresli, buffer protokolünü destekleyen 102 bayt
+PacketBuffer = ctypes.c_char * PACKET_SIZE
+
+
+def magic_packet(mac_bytes):
+    """ 6 x 0xFF ardından MAC'in 16 tekrarı (102 bayt) """
+    return b"\xff" * 6 + mac_bytes * 16
+
+
+def device_mac_bytes(device):
+    # Koleksiyondaki kayıtlarda 6 baytlık MAC hazır bulunur
+    packed = device.get("_mac")
+    if packed is None:
+        packed = parse_mac(device.get("mac", "")).to_bytes(6, "big")
+    return packed
+
+
+def device_packet(device):
+    """ Kayıtta önbelleklenen hazır paket; MAC değişince koleksiyon önbelleği siler """
+    packet = device.get("_packet")
+    if packet is None:
+        packet = PacketBuffer.from_buffer_copy(magic_packet(device_mac_bytes(device)))
+        device["_packet"] = packet
+    return packet
+
+
+# dataclasses yerine namedtuple: CLI açılışında inspect modülü yüklenmez
+WakeResult = namedtuple("WakeResult", "name mac ok error", defaults=("",))
+
+
+class WakeReport:
+    """ Toplu gönderimin sonucu; başarılı cihazlar için ayrı nesne oluşturulmaz """
+
+    def __init__(self, devices=(), errors=None, elapsed=0.0):
+        self.devices = list(devices)
+        # Cihaz sırası -> hata metni (sadece başarısızlar)
+        self.errors = errors if errors is not None else {}
+        self.elapsed = elapsed
+        self._results = None
+
+    @property
+    def results(self):
+        if self._results is None:
+            errors = self.errors
+            self._results = [
+                WakeResult(d.get("name", ""), d.get("mac", ""), i not in errors, errors.get(i, ""))
+                for i, d in enumerate(self.devices)
+            ]
+        return self._results
+
+    @property
+    def sent(self):
+        return len(self.devices) - len(self.errors)
+
+    @property
+    def failed(self):
+        return len(self.errors)
+
+    @property
+    def packets_per_sec(self):
+        if self.elapsed <= 0:
+            return float(self.sent)
+        return self.sent / self.elapsed
+
+
+# Linux'ta sendmmsg ile tek sistem çağrısında çok paket gönderilir
+class _IoVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IoVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+
+def _load_sendmmsg():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        # Süreçteki libc sembolleri doğrudan kullanılır (ctypes.util ile kütüphane aranmaz)
+        libc = ctypes.CDLL(None, use_errno=True)
+        func = libc.sendmmsg
+    except (OSError, AttributeError):
+        return None
+    func.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int]
+    func.restype = ctypes.c_int
+    return func
+
+
+_sendmmsg = _load_sendmmsg()
+
+
+def sendmmsg_available():
+    return _sendmmsg is not None
+
+
+# Linux'ta arayüz adına bağlanma seçeneği (socket modülünde her sürümde tanımlı değil)
+SO_BINDTODEVICE = getattr(socket, "SO_BINDTODEVICE", 25)
+# Bu alanlardan biri olan cihaz varsayılan hedef yerine kendi hedefine gönderilir
+_ROUTE_KEYS = frozenset(("broadcast", "broadcast_port", "interface"))
+# Farklı arayüzlere aynı anda gönderim yapan en fazla thread sayısı
+MAX_FANOUT = 8
+# Açık tutulan hedef soketi sayısı; fazlası en uzun süredir kullanılmayandan başlayarak kapatılır
+MAX_ROUTE_SOCKETS = 64
+
+
+def _bind_interface(sock, interface):
+    """ Soketi çıkış arayüzüne bağlar: IPv4 adresi (kaynak adres) veya arayüz adı (Linux) """
+    try:
+        socket.inet_aton(interface)
+    except OSError:
+        if not sys.platform.startswith("linux"):
+            raise OSError(f"interface {interface!r}: arayüz adı sadece Linux'ta desteklenir, IP adresi verin")
+        sock.setsockopt(socket.SOL_SOCKET, SO_BINDTODEVICE, interface.encode())
+    else:
+        sock.bind((interface, 0))
+
+
+class WakeEngine:
+    """ Magic packet'leri yeniden kullanılan broadcast soketleri üzerinden gönderir
+
+    Cihazlar isteğe bağlı "broadcast", "broadcast_port" ve "interface" alanlarıyla kendi
+    VLAN'larına yönlendirilir; her (arayüz, adres, port) için bir soket açık tutulur (en fazla
+    MAX_ROUTE_SOCKETS) ve farklı hedeflere giden partiler paralel gönderilir.
+    """
+
+    def __init__(self, host=BROADCAST_IP, port=DEFAULT_PORT, use_sendmmsg=True, max_fanout=MAX_FANOUT):
+        self.host = host
+        self.port = port
+        self.use_sendmmsg = use_sendmmsg and sendmmsg_available()
+        self.max_fanout = max_fanout
+        # Hedef -> soket, en son kullanılan sonda; gönderimi süren hedefler kapatılmaz
+        self._socks = OrderedDict()
+        self._in_use = {}
+        self._pool = None
+        # Motor birden fazla worker thread'inden kullanılabilir
+        self._lock = threading.Lock()
+        # sendmmsg dizileri her thread için bir kez ayrılır ve yeniden kullanılır
+        self._local = threading.local()
+
+    def route(self, device):
+        """ Cihazın (arayüz, broadcast adresi, port) üçlüsü; alan yoksa motorun varsayılanı """
+        port = device.get("broadcast_port")
+        return (device.get("interface") or "", device.get("broadcast") or self.host,
+                int(port) if port else self.port)
+
+    def _socket(self, route):
+        """ Hedefin soketi; kullanımda sayılır, gönderim bitince _release çağrılmalı """
+        with self._lock:
+            sock = self._socks.get(route)
+            if sock is not None:
+                self._socks.move_to_end(route)
+            else:
+                interface, host, port = route
+                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                try:
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+                    if interface:
+                        _bind_interface(sock, interface)
+                    sock.connect((host, port))
+                except OSError:
+                    sock.close()
+                    raise
+                self._socks[route] = sock
+            self._in_use[route] = self._in_use.get(route, 0) + 1
+            excess = len(self._socks) - MAX_ROUTE_SOCKETS
+            if excess > 0:
+                for old in [old for old in self._socks if old not in self._in_use][:excess]:
+                    self._socks.pop(old).close()
+            return sock
+
+    def _release(self, route):
+        with self._lock:
+            count = self._in_use.pop(route, 1) - 1
+            if count:
+                self._in_use[route] = count
+
+    def close(self):
+        with self._lock:
+            for sock in self._socks.values():
+                sock.close()
+            self._socks.clear()
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def wake(self, mac, name=""):
+        report = self.wake_devices([{"name": name, "mac": mac}])
+        return report.results[0]
+
+    def wake_group(self, devices, group):
+        return self.wake_devices(d for d in devices if d.get("group") == group)
+
+    def wake_devices(self, devices):
+        start = time.perf_counter()
+        report = WakeReport(devices)
+        errors = report.errors
+
+        # Paketler kayıtlardaki önbellekten alınır, geçersiz MAC'ler ayrı raporlanır;
+        # her hedef (arayüz, adres, port) kendi partisini oluşturur
+        batches = {}
+        default_route = ("", self.host, self.port)
+        for i, device in enumerate(report.devices):
+            if type(device) is Device:
+                # Koleksiyon kayıtlarında yuvalara doğrudan erişilir; sözlük arayüzünden hızlı
+                packet = device._packet
+                extra = device._extra
+                routed = extra is not None and not _ROUTE_KEYS.isdisjoint(extra)
+            else:
+                packet = device.get("_packet")
+                routed = "broadcast" in device or "interface" in device or "broadcast_port" in device
+            if packet is None:
+                try:
+                    packet = device_packet(device)
+                except InvalidMacError:
+                    errors[i] = "invalid_mac"
+                    continue
+            if routed:
+                try:
+                    route = self.route(device)
+                except (TypeError, ValueError):
+                    errors[i] = "invalid_port"
+                    continue
+            else:
+                route = default_route
+            batch = batches.get(route)
+            if batch is None:
+                batch = batches[route] = ([], [])
+            batch[0].append(packet)
+            batch[1].append(i)
+
+        if len(batches) == 1 or self.max_fanout <= 1:
+            for route, (packets, indices) in batches.items():
+                self._send_route(route, packets, indices, errors)
+        elif batches:
+            # Hedefler paralel gönderilir; sendmmsg/send çağrıları GIL'i bırakır
+            pool = self._fanout_pool()
+            futures = [pool.submit(self._send_route, route, packets, indices, errors)
+                       for route, (packets, indices) in batches.items()]
+            for future in futures:
+                future.result()
+
+        report.elapsed = time.perf_counter() - start
+        if metrics.enabled:
+            metrics.observe("wol_wake_send_seconds", report.elapsed)
+            metrics.inc("wol_wake_packets_total", report.sent, outcome="sent")
+            if errors:
+                metrics.inc("wol_wake_packets_total", len(errors), outcome="failed")
+        return report
+
+    def _fanout_pool(self):
+        with self._lock:
+            if self._pool is None:
+                # CLI açılışında yüklenmesin diye sadece birden çok hedef olduğunda
+                from concurrent.futures import ThreadPoolExecutor
+                self._pool = ThreadPoolExecutor(self.max_fanout, thread_name_prefix="wol-send")
+            return self._pool
+
+    def _send_route(self, route, packets, indices, errors):
+        # Thread'ler farklı indekslere yazdığı için errors sözlüğü paylaşılabilir
+        try:
+            sock = self._socket(route)
+        except OSError as e:
+            for i in indices:
+                errors[i] = str(e)
+            return
+        try:
+            if self.use_sendmmsg:
+                self._send_batched(sock, packets, indices, errors)
+            else:
+                self._send_each(sock, packets, indices, errors)
+        finally:
+            self._release(route)
+
+    def _send_each(self, sock, packets, indices, errors):
+        send = sock.send
+        for i, packet in enumerate(packets):
+            try:
+                send(packet)
+            except OSError as e:
+                errors[indices[i]] = str(e)
+
+    def _batch_buffers(self):
+        buffers = getattr(self._local, "buffers", None)
+        if buffers is None:
+            iovecs = (_IoVec * SENDMMSG_BATCH)()
+            msgs = (_MMsgHdr * SENDMMSG_BATCH)()
+            for i in range(SENDMMSG_BATCH):
+                iovecs[i].iov_len = PACKET_SIZE
+                msgs[i].msg_hdr.msg_iov = ctypes.pointer(iovecs[i])
+                msgs[i].msg_hdr.msg_iovlen = 1
+            # iovec dizisine düz bir sayı dizisi gibi erişim: [base0, len0, base1, len1, ...]
+            words = (ctypes.c_size_t * (2 * SENDMMSG_BATCH)).from_address(ctypes.addressof(iovecs))
+            buffers = self._local.buffers = (iovecs, msgs, words)
+        return buffers
+
+    def _send_batched(self, sock, packets, indices, errors):
+        fd = sock.fileno()
+        _, msgs, words = self._batch_buffers()
+        msgs_addr = ctypes.addressof(msgs)
+        msg_size = ctypes.sizeof(_MMsgHdr)
+        addressof = ctypes.addressof
+        for offset in range(0, len(packets), SENDMMSG_BATCH):
+            chunk = packets[offset:offset + SENDMMSG_BATCH]
+            count = len(chunk)
+            # iovec'ler doğrudan önbellekteki paketleri gösterir; kopya yapılmaz
+            words[0:2 * count:2] = [addressof(packet) for packet in chunk]
+
+            done = 0
+            while done < count:
+                n = _sendmmsg(fd, msgs_addr + done * msg_size, count - done, 0)
+                if n < 0:
+                    # Çekirdek ilk mesajda hata verdi; o paketi tek başına dene
+                    try:
+                        sock.send(chunk[done])
+                    except OSError as e:
+                        errors[indices[offset + done]] = str(e)
+                    done += 1
+                    continue
+                done += n
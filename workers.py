@@ -0,0 +1,190 @@
+import asyncio
+import itertools
+import traceback
+
+from PyQt6.QtCore import QObject, QRunnable, QThread, QThreadPool, pyqtSignal
+
+# Aynı anda çalışabilecek varsayılan uyandırma işi sayısı
+DEFAULT_MAX_WORKERS = 4
+
+
+class _JobSignals(QObject):
+    # Sinyaller ana thread'deki nesneden yayıldığı için slotlar GUI thread'inde çalışır
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+
+class _Job(QRunnable):
+    def __init__(self, job_id, signals, fn, args, kwargs):
+        super().__init__()
+        self.job_id = job_id
+        self.signals = signals
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            traceback.print_exc()
+            self._emit("failed", str(e))
+        else:
+            self._emit("finished", result)
+
+    def _emit(self, signal_name, value):
+        try:
+            getattr(self.signals, signal_name).emit(self.job_id, value)
+        except RuntimeError:
+            # Uygulama kapanırken sinyal nesnesi silinmiş olabilir
+            pass
+
+
+class JobRunner(QObject):
+    """ Uyandırma ve kayıt işlerini GUI thread'i dışında çalıştırır """
+
+    job_started = pyqtSignal(int, str)
+    job_finished = pyqtSignal(int, str, object)
+    job_failed = pyqtSignal(int, str, str)
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, parent=None):
+        super().__init__(parent)
+        self._ids = itertools.count(1)
+        self._callbacks = {}
+
+        # Uyandırma işleri sınırlı sayıda paralel çalışır
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_workers)
+
+        # Kayıt işleri sırayla yazılsın diye tek thread'li ayrı bir havuzda çalışır
+        self._io_pool = QThreadPool(self)
+        self._io_pool.setMaxThreadCount(1)
+
+        self._signals = _JobSignals()
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+
+    @property
+    def max_workers(self):
+        return self._pool.maxThreadCount()
+
+    @max_workers.setter
+    def max_workers(self, value):
+        self._pool.setMaxThreadCount(max(1, int(value)))
+
+    def pending(self):
+        return len(self._callbacks)
+
+    def submit_wake(self, fn, *args, on_done=None, on_error=None, **kwargs):
+        return self._submit(self._pool, "wake", fn, args, kwargs, on_done, on_error)
+
+    def submit_io(self, fn, *args, on_done=None, on_error=None, **kwargs):
+        return self._submit(self._io_pool, "io", fn, args, kwargs, on_done, on_error)
+
+    def _submit(self, pool, kind, fn, args, kwargs, on_done, on_error):
+        job_id = next(self._ids)
+        self._callbacks[job_id] = (kind, on_done, on_error)
+        pool.start(_Job(job_id, self._signals, fn, args, kwargs))
+        self.job_started.emit(job_id, kind)
+        return job_id
+
+    def _on_finished(self, job_id, result):
+        kind, on_done, _ = self._callbacks.pop(job_id, ("", None, None))
+        if on_done:
+            on_done(result)
+        self.job_finished.emit(job_id, kind, result)
+
+    def _on_failed(self, job_id, error):
+        kind, _, on_error = self._callbacks.pop(job_id, ("", None, None))
+        if on_error:
+            on_error(error)
+        self.job_failed.emit(job_id, kind, error)
+
+    def wait(self, msecs=-1):
+        # Kapanışta bekleyen kayıtların kaybolmaması için
+        self._pool.waitForDone(msecs)
+        return self._io_pool.waitForDone(msecs)
+
+
+class AsyncioThread(QThread):
+    """ Bir korutini kendi event loop'u olan ayrı bir thread'de çalıştırır """
+
+    done = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, coro_factory, parent=None):
+        super().__init__(parent)
+        self._coro_factory = coro_factory
+        self._loop = None
+        self._task = None
+        self._cancel_requested = False
+
+    def run(self):
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        try:
+            self._task = loop.create_task(self._coro_factory())
+            if self._cancel_requested:
+                self._task.cancel()
+            result = loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            self.cancelled.emit()
+        except Exception as e:
+            traceback.print_exc()
+            self.failed.emit(str(e))
+        else:
+            self.done.emit(result)
+        finally:
+            self._loop = None
+            loop.close()
+
+    def cancel(self):
+        # GUI thread'inden çağrılır; iptal loop'un kendi thread'inde yapılır
+        self._cancel_requested = True
+        loop = self._loop
+        if loop is not None and self._task is not None:
+            try:
+                loop.call_soon_threadsafe(self._task.cancel)
+            except RuntimeError:
+                pass
+
+
+class ScanThread(AsyncioThread):
+    """ Ağ taramasını çalıştırır; bulunan cihazlar tarama bitmeden sinyal ile gelir """
+
+    host_found = pyqtSignal(object)
+    progress = pyqtSignal(int, int, int)
+
+    def __init__(self, scanner, networks, parent=None):
+        super().__init__(lambda: scanner.scan(networks, self.host_found.emit, self.progress.emit), parent)
+
+
+class VerifyThread(AsyncioThread):
+    """ Uyandır-ve-doğrula işini çalıştırır; her cihazın sonucu bittiği anda gelir """
+
+    result = pyqtSignal(object)
+    progress = pyqtSignal(int, int)
+
+    def __init__(self, verifier, devices, parent=None):
+        super().__init__(lambda: verifier.run(devices, self.result.emit, self.progress.emit), parent)
+
+
+class MonitorThread(AsyncioThread):
+    """ Canlılık monitörünü çalıştırır; durum değişiklikleri GUI thread'ine sinyal ile gelir """
+
+    state_changed = pyqtSignal(str, str)
+
+    def __init__(self, monitor, parent=None):
+        monitor.on_change = lambda device_id, state: self.state_changed.emit(device_id, state)
+        super().__init__(monitor.run, parent)
+
+
+class StormThread(AsyncioThread):
+    """ Hız sınırlı toplu uyandırmayı çalıştırır; gönderilen her parti sinyal ile gelir """
+
+    batch = pyqtSignal(object)
+    progress = pyqtSignal(int, int, float)
+
+    def __init__(self, storm, devices, parent=None):
+        super().__init__(lambda: storm.run(devices, self.batch.emit, self.progress.emit), parent)